@@ -0,0 +1,67 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+"""
+Benchmark of the callspecs created for tests requiring many parametrized fixtures and a fixture union. Each test
+requires `nb_fixtures` parametrized fixtures with 3 parameters, and a union of two other ones. It reports the
+collection time (including `pytest`'s items reordering, that reads the `indices` of each callspec) and the peak of
+memory traced during collection.
+
+Usage: python benchmarks/bench_callspecs.py [nb_fixtures] [nb_tests]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pytest
+
+FIXTURE_TEMPLATE = '''
+p{i} = param_fixture("p{i}", [1, 2, 3])
+'''
+
+MODULE_TEMPLATE = '''from pytest_cases import param_fixture, fixture_union
+{fixtures}
+a = param_fixture("a", [1, 2, 3])
+b = param_fixture("b", [1, 2, 3])
+u = fixture_union("u", [a, b])
+{tests}
+'''
+
+TEST_TEMPLATE = '''
+def test_{i}({args}, u):
+    pass
+'''
+
+
+class ItemsCounter(object):
+    """A pytest plugin counting the collected items"""
+    nb_items = 0
+
+    def pytest_collection_modifyitems(self, items):
+        self.nb_items = len(items)
+
+
+def main(nb_fixtures=6, nb_tests=4):
+    args = ", ".join("p%s" % i for i in range(nb_fixtures))
+    module = MODULE_TEMPLATE.format(fixtures="".join(FIXTURE_TEMPLATE.format(i=i) for i in range(nb_fixtures)),
+                                    tests="".join(TEST_TEMPLATE.format(i=i, args=args) for i in range(nb_tests)))
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, "test_callspecs.py"), "w") as f:
+            f.write(module)
+        counter = ItemsCounter()
+        tracemalloc.start()
+        start = time.perf_counter()
+        pytest.main([root, "--collect-only", "-q", "-p", "no:cacheprovider"], plugins=[counter])
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print("nb_fixtures=%s nb_tests=%s items=%s collection: %.3fs  peak traced memory: %.1fMB"
+          % (nb_fixtures, nb_tests, counter.nb_items, elapsed, peak / 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,43 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+"""
+Measures the collection time saved by not verifying the fixture closures against pytest (the default), compared
+with `--cases-verify-closure`.
+
+Usage: python benchmarks/bench_closure.py [nb_modules] [nb_tests]
+"""
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_suite import generate_suite
+
+
+def time_collection(root, extra_args=(), nb_runs=3):
+    """Returns the best wall time of `nb_runs` executions of `pytest --collect-only` on `root`"""
+    cmd = [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", root] + list(extra_args)
+    best = None
+    for _ in range(nb_runs):
+        start = time.perf_counter()
+        subprocess.check_call(cmd, stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(nb_modules=20, nb_tests=50):
+    for with_unions in (False, True):
+        with tempfile.TemporaryDirectory() as root:
+            nb_items = generate_suite(root, nb_modules=nb_modules, nb_tests=nb_tests, with_unions=with_unions)
+            default_time = time_collection(root)
+            verify_time = time_collection(root, ["--cases-verify-closure"])
+            print("unions=%-5s items=%-6s default: %.3fs  --cases-verify-closure: %.3fs  (saved %.1f%%)"
+                  % (with_unions, nb_items, default_time, verify_time,
+                     100 * (verify_time - default_time) / verify_time))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
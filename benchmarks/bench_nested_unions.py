@@ -0,0 +1,73 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+"""
+Benchmark of the calls generation for a test requiring 3 levels of nested fixture unions, below a parametrized
+fixture. It reports the collection time, and the number of `Metafunc.parametrize` calls made by `pytest-cases`.
+
+Usage: python benchmarks/bench_nested_unions.py [nb_params]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+from _pytest.python import Metafunc
+
+MODULE_TEMPLATE = '''from pytest_cases import param_fixture, fixture_union
+
+p = param_fixture("p", range({nb_params}))
+
+a = param_fixture("a", range({nb_params}))
+b = param_fixture("b", range({nb_params}))
+u1 = fixture_union("u1", [a, b])
+
+c = param_fixture("c", range({nb_params}))
+u2 = fixture_union("u2", [u1, c])
+
+d = param_fixture("d", range({nb_params}))
+u3 = fixture_union("u3", [u2, d])
+
+
+def test_foo(p, u3):
+    pass
+'''
+
+
+class ItemsCounter(object):
+    """A pytest plugin counting the collected items"""
+    nb_items = 0
+
+    def pytest_collection_modifyitems(self, items):
+        self.nb_items = len(items)
+
+
+def main(nb_params=20):
+    # count the calls to the original `Metafunc.parametrize`
+    nb_parametrize = [0]
+    original_parametrize = Metafunc.parametrize
+
+    def counting_parametrize(*args, **kwargs):
+        nb_parametrize[0] += 1
+        return original_parametrize(*args, **kwargs)
+
+    Metafunc.parametrize = counting_parametrize
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, "test_nested_unions.py"), "w") as f:
+                f.write(MODULE_TEMPLATE.format(nb_params=nb_params))
+            counter = ItemsCounter()
+            start = time.perf_counter()
+            pytest.main([root, "--collect-only", "-q", "-p", "no:cacheprovider"], plugins=[counter])
+            elapsed = time.perf_counter() - start
+    finally:
+        Metafunc.parametrize = original_parametrize
+
+    print("nb_params=%s items=%s collection: %.3fs  Metafunc.parametrize calls: %s"
+          % (nb_params, counter.nb_items, elapsed, nb_parametrize[0]))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,173 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+"""
+Scaling benchmark of the collection and execution of synthetic suites using cases, fixture unions and `fixture_ref`
+(see `synthetic_suite.generate_cases_suite`).
+
+The suite is generated for several scales (the number of test modules is proportional to the scale), and for each of
+them `pytest --collect-only` and a full run are executed in-process. The wall time, the tracemalloc peak of the
+collection, the process peak RSS and the number of items are recorded. The scaling exponent of each measure with
+respect to the number of items is the slope of the log-log least squares fit: 1 means linear. The script exits with
+status 1 if an exponent is above the threshold.
+
+Usage: python benchmarks/bench_scaling.py [--scales 2,4,8,16] [--max-exponent 1.25] [--help for the other options]
+"""
+import argparse
+import contextlib
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+import pytest
+
+from synthetic_suite import generate_cases_suite
+
+
+class ItemsCounter(object):
+    """A pytest plugin counting the collected items"""
+    nb_items = 0
+
+    def pytest_collection_modifyitems(self, items):
+        self.nb_items = len(items)
+
+
+def peak_rss_mb():
+    """Returns the peak resident set size of the process in MB, or None if it is not available"""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def run_pytest(pkg_dir, extra_args=(), trace_memory=False):
+    """
+    Runs pytest in-process on `pkg_dir` and returns a tuple (wall time, tracemalloc peak in MB or None, nb items).
+    """
+    args = [pkg_dir, "-q", "-p", "no:cacheprovider"] + list(extra_args)
+    counter = ItemsCounter()
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            exit_code = pytest.main(args, plugins=[counter])
+            elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    if exit_code != 0:
+        raise ValueError("pytest failed with exit code %s on %s" % (exit_code, pkg_dir))
+    return elapsed, peak, counter.nb_items
+
+
+def unload_package(package):
+    """Removes the modules of `package` from `sys.modules`"""
+    for name in [name for name in sys.modules if name == package or name.startswith(package + ".")]:
+        del sys.modules[name]
+
+
+def scaling_exponent(nb_items, values):
+    """Returns the slope of the least squares fit of log(values) against log(nb_items)"""
+    xs = [math.log(n) for n in nb_items]
+    ys = [math.log(max(v, 1e-9)) for v in values]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    var = sum((x - x_mean) ** 2 for x in xs)
+    if var == 0:
+        raise ValueError("At least two different numbers of items are needed to compute a scaling exponent")
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / var
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", default="2,4,8,16", help="comma-separated list of scales")
+    parser.add_argument("--modules-per-scale", type=int, default=2, help="number of test modules per unit of scale")
+    parser.add_argument("--case-funcs", type=int, default=5, help="number of case functions per cases module")
+    parser.add_argument("--case-classes", type=int, default=1, help="number of case classes per cases module")
+    parser.add_argument("--fixture-cases", type=int, default=2, help="number of cases requiring a fixture")
+    parser.add_argument("--union-depth", type=int, default=2, help="number of nested fixture unions")
+    parser.add_argument("--values", type=int, default=4, help="number of values in the @parametrize of each test")
+    parser.add_argument("--fixture-ref-density", type=float, default=0.5,
+                        help="proportion of the @parametrize values that are a fixture_ref")
+    parser.add_argument("--no-run", action="store_true", help="only measure the collection, not the full run")
+    parser.add_argument("--max-exponent", type=float, default=1.25,
+                        help="maximum scaling exponent of the wall times and collection memory")
+    options = parser.parse_args(argv)
+
+    scales = [int(s) for s in options.scales.split(",")]
+
+    def generate(root, package, scale):
+        return generate_cases_suite(root, package,
+                                    nb_modules=scale * options.modules_per_scale,
+                                    nb_case_funcs=options.case_funcs,
+                                    nb_case_classes=options.case_classes,
+                                    nb_fixture_cases=options.fixture_cases,
+                                    union_depth=options.union_depth,
+                                    nb_values=options.values,
+                                    fixture_ref_density=options.fixture_ref_density)
+
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        # warm-up, not measured: otherwise the first scale also pays for the imports and the first-time initializations
+        package = "synth_warmup"
+        pkg_dir = generate(root, package, min(scales))
+        try:
+            run_pytest(pkg_dir, ["--collect-only"])
+            unload_package(package)
+            if not options.no_run:
+                run_pytest(pkg_dir)
+        finally:
+            unload_package(package)
+
+        for scale in scales:
+            package = "synth_scale_%s" % scale
+            pkg_dir = generate(root, package, scale)
+            try:
+                collect_time, _, nb_items = run_pytest(pkg_dir, ["--collect-only"])
+                unload_package(package)
+                _, collect_peak, _ = run_pytest(pkg_dir, ["--collect-only"], trace_memory=True)
+                unload_package(package)
+                run_time = run_pytest(pkg_dir)[0] if not options.no_run else None
+            finally:
+                unload_package(package)
+            results.append((scale, nb_items, collect_time, collect_peak, run_time, peak_rss_mb()))
+
+    print("")
+    print("%6s %8s %12s %16s %10s %12s"
+          % ("scale", "items", "collect (s)", "collect peak MB", "run (s)", "peak RSS MB"))
+    for scale, nb_items, collect_time, collect_peak, run_time, rss in results:
+        print("%6s %8s %12.3f %16.2f %10s %12s" % (scale, nb_items, collect_time, collect_peak,
+                                                   "-" if run_time is None else "%.3f" % run_time,
+                                                   "-" if rss is None else "%.1f" % rss))
+
+    nb_items = [r[1] for r in results]
+    measures = [("collection time", [r[2] for r in results]), ("collection memory", [r[3] for r in results])]
+    if not options.no_run:
+        measures.append(("run time", [r[4] for r in results]))
+
+    failed = False
+    print("")
+    for name, values in measures:
+        exponent = scaling_exponent(nb_items, values)
+        ok = exponent <= options.max_exponent
+        failed = failed or not ok
+        print("%s scaling exponent: %.2f%s"
+              % (name, exponent, "" if ok else " > %s : REGRESSION" % options.max_exponent))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+"""
+Micro-benchmark of the list facade of `SuperClosure`, on a closure containing a union and many fixtures.
+
+Usage: python benchmarks/bench_super_closure.py [nb_fixtures]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+import pytest
+
+from pytest_cases.plugin import SuperClosure
+
+MODULE_TEMPLATE = '''from pytest_cases import fixture, fixture_union
+
+{fixtures}
+
+u = fixture_union("u", [f_0, f_1])
+
+
+def test_foo(u, {all_args}):
+    pass
+'''
+
+FIXTURE_TEMPLATE = '''
+@fixture
+def f_{i}():
+    return {i}
+'''
+
+
+class ClosureGrabber(object):
+    """A pytest plugin grabbing the fixture closure of the first collected item"""
+    closure = None
+
+    def pytest_collection_modifyitems(self, items):
+        self.closure = items[0]._fixtureinfo.names_closure
+
+
+def get_super_closure(nb_fixtures):
+    """Collects a generated test with `nb_fixtures` fixtures and a union and returns its super closure"""
+    with tempfile.TemporaryDirectory() as root:
+        contents = MODULE_TEMPLATE.format(fixtures="\n".join(FIXTURE_TEMPLATE.format(i=i) for i in range(nb_fixtures)),
+                                          all_args=", ".join("f_%s" % i for i in range(nb_fixtures)))
+        with open(os.path.join(root, "test_big_closure.py"), "w") as f:
+            f.write(contents)
+        grabber = ClosureGrabber()
+        pytest.main([root, "--collect-only", "-q", "-p", "no:cacheprovider"], plugins=[grabber])
+
+    assert isinstance(grabber.closure, SuperClosure)
+    return grabber.closure
+
+
+def main(nb_fixtures=250, number=20):
+    closure = get_super_closure(nb_fixtures)
+    n = len(closure)
+    last = closure[-1]
+
+    def indexed_access():
+        return [closure[i] for i in range(n)]
+
+    def rebuilt_keys_access():
+        # the previous implementation of __getitem__, for reference
+        return [list(closure.all_fixture_defs.keys())[i] for i in range(n)]
+
+    print("closure size: %s" % n)
+    for name, stmt in (("closure[i] for all i", indexed_access),
+                       ("same, rebuilding the key list", rebuilt_keys_access),
+                       ("list(closure)", lambda: list(closure)),
+                       ("closure[:]", lambda: closure[:]),
+                       ("closure.index(last)", lambda: closure.index(last)),
+                       ("last in closure", lambda: last in closure)):
+        t = timeit.timeit(stmt, number=number) / number
+        print("%-32s %10.2f us" % (name, t * 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,191 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+"""
+Generator of synthetic test suites, used by the benchmark scripts in this folder.
+
+`generate_suite` generates a folder containing `nb_modules` test modules. Each test module contains `nb_tests` test
+functions requiring a few parametrized fixtures, and optionally a `fixture_union` of two of them.
+
+`generate_cases_suite` generates a package of test modules parametrized with cases modules, see its docstring.
+"""
+import os
+
+MODULE_TEMPLATE = '''from pytest_cases import fixture, fixture_union, parametrize
+
+
+@fixture
+@parametrize(i=range({nb_params}))
+def a(i):
+    return i
+
+
+@fixture
+@parametrize(j=range({nb_params}))
+def b(j):
+    return j
+
+
+@fixture
+def c(a, b):
+    return a, b
+
+{union}
+{tests}
+'''
+
+UNION_TEMPLATE = '''
+u = fixture_union("u", [a, b])
+'''
+
+TEST_TEMPLATE = '''
+def test_{name}_{i}({args}):
+    pass
+'''
+
+
+def generate_suite(root,
+                   nb_modules=10,
+                   nb_tests=20,
+                   nb_params=3,
+                   with_unions=False
+                   ):
+    """
+    Generates a synthetic test suite in folder `root`.
+
+    :param root: the folder where to generate the suite. It will be created if needed.
+    :param nb_modules: the number of test modules to generate.
+    :param nb_tests: the number of test functions per module.
+    :param nb_params: the number of parameters of each of the two parametrized fixtures.
+    :param with_unions: a boolean indicating if test functions should require a fixture union.
+    :return: the total number of items that pytest should collect.
+    """
+    if not os.path.isdir(root):
+        os.makedirs(root)
+
+    args = "u, c" if with_unions else "a, c"
+    for m in range(nb_modules):
+        tests = "\n".join(TEST_TEMPLATE.format(name="synth", i=i, args=args) for i in range(nb_tests))
+        contents = MODULE_TEMPLATE.format(nb_params=nb_params, union=UNION_TEMPLATE if with_unions else "",
+                                          tests=tests)
+        with open(os.path.join(root, "test_synth_%s.py" % m), "w") as f:
+            f.write(contents)
+
+    nb_items_per_test = nb_params * nb_params
+    return nb_modules * nb_tests * nb_items_per_test
+
+
+CASES_TEST_MODULE_TEMPLATE = '''from pytest_cases import fixture, fixture_union, fixture_ref, parametrize, \\
+    parametrize_with_cases
+
+
+@fixture
+def base():
+    return 0
+
+
+@fixture
+@parametrize(v=[1, 2])
+def p(v):
+    return v
+
+{refs}{unions}
+
+@parametrize("y", [{y_values}])
+@parametrize_with_cases("x")
+def test_cases(x, y{union_arg}):
+    pass
+'''
+
+REF_TEMPLATE = '''
+@fixture
+def r{k}():
+    return {k}
+'''
+
+NESTED_UNION_TEMPLATE = '''
+@fixture
+@parametrize(l=[1, 2])
+def leaf{d}(l):
+    return l
+
+
+u{d} = fixture_union("u{d}", [{first}, leaf{d}])
+'''
+
+CASE_FUNC_TEMPLATE = '''
+def case_f{j}():
+    return {j}
+'''
+
+CASE_CLASS_TEMPLATE = '''
+class CaseC{k}:
+    def case_a(self):
+        return "a"
+
+    def case_b(self):
+        return "b"
+'''
+
+FIXTURE_CASE_TEMPLATE = '''
+def case_fx{j}(base):
+    return base + {j}
+'''
+
+
+def generate_cases_suite(root,
+                         package,
+                         nb_modules=2,
+                         nb_case_funcs=5,
+                         nb_case_classes=1,
+                         nb_fixture_cases=2,
+                         union_depth=2,
+                         nb_values=4,
+                         fixture_ref_density=0.5
+                         ):
+    """
+    Generates a synthetic test suite using cases, in package `package` of folder `root`.
+
+    Each test module `test_m<i>.py` contains a single test function parametrized with the cases of the associated
+    `cases_m<i>.py` module, and with a `@parametrize` containing some `fixture_ref`. It also requires the last of a
+    chain of nested fixture unions.
+
+    :param root: the folder where to generate the suite. It will be created if needed.
+    :param package: the name of the package to create. It should be different for each suite generated in the same
+        process, so that modules do not clash in `sys.modules`.
+    :param nb_modules: the number of test modules (and cases modules) to generate.
+    :param nb_case_funcs: the number of case functions per cases module.
+    :param nb_case_classes: the number of case classes per cases module. Each case class contains two cases.
+    :param nb_fixture_cases: the number of case functions requiring a fixture, per cases module.
+    :param union_depth: the number of nested fixture unions. Each union has two alternatives: the previous union (or a
+        parametrized fixture for the first one) and a new parametrized fixture.
+    :param nb_values: the number of values in the `@parametrize` of each test function.
+    :param fixture_ref_density: the proportion of these values that are a `fixture_ref`.
+    :return: the folder of the generated package
+    """
+    pkg_dir = os.path.join(root, package)
+    if not os.path.isdir(pkg_dir):
+        os.makedirs(pkg_dir)
+    with open(os.path.join(pkg_dir, "__init__.py"), "w"):
+        pass
+
+    nb_refs = int(round(fixture_ref_density * nb_values))
+    refs = "".join(REF_TEMPLATE.format(k=k) for k in range(nb_refs))
+    y_values = ", ".join(["fixture_ref(r%s)" % k for k in range(nb_refs)] + [str(k) for k in range(nb_refs, nb_values)])
+    unions = "".join(NESTED_UNION_TEMPLATE.format(d=d, first="u%s" % (d - 1) if d > 0 else "p")
+                     for d in range(union_depth))
+    union_arg = ", u%s" % (union_depth - 1) if union_depth > 0 else ""
+    test_module = CASES_TEST_MODULE_TEMPLATE.format(refs=refs, unions=unions, y_values=y_values, union_arg=union_arg)
+
+    cases_module = "".join([CASE_FUNC_TEMPLATE.format(j=j) for j in range(nb_case_funcs)]
+                           + [CASE_CLASS_TEMPLATE.format(k=k) for k in range(nb_case_classes)]
+                           + [FIXTURE_CASE_TEMPLATE.format(j=j) for j in range(nb_fixture_cases)])
+
+    for m in range(nb_modules):
+        with open(os.path.join(pkg_dir, "test_m%s.py" % m), "w") as f:
+            f.write(test_module)
+        with open(os.path.join(pkg_dir, "cases_m%s.py" % m), "w") as f:
+            f.write(cases_module)
+
+    return pkg_dir
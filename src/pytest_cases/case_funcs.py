@@ -6,12 +6,13 @@ from copy import copy
 from decopatch import function_decorator, DECORATED
 
 try:  # python 3.5+
-    from typing import Callable, Union, Optional, Any, Tuple, Iterable, List, Set
+    from typing import Callable, Union, Optional, Any, Tuple, Iterable, List, Set, FrozenSet  # noqa
 except ImportError:
     pass
 
 from .common_mini_six import string_types
-from .common_pytest import safe_isclass
+from .common_others import get_code_first_line, get_function_host
+from .common_pytest import safe_isclass, MiniMetafunc
 from .common_pytest_marks import get_pytest_marks_on_function, markdecorators_as_tuple, markdecorators_to_markinfos
 
 try:
@@ -29,6 +30,8 @@ CASE_PREFIX_FUN = 'case_'
 
 
 CASE_FIELD = '_pytestcase'
+CASE_RECORD_FIELD = '_pytestcase_record'
+_HOST_CLS_ATTR = '_pytestcases_host_cls'
 
 
 class _CaseInfo(object):
@@ -41,7 +44,7 @@ class _CaseInfo(object):
     are provided below (`get_case_id`, `get_case_tags` and `get_case_marks`). This is a safeguard to allow us
     to change this class design later while easily guaranteeing retrocompatibility.
     """
-    __slots__ = ('id', 'marks', 'tags')
+    __slots__ = ('id', 'marks', 'tags', 'tags_set')
 
     def __init__(self,
                  id=None,   # type: str
@@ -51,6 +54,8 @@ class _CaseInfo(object):
         self.id = id
         self.marks = marks  # type: Tuple[MarkDecorator, ...]
         self.tags = ()
+        # the same tags in a set for fast queries, or None if some of them are not hashable
+        self.tags_set = frozenset()  # type: Optional[FrozenSet[Any]]
         self.add_tags(tags)
 
     def __repr__(self):
@@ -89,6 +94,10 @@ class _CaseInfo(object):
                 tags = (tags,)
 
             self.tags += tuple(tags)
+            try:
+                self.tags_set = frozenset(self.tags)
+            except TypeError:
+                self.tags_set = None
 
     def matches_tag_query(self,
                           has_tag=None,  # type: Union[str, Iterable[str]]
@@ -99,7 +108,7 @@ class _CaseInfo(object):
         :param has_tag:
         :return:
         """
-        return _tags_match_query(self.tags, has_tag)
+        return _tags_match_query(self.tags if self.tags_set is None else self.tags_set, has_tag)
 
     @classmethod
     def copy_info(cls,
@@ -124,7 +133,11 @@ def _tags_match_query(tags,    # type: Iterable[str]
     if not isinstance(has_tag, (tuple, list, set)):
         has_tag = (has_tag,)
 
-    return all(t in tags for t in has_tag)
+    try:
+        return all(t in tags for t in has_tag)
+    except TypeError:
+        # an unhashable tag in the query, and `tags` is a set
+        return all(t in tuple(tags) for t in has_tag)
 
 
 def copy_case_info(from_fun,  # type: Callable
@@ -251,7 +264,9 @@ def matches_tag_query(case_fun,      # type: Callable
 
     # query on tags
     if has_tag is not None:
-        selected = selected and _tags_match_query(get_case_tags(case_fun), has_tag)
+        ci = _CaseInfo.get_from(case_fun)
+        tags = () if ci is None else (ci.tags if ci.tags_set is None else ci.tags_set)
+        selected = selected and _tags_match_query(tags, has_tag)
 
     # filter function
     if filter is not None:
@@ -398,3 +413,121 @@ def with_case_tags(*tags):
         return cls
     return _decorator
 
+
+class CaseRecord(object):
+    """
+    The metadata of a case function used during collection, computed once and cached on the case function (see
+    `get_case_record`): id, tags, marks, first line, host, whether it is a case in a class, and the results of the
+    signature analysis (required fixtures, parametrization). The latter are only computed when first needed.
+
+    A record is only reused if the `_CaseInfo` of the function and its pytest marks did not change since it was created.
+    """
+    __slots__ = ('case_fun', 'stamp', 'custom_id', 'tags', 'marks', 'true_case_func', 'in_class',
+                 '_ids', '_first_line', '_host', '_signature_info')
+
+    def __init__(self,
+                 case_fun,  # type: Callable
+                 ci,        # type: Optional[_CaseInfo]
+                 stamp      # type: Tuple
+                 ):
+        self.case_fun = case_fun
+        self.stamp = stamp
+        self.custom_id = ci.id if ci is not None else None  # type: Optional[str]
+        self.tags = ci.tags if ci is not None else ()  # type: Tuple[Any, ...]
+        # the marks set with @case, as in `get_case_marks(case_fun, as_decorators=True)`
+        self.marks = ci.marks if ci is not None else None  # type: Optional[Tuple[MarkDecorator, ...]]
+
+        # detect a functools.partial wrapper created by us because of a host class
+        self.in_class = hasattr(case_fun, _HOST_CLS_ATTR)
+        self.true_case_func = case_fun.func if self.in_class else case_fun
+
+        self._ids = dict()
+        self._first_line = None
+        self._host = None
+        self._signature_info = None
+
+    def __repr__(self):
+        return "CaseRecord(%r, id=%r, tags=%r)" % (self.case_fun, self.get_id(), self.tags)
+
+    @staticmethod
+    def get_stamp(case_fun,  # type: Callable
+                  ci         # type: Optional[_CaseInfo]
+                  ):
+        # type: (...) -> Tuple
+        """Returns a tuple that changes when the case information or the pytest marks of `case_fun` change"""
+        pytestmark = getattr(case_fun, 'pytestmark', ())
+        nb_marks = len(pytestmark) if isinstance(pytestmark, (list, tuple)) else 1
+        return ci, ((ci.id, ci.marks, ci.tags) if ci is not None else None), nb_marks
+
+    def get_id(self,
+               prefix_for_default_ids=CASE_PREFIX_FUN  # type: str
+               ):
+        # type: (...) -> str
+        """Returns the case id, as in `get_case_id`"""
+        if self.custom_id is not None:
+            return self.custom_id
+        try:
+            return self._ids[prefix_for_default_ids]
+        except KeyError:
+            _id = self._ids[prefix_for_default_ids] = get_case_id(self.case_fun, prefix_for_default_ids)
+            return _id
+
+    @property
+    def first_line(self):
+        # type: (...) -> int
+        """The first line of code of the case function"""
+        if self._first_line is None:
+            self._first_line = get_code_first_line(self.true_case_func)
+        return self._first_line
+
+    @property
+    def host(self):
+        """The module or class where the case function is defined"""
+        if self._host is None:
+            self._host = get_function_host(self.true_case_func)
+        return self._host
+
+    def _get_signature_info(self):
+        if self._signature_info is None:
+            # what pytest *would* do for this (possibly parametrized) function
+            meta = MiniMetafunc(self.case_fun)
+            self._signature_info = (meta.is_parametrized, meta.requires_fixtures, tuple(meta.fixturenames_not_in_sig))
+        return self._signature_info
+
+    @property
+    def is_parametrized(self):
+        # type: (...) -> bool
+        """True if the case function has parametrization marks"""
+        return self._get_signature_info()[0]
+
+    @property
+    def requires_fixtures(self):
+        # type: (...) -> bool
+        """True if the case function requires at least one fixture, in its signature or with `usefixtures`"""
+        return self._get_signature_info()[1]
+
+    @property
+    def fixturenames_not_in_sig(self):
+        # type: (...) -> Tuple[str, ...]
+        """The fixtures required with `@pytest.mark.usefixtures`, not in the signature"""
+        return self._get_signature_info()[2]
+
+
+def get_case_record(case_fun  # type: Callable
+                    ):
+    # type: (...) -> CaseRecord
+    """
+    Returns the `CaseRecord` of `case_fun`, creating it and caching it on the function if needed. Note that copies of
+    a case function (for example with `funcopy`) do not reuse its record.
+    """
+    ci = _CaseInfo.get_from(case_fun)
+    stamp = CaseRecord.get_stamp(case_fun, ci)
+    record = getattr(case_fun, CASE_RECORD_FIELD, None)
+    if record is None or record.case_fun is not case_fun or record.stamp != stamp:
+        record = CaseRecord(case_fun, ci, stamp)
+        try:
+            setattr(case_fun, CASE_RECORD_FIELD, record)
+        except (AttributeError, TypeError):
+            # for example a bound method: the record can not be cached
+            pass
+    return record
@@ -7,10 +7,12 @@ from __future__ import division
 
 from collections import namedtuple
 
+from fnmatch import fnmatch
 import functools
 from importlib import import_module
 from inspect import getmembers, ismodule
-import re
+import os
+import sys
 from warnings import warn
 
 try:  # python 3.3+
@@ -19,22 +21,24 @@ except ImportError:
     from funcsigs import signature  # noqa
 
 try:
-    from typing import Union, Callable, Iterable, Any, Type, List, Tuple  # noqa
+    from typing import Union, Callable, Iterable, Any, Type, List, Tuple, Dict, FrozenSet  # noqa
 except ImportError:
     pass
 
 from .common_mini_six import string_types
+from .common_tracing import trace_span
 from .common_others import get_code_first_line, AUTO, qname, funcopy, needs_binding, get_function_host, \
     in_same_module, get_host_module, get_class_that_defined_method
 from .common_pytest_marks import copy_pytest_marks, make_marked_parameter_value, remove_pytest_mark, filter_marks, \
     get_param_argnames_as_list, Mark
 from .common_pytest_lazy_values import LazyValue, LazyTuple, LazyTupleItem
-from .common_pytest import safe_isclass, MiniMetafunc, is_fixture, get_fixture_name, inject_host, add_fixture_params, \
+from .common_pytest import safe_isclass, is_fixture, get_fixture_name, inject_host, add_fixture_params, \
     list_all_fixtures_in, get_pytest_request_and_item, safe_isinstance
 
-from .case_funcs import matches_tag_query, is_case_function, is_case_class, CASE_PREFIX_FUN, copy_case_info, \
-    get_case_id, get_case_marks, GEN_BY_US
+from .case_funcs import is_case_function, is_case_class, CASE_PREFIX_FUN, copy_case_info, \
+    get_case_marks, GEN_BY_US, _HOST_CLS_ATTR, get_case_record
 
+from .filters import CaseFilter, CasesTable, IdPlan, compile_filter_plan, FilterPlan  # noqa
 from .fixture_core1_unions import USED, NOT_USED
 from .fixture_core2 import CombinedFixtureParamValue, fixture
 from .fixture__creation import check_name_available, get_caller_module, CHANGE
@@ -62,9 +66,6 @@ except:  # noqa
     pass
 
 
-_HOST_CLS_ATTR = '_pytestcases_host_cls'
-
-
 def parametrize_with_cases(argnames,                # type: Union[str, List[str], Tuple[str, ...]]
                            cases=AUTO,              # type: Union[CaseType, List[CaseType]]
                            prefix=CASE_PREFIX_FUN,  # type: str
@@ -140,7 +141,9 @@ def parametrize_with_cases(argnames,                # type: Union[str, List[str]
         """ execute parametrization of test function or fixture `f` """
 
         # Collect all cases
-        cases_funs = get_all_cases(f, cases=cases, prefix=prefix, glob=glob, has_tag=has_tag, filter=filter)
+        with trace_span("get_all_cases", "cases", target=f) as span:
+            cases_funs = get_all_cases(f, cases=cases, prefix=prefix, glob=glob, has_tag=has_tag, filter=filter)
+            span.set(nb_cases=len(cases_funs))
 
         # Build ids from callable if provided.
         _ids = ids
@@ -155,18 +158,20 @@ def parametrize_with_cases(argnames,                # type: Union[str, List[str]
         # Transform the various case functions found into `lazy_value` (for case functions not requiring fixtures)
         # or `fixture_ref` (for case functions requiring fixtures - for them we create associated case fixtures in
         # `host_class_or_module`)
-        argvalues = get_parametrize_args(host_class_or_module, cases_funs, prefix=prefix,
-                                         import_fixtures=import_fixtures, debug=debug, scope=scope)
+        with trace_span("get_parametrize_args", "cases", target=f):
+            argvalues = get_parametrize_args(host_class_or_module, cases_funs, prefix=prefix,
+                                             import_fixtures=import_fixtures, debug=debug, scope=scope)
 
         # Finally apply parametrization - note that we need to call the private method so that fixture are created in
         # the right module (not here)
-        _parametrize_with_cases, needs_inject = _parametrize_plus(argnames, argvalues, ids=_ids, idstyle=idstyle,
-                                                                  debug=debug, scope=scope)
+        with trace_span("_parametrize_plus", "parametrize", target=f):
+            _parametrize_with_cases, needs_inject = _parametrize_plus(argnames, argvalues, ids=_ids, idstyle=idstyle,
+                                                                      debug=debug, scope=scope)
 
-        if needs_inject:
-            return _parametrize_with_cases(f, host_class_or_module)
-        else:
-            return _parametrize_with_cases(f)
+            if needs_inject:
+                return _parametrize_with_cases(f, host_class_or_module)
+            else:
+                return _parametrize_with_cases(f)
 
     return _apply_parametrization
 
@@ -178,9 +183,8 @@ def _get_original_case_func(case_fun  # type: Callable
     :param case_fun:
     :return: the original case function, and a boolean indicating if it is different from the input
     """
-    case_in_class = hasattr(case_fun, _HOST_CLS_ATTR)
-    true_case_func = case_fun.func if case_in_class else case_fun
-    return true_case_func, case_in_class
+    record = get_case_record(case_fun)
+    return record.true_case_func, record.in_class
 
 
 def create_glob_name_filter(glob_str  # type: str
@@ -193,17 +197,7 @@ def create_glob_name_filter(glob_str  # type: str
     :param glob_str: for example `*_success` or `*_*`
     :return:
     """
-    # escape all special regex characters, then find the (escaped) stars and turn them into the regex star .*
-    re_str = re.escape(glob_str).replace("\\*", ".*")
-    # add "end" special regex char
-    name_matcher = re.compile(re_str + "$")
-
-    def _glob_name_filter(case_fun):
-        case_fun_id = get_case_id(case_fun)
-        assert case_fun_id is not None
-        return name_matcher.match(case_fun_id)
-
-    return _glob_name_filter
+    return CaseFilter.from_plan(IdPlan(IdPlan.GLOB, glob_str))
 
 
 def get_all_cases(parametrization_target=None,  # type: Callable
@@ -252,20 +246,19 @@ def get_all_cases(parametrization_target=None,  # type: Callable
     if not isinstance(prefix, str):
         raise TypeError("`prefix` should be a string, found: %r" % prefix)
 
-    # validate glob and filter and merge them in a single tuple of callables
-    filters = ()
+    # validate glob and filter
     if glob is not None:
         if not isinstance(glob, string_types):
             raise TypeError("`glob` should be a string containing a glob-like pattern (not a regex).")
-
-        filters += (create_glob_name_filter(glob),)
     if filter is not None:
         if not callable(filter):
             raise TypeError(
                 "`filter` should be a callable starting in pytest-cases 0.8.0. If you wish to provide a single"
                 " tag to match, use `has_tag` instead.")
 
-        filters += (filter,)
+    # compile them with has_tag in a single filter plan: tags and ids are matched using the cases indexes, and the
+    # filter callables are only evaluated on the remaining cases
+    plan = compile_filter_plan(has_tag=has_tag, glob=glob, filter=filter)
 
     # parent package
     if parametrization_target is None:
@@ -287,13 +280,13 @@ def get_all_cases(parametrization_target=None,  # type: Callable
         if safe_isclass(c):
             # class - do not check name, it was explicitly passed
             new_cases = extract_cases_from_class(c, case_fun_prefix=prefix, check_name=False)
-            cases_funs += new_cases
+            cases_funs += CasesTable(new_cases).select(plan)
         elif callable(c):
             # function
             if is_case_function(c, check_prefix=False):  # do not check prefix, it was explicitly passed
                 # bind it automatically if needed (if unbound class method)
                 shall_bind, bound_c = needs_binding(c, return_bound=True)
-                cases_funs.append(bound_c)
+                cases_funs += CasesTable([bound_c]).select(plan)
             else:
                 raise ValueError("Unsupported case function: %r" % c)
         else:
@@ -316,12 +309,11 @@ def get_all_cases(parametrization_target=None,  # type: Callable
             elif c is THIS_MODULE or c == '.':
                 c = caller_module_name
 
-            new_cases = extract_cases_from_module(c, package_name=parent_pkg_name, case_fun_prefix=prefix)
-            cases_funs += new_cases
+            # the indexes of the module cases are kept in the cases modules index
+            c = _import_cases_module(c, package_name=parent_pkg_name)
+            cases_funs += CASES_MODULES_INDEX.get_entry(c, prefix).select(plan)
 
-    # filter last, for easier debugging (collection will be slightly less performant when a large volume of cases exist)
-    return [c for c in cases_funs
-            if matches_tag_query(c, has_tag=has_tag, filter=filters)]
+    return cases_funs
 
 
 def get_parametrize_args(host_class_or_module,    # type: Union[Type, ModuleType]
@@ -351,8 +343,11 @@ def get_parametrize_args(host_class_or_module,    # type: Union[Type, ModuleType
     :param debug: a boolean flag, turn it to True to print debug messages.
     :return:
     """
-    return [c for _f in cases_funs for c in case_to_argvalues(host_class_or_module, _f, prefix, scope, import_fixtures,
-                                                              debug)]
+    argvalues = []
+    for _f in cases_funs:
+        with trace_span("case_to_argvalues", "cases", case=_f):
+            argvalues += case_to_argvalues(host_class_or_module, _f, prefix, scope, import_fixtures, debug)
+    return argvalues
 
 
 class CaseParamValue(object):
@@ -432,16 +427,17 @@ def case_to_argvalues(host_class_or_module,    # type: Union[Type, ModuleType]
         defined in the cases module into the current module.
     :return:
     """
-    # get the id from the case function either added by the @case decorator, or default one.
-    case_id = get_case_id(case_fun, prefix_for_default_ids=prefix)
+    # the metadata of the case function, computed once
+    record = get_case_record(case_fun)
 
-    # get the list of all calls that pytest *would* have made for such a (possibly parametrized) function
-    meta = MiniMetafunc(case_fun)
+    # get the id from the case function either added by the @case decorator, or default one.
+    case_id = record.get_id(prefix)
 
-    if not meta.requires_fixtures and not meta.is_parametrized:
+    # what pytest *would* have done for such a (possibly parametrized) function
+    if not record.requires_fixtures and not record.is_parametrized:
         # only retrieve the extra marks added with @case, since the others will be automatically retrieved by the
         # lazy_value.
-        case_marks = get_case_marks(case_fun, as_decorators=True)
+        case_marks = record.marks
 
         # if not meta.is_parametrized:
         # single unparametrized case function
@@ -472,9 +468,10 @@ def case_to_argvalues(host_class_or_module,    # type: Union[Type, ModuleType]
         #    # nothing to do, the parametrization marks are on the fixture to create so they will be taken into account
 
         # create or reuse a fixture in the host (pytest collector: module or class) of the parametrization target
-        fix_name, remaining_marks = get_or_create_case_fixture(case_id, case_fun, host_class_or_module,
-                                                               meta.fixturenames_not_in_sig, scope,
-                                                               import_fixtures=import_fixtures, debug=debug)
+        with trace_span("get_or_create_case_fixture", "fixtures", case=case_fun):
+            fix_name, remaining_marks = get_or_create_case_fixture(case_id, case_fun, host_class_or_module,
+                                                                   record.fixturenames_not_in_sig, scope,
+                                                                   import_fixtures=import_fixtures, debug=debug)
 
         # reference that case fixture, and preserve the case id in the associated id whatever the generated fixture name
         argvalues = _FixtureRefCaseParamValue(fix_name, id=case_id)
@@ -522,8 +519,9 @@ def get_or_create_case_fixture(case_id,                # type: str
                          % case_fun)
 
     # source: detect a functools.partial wrapper created by us because of a host class
-    true_case_func, case_in_class = _get_original_case_func(case_fun)
-    true_case_func_host = get_function_host(true_case_func)
+    record = get_case_record(case_fun)
+    true_case_func, case_in_class = record.true_case_func, record.in_class
+    true_case_func_host = record.host
 
     # for checks
     orig_name = true_case_func.__name__
@@ -688,24 +686,129 @@ def import_default_cases_module(test_module_name):
     """
     # First try `test_<name>_cases.py`
     cases_module_name1 = "%s_cases" % test_module_name
-
-    try:
-        cases_module = import_module(cases_module_name1)
-    except ModuleNotFoundError:
-        # Then try `cases_<name>.py`
-        parts = test_module_name.split('.')
-        assert parts[-1][0:5] == 'test_'
-        cases_module_name2 = "%s.cases_%s" % ('.'.join(parts[:-1]), parts[-1][5:])
+    # Then try `cases_<name>.py`
+    parts = test_module_name.split('.')
+    assert parts[-1][0:5] == 'test_'
+    cases_module_name2 = '.'.join(parts[:-1] + ["cases_%s" % parts[-1][5:]])
+
+    # if the directory of the test module was scanned, we know which one exists: no failed import
+    found = AUTO_CASES_MODULES_INDEX.lookup(test_module_name)
+    if found is not None:
+        if found[0]:
+            return import_module(cases_module_name1)
+        elif found[1]:
+            return import_module(cases_module_name2)
+    else:
         try:
-            cases_module = import_module(cases_module_name2)
+            return import_module(cases_module_name1)
         except ModuleNotFoundError:
-            # Nothing worked
-            raise ValueError("Error importing test cases module to parametrize %r: unable to import AUTO "
-                             "cases module %r nor %r. Maybe you wish to import cases from somewhere else ? In that case"
-                             " please specify `cases=...`."
-                             % (test_module_name, cases_module_name1, cases_module_name2))
+            try:
+                return import_module(cases_module_name2)
+            except ModuleNotFoundError:
+                pass
+
+    # Nothing worked
+    raise ValueError("Error importing test cases module to parametrize %r: unable to import AUTO "
+                     "cases module %r nor %r. Maybe you wish to import cases from somewhere else ? In that case"
+                     " please specify `cases=...`."
+                     % (test_module_name, cases_module_name1, cases_module_name2))
+
+
+def _is_auto_cases_name(name  # type: str
+                        ):
+    # type: (...) -> bool
+    """Returns True if `name` is the name of a possible `cases=AUTO` module: `test_<name>_cases` or `cases_<name>`"""
+    return name.startswith('cases_') or (name.startswith('test_') and name.endswith('_cases'))
+
+
+class AutoCasesModulesIndex(object):
+    """
+    An index of the `test_<name>_cases` and `cases_<name>` modules and packages present in each directory below the
+    rootdir, used by `import_default_cases_module` to resolve `cases=AUTO` without trying imports that fail (each
+    failed import walks all the `sys.path` entries).
+
+    The rootdir is scanned once, when the index is first used. As pytest does, directories matching `norecursedirs`
+    and hidden directories are not scanned. Test modules located elsewhere are resolved by trying the imports.
+    """
+    __slots__ = ('root', 'norecursedirs', 'dirs', 'hits', 'misses')
+
+    def __init__(self):
+        self.root = None  # type: Optional[str]
+        self.norecursedirs = ()  # type: Tuple[str, ...]
+        self.dirs = None  # type: Optional[Dict[str, FrozenSet[str]]]
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self,
+              root=None,         # type: str
+              norecursedirs=()   # type: Iterable[str]
+              ):
+        """Resets this index, so that `root` is scanned on next lookup. No directory is scanned if `root` is None."""
+        self.root = os.path.normcase(os.path.abspath(root)) if root is not None else None
+        self.norecursedirs = tuple(norecursedirs)
+        self.dirs = None
+        self.hits = 0
+        self.misses = 0
+
+    def _is_recursed(self,
+                     dir_name  # type: str
+                     ):
+        # type: (...) -> bool
+        return not dir_name.startswith('.') and dir_name != '__pycache__' \
+            and not any(fnmatch(dir_name, pattern) for pattern in self.norecursedirs)
+
+    def scan(self):
+        # type: (...) -> Dict[str, FrozenSet[str]]
+        """Scans the root directory. Returns a dictionary {directory: names of the candidate cases modules in it}"""
+        dirs = dict()
+        if self.root is not None:
+            for dir_path, dir_names, file_names in os.walk(self.root):
+                names = [f[:-3] for f in file_names if f.endswith('.py') and _is_auto_cases_name(f[:-3])]
+                names += [d for d in dir_names
+                          if _is_auto_cases_name(d) and os.path.exists(os.path.join(dir_path, d, '__init__.py'))]
+                dirs[dir_path] = frozenset(names)
+                dir_names[:] = [d for d in dir_names if self._is_recursed(d)]
+        return dirs
+
+    def lookup(self,
+               test_module_name  # type: str
+               ):
+        # type: (...) -> Optional[Tuple[bool, bool]]
+        """
+        Returns a tuple of booleans indicating whether the `<test_module_name>_cases` and `cases_<name>` modules exist
+        next to the `test_<name>` module `test_module_name`, or None if this can not be known from the index.
+        """
+        if self.root is None:
+            return None
+
+        try:
+            dir_path = os.path.dirname(os.path.normcase(os.path.abspath(sys.modules[test_module_name].__file__)))
+        except (KeyError, AttributeError, TypeError):
+            self.misses += 1
+            return None
+
+        if self.dirs is None:
+            with trace_span("AutoCasesModulesIndex.scan", "cases", root=self.root):
+                self.dirs = self.scan()
+
+        try:
+            names = self.dirs[dir_path]
+        except KeyError:
+            # outside of the rootdir or in a directory that is not scanned
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        test_name = test_module_name.split('.')[-1]
+        return ("%s_cases" % test_name) in names, ("cases_%s" % test_name[5:]) in names
 
-    return cases_module
+    def get_stats(self):
+        """Return a dictionary with the number of hits and misses of this index"""
+        return dict(hits=self.hits, misses=self.misses)
+
+
+AUTO_CASES_MODULES_INDEX = AutoCasesModulesIndex()
+"""The session-wide `AutoCasesModulesIndex`. It is reset when pytest is configured."""
 
 
 def hasinit(obj):
@@ -820,7 +923,21 @@ def extract_cases_from_module(module,                           # type: Union[st
     cases : List[Callable]
         A list of case functions
     """
-    # optionally import module if passed as module name string
+    module = _import_cases_module(module, package_name=package_name)
+
+    if _case_param_factory is not None:
+        # legacy: do not use the index
+        return _extract_cases_from_module_or_class(module=module, _case_param_factory=_case_param_factory,
+                                                   case_fun_prefix=case_fun_prefix)
+
+    return list(CASES_MODULES_INDEX.get_cases(module, case_fun_prefix))
+
+
+def _import_cases_module(module,           # type: Union[str, ModuleRef]
+                         package_name=None  # type: str
+                         ):
+    # type: (...) -> ModuleType
+    """Imports `module` if it is passed as a module name string, relative to `package_name`"""
     if isinstance(module, string_types):
         try:
             module = import_module(module, package=package_name)
@@ -829,9 +946,138 @@ def extract_cases_from_module(module,                           # type: Union[st
                 "Error loading cases from module. `import_module(%r, package=%r)` raised an error: %r"
                 % (module, package_name, e)
             )
+    return module
+
+
+def _renew_class_case(case_fun  # type: functools.partial
+                      ):
+    # type: (...) -> functools.partial
+    """
+    Returns a copy of `case_fun`, a case function of a case class created by `_extract_cases_from_module_or_class`,
+    bound to a new instance of the class if the case is not a static or class method.
+    """
+    cls = getattr(case_fun, _HOST_CLS_ATTR)
+    new_m = functools.partial(case_fun.func, *((cls(),) if case_fun.args else ()))
+    setattr(new_m, _HOST_CLS_ATTR, cls)
+    new_m.__name__ = case_fun.__name__
+    copy_case_info(case_fun, new_m)
+    # the marks of the case class were already copied on `case_fun`
+    copy_pytest_marks(case_fun, new_m, override=True)
+    return new_m
+
+
+class CasesModuleEntry(object):
+    """
+    The case functions found in a cases module for a given prefix, see `CasesModulesIndex`. Their `CasesTable` holds
+    the indexes on the case ids and tags used to evaluate the filters of `@parametrize_with_cases`.
+
+    The cases of case classes are renewed each time they are selected (see `select`), so that each
+    `@parametrize_with_cases` uses its own instances of the case classes, as when the module is scanned every time.
+    """
+    __slots__ = ('module', 'spec', 'nb_vars', 'table', 'in_class')
+
+    def __init__(self,
+                 module,   # type: ModuleType
+                 spec,     # type: Any
+                 nb_vars,  # type: int
+                 cases     # type: List[Callable]
+                 ):
+        self.module = module
+        self.spec = spec
+        self.nb_vars = nb_vars
+        self.table = CasesTable(cases)
+        self.in_class = [hasattr(c, _HOST_CLS_ATTR) for c in cases] if any(
+            hasattr(c, _HOST_CLS_ATTR) for c in cases) else None  # type: Optional[List[bool]]
+
+    @property
+    def cases(self):
+        # type: (...) -> List[Callable]
+        """The case functions in the module, the cases of case classes being renewed. It should not be modified."""
+        if self.in_class is None:
+            return self.table.cases
+        return [_renew_class_case(c) if in_class else c for c, in_class in zip(self.table.cases, self.in_class)]
+
+    def select(self,
+               plan  # type: Optional[FilterPlan]
+               ):
+        # type: (...) -> List[Callable]
+        """Returns the list of case functions selected by `plan`, in order. It should not be modified."""
+        if self.in_class is None:
+            return self.table.select(plan)
+        cases = self.cases
+        return cases if plan is None else self.table.with_cases(cases).select(plan)
+
+    def is_valid_for(self,
+                     module,  # type: ModuleType
+                     spec,    # type: Any
+                     nb_vars  # type: int
+                     ):
+        # type: (...) -> bool
+        """Returns True if this entry is still valid for `module`, having `spec` and `nb_vars` attributes"""
+        return self.module is module and self.spec is spec and self.nb_vars == nb_vars
+
+
+class CasesModulesIndex(object):
+    """
+    A cache of the case functions found in cases modules by `_extract_cases_from_module_or_class`, per module and case
+    prefix. A cases module is typically used by many `@parametrize_with_cases`, so it is only scanned once.
+
+    An entry is reused only if the module object, its `__spec__` and its number of attributes are the same, so that
+    reloaded or modified modules are scanned again. Modules being imported (for example when `THIS_MODULE` is used) are
+    not cached, since their cases are not all defined yet.
+    """
+    __slots__ = ('entries', 'hits', 'misses')
+
+    def __init__(self):
+        self.entries = dict()  # type: Dict[Tuple[str, str], CasesModuleEntry]
+        self.hits = 0
+        self.misses = 0
+
+    def get_entry(self,
+                  module,          # type: ModuleType
+                  case_fun_prefix  # type: str
+                  ):
+        # type: (...) -> CasesModuleEntry
+        """Returns the `CasesModuleEntry` containing the case functions in `module`."""
+        key = module.__name__, case_fun_prefix
+        spec = getattr(module, '__spec__', None)
+        nb_vars = len(vars(module))
+        entry = self.entries.get(key)
+        if entry is not None and entry.is_valid_for(module, spec, nb_vars):
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = CasesModuleEntry(module, spec, nb_vars,
+                                 _extract_cases_from_module_or_class(module=module, case_fun_prefix=case_fun_prefix))
+        if getattr(spec, '_initializing', False):
+            # the module is being imported: do not cache (and remove any outdated entry)
+            self.entries.pop(key, None)
+        else:
+            self.entries[key] = entry
+        return entry
+
+    def get_cases(self,
+                  module,          # type: ModuleType
+                  case_fun_prefix  # type: str
+                  ):
+        # type: (...) -> List[Callable]
+        """Returns the list of case functions in `module`. It should not be modified."""
+        return self.get_entry(module, case_fun_prefix).cases
+
+    def clear(self):
+        """Removes all entries and resets the statistics"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        """Return a dictionary with the number of hits and misses of this cache"""
+        return dict(hits=self.hits, misses=self.misses)
+
 
-    return _extract_cases_from_module_or_class(module=module, _case_param_factory=_case_param_factory,
-                                               case_fun_prefix=case_fun_prefix)
+CASES_MODULES_INDEX = CasesModulesIndex()
+"""The session-wide `CasesModulesIndex`. It is cleared when pytest is configured."""
 
 
 def _extract_cases_from_module_or_class(module=None,                      # type: ModuleRef
@@ -901,7 +1147,7 @@ def _extract_cases_from_module_or_class(module=None,                      # type
                 m_for_placing = m.place_as
             except AttributeError:
                 # nominal: get the first line of code
-                co_firstlineno = get_code_first_line(m)
+                co_firstlineno = get_case_record(m).first_line
             else:
                 # currently we only support replacing inside the same module
                 if m_for_placing.__module__ != m.__module__:
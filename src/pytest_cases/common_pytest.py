@@ -28,6 +28,7 @@ from _pytest.python import Metafunc
 
 from .common_mini_six import string_types
 from .common_others import get_function_host
+from .common_tracing import trace_count, trace_new
 from .common_pytest_marks import make_marked_parameter_value, get_param_argnames_as_list, \
     get_pytest_parametrize_marks, get_pytest_usefixture_marks, PYTEST3_OR_GREATER, PYTEST6_OR_GREATER, \
     PYTEST38_OR_GREATER, PYTEST34_OR_GREATER, PYTEST33_OR_GREATER, PYTEST32_OR_GREATER, PYTEST71_OR_GREATER, \
@@ -44,6 +45,8 @@ if PYTEST3_OR_GREATER:
                 f = hook(f)
 
             # create the fixture
+            trace_count("generated_fixtures")
+            trace_new("fixture")
             return pytest.fixture(**kwargs)(f)
         return _decorate
 else:
@@ -59,6 +62,8 @@ else:
                 f = hook(f)
 
             # create the fixture
+            trace_count("generated_fixtures")
+            trace_new("fixture")
             if isgeneratorfunction(f):
                 return pytest.yield_fixture(**kwargs)(f)
             else:
@@ -609,6 +614,15 @@ try:
     def set_callspec_arg_scope_to_function(callspec, arg_name):
         callspec._arg2scope[arg_name] = Scope.Function
 
+    def set_callspec_arg_scope_to_fixture(callspec, arg_name, fixdef):
+        callspec._arg2scope[arg_name] = fixdef._scope  # noqa
+
+    def get_callspec_arg_scope_name(callspec, arg_name):
+        # type: (...) -> str
+        """Return the name of the scope of parameter `arg_name` in `callspec`: 'session', 'module', ..."""
+        scope = callspec._arg2scope.get(arg_name)
+        return scope.value if scope is not None else "function"
+
 except ImportError:
     try:
         # pytest 3+
@@ -629,6 +643,15 @@ except ImportError:
     def set_callspec_arg_scope_to_function(callspec, arg_name):
         callspec._arg2scopenum[arg_name] = get_pytest_function_scopeval()  # noqa
 
+    def set_callspec_arg_scope_to_fixture(callspec, arg_name, fixdef):
+        callspec._arg2scopenum[arg_name] = fixdef.scopenum  # noqa
+
+    def get_callspec_arg_scope_name(callspec, arg_name):
+        # type: (...) -> str
+        """Return the name of the scope of parameter `arg_name` in `callspec`: 'session', 'module', ..."""
+        scopenum = callspec._arg2scopenum.get(arg_name)  # noqa
+        return pt_scopes[scopenum] if scopenum is not None else "function"
+
 
 def in_callspec_explicit_args(
     callspec,  # type: CallSpec2
@@ -20,6 +20,7 @@ try:
 except ImportError:
     pass
 
+from .common_tracing import trace_new
 from .common_pytest_marks import get_pytest_marks_on_function, markdecorators_as_tuple, PYTEST53_OR_GREATER, \
     markdecorators_to_markinfos
 
@@ -162,6 +163,7 @@ class _LazyValue(Lazy):
         self._marks = markdecorators_as_tuple(marks)
         self.cached_value_context = None
         self.cached_value = None
+        trace_new("LazyValue")
 
     def __hash__(self):
         """Provide a minimal hash representing the class, valuegetter, id and marks"""
@@ -172,6 +172,20 @@ def get_pytest_marks_on_item(item):
         return [val for val in item.keywords.values() if isinstance(val, (MarkDecorator, Mark))]
 
 
+def is_statically_skipped(item):
+    """
+    Returns True if `item` will be skipped whatever the context: it has a `skip` mark, or a `skipif` mark with a
+    condition that is the boolean `True`. String conditions are not evaluated, so such items are considered as run.
+    """
+    for _ in item.iter_markers(name="skip"):
+        return True
+    for mark in item.iter_markers(name="skipif"):
+        conditions = mark.args if mark.args else (mark.kwargs.get("condition"),)
+        if any(condition is True for condition in conditions):
+            return True
+    return False
+
+
 def get_pytest_usefixture_marks(f):
     # pytest > 3.2.0
     marks = getattr(f, 'pytestmark', None)
@@ -0,0 +1,415 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+import json
+import os
+import threading
+import tracemalloc
+from itertools import chain
+from time import perf_counter
+
+try:  # python 3.5+ type hints
+    from typing import Any, Dict, List, Optional, Tuple  # noqa
+except ImportError:
+    pass
+
+from .common_others import qname
+
+
+_TRACERS = []  # type: List[Any]
+"""The list of currently active tracers. When it is empty, tracing is disabled and `trace_span` costs nothing."""
+
+_OPEN_SPANS = []  # type: List[_Span]
+"""The stack of spans currently open, used by `trace_count`. Only maintained while tracing is enabled."""
+
+
+def start_tracing(tracer):
+    """
+    Activates `tracer`: from now on it will receive all spans through its `add_span(name, cat, start, duration, args)`
+    method, where `start` and `duration` are in seconds (`time.perf_counter` timebase).
+    """
+    if tracer not in _TRACERS:
+        _TRACERS.append(tracer)
+
+
+def stop_tracing(tracer):
+    """Deactivates `tracer`. Nothing happens if it was not active."""
+    try:
+        _TRACERS.remove(tracer)
+    except ValueError:
+        pass
+
+
+def is_tracing():
+    # type: (...) -> bool
+    """Returns True if at least one tracer is active. Use it to avoid computing expensive span arguments."""
+    return len(_TRACERS) > 0
+
+
+class _NoopSpan(object):
+    """The span returned by `trace_span` when tracing is disabled. It does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+MEMORY_ARG = 'traced_memory'
+"""The span argument containing the memory traced by `tracemalloc` during the span, if it was tracing"""
+
+
+class _Span(object):
+    """
+    A span measuring the wall time of its `with` block, sent to all active tracers on exit. If `tracemalloc` is
+    tracing, the difference of traced memory between the end and the start of the block is stored in the `MEMORY_ARG`
+    argument.
+    """
+    __slots__ = 'name', 'cat', 'args', 'start', 'start_memory'
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = None
+        self.start_memory = None
+
+    def __enter__(self):
+        _OPEN_SPANS.append(self)
+        if tracemalloc.is_tracing():
+            self.start_memory = tracemalloc.get_traced_memory()[0]
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = perf_counter() - self.start
+        if self.start_memory is not None and tracemalloc.is_tracing():
+            self.args[MEMORY_ARG] = tracemalloc.get_traced_memory()[0] - self.start_memory
+        if _OPEN_SPANS and _OPEN_SPANS[-1] is self:
+            _OPEN_SPANS.pop()
+        for tracer in _TRACERS:
+            tracer.add_span(self.name, self.cat, self.start, duration, self.args)
+        return False
+
+    def set(self, **args):
+        """Adds arguments to this span, for example results only known at the end of the block."""
+        self.args.update(args)
+
+
+def trace_span(name,  # type: str
+               cat,   # type: str
+               **args
+               ):
+    """
+    Returns a context manager recording the wall time of its `with` block as a span named `name` in category `cat`.
+    `args` are attached to the span. They are converted to strings only when the trace is exported, so that tracing
+    remains cheap. When tracing is disabled a shared no-op object is returned.
+
+    :param name: the span name, for example 'create_super_closure'
+    :param cat: the span category, for example 'closure'
+    :param args: optional arguments to attach to the span
+    :return:
+    """
+    if not _TRACERS:
+        return _NOOP_SPAN
+    return _Span(name, cat, args)
+
+
+def trace_count(name,  # type: str
+                value=1
+                ):
+    """
+    Adds `value` to the counter `name` of the innermost open span having a 'target' argument (the function being
+    parametrized or collected). The counter is stored as an argument of that span. Does nothing when tracing is
+    disabled or when no such span is open.
+    """
+    if not _TRACERS:
+        return
+    for span in reversed(_OPEN_SPANS):
+        if 'target' in span.args:
+            span.args[name] = span.args.get(name, 0) + value
+            return
+
+
+def trace_new(kind,  # type: str
+              nb=1
+              ):
+    """
+    Records the creation of `nb` objects of kind `kind` (for example 'LazyValue') in the innermost open span, as an
+    argument of that span. Does nothing when tracing is disabled or when no span is open.
+    """
+    if not _TRACERS or not _OPEN_SPANS:
+        return
+    args = _OPEN_SPANS[-1].args
+    args[kind] = args.get(kind, 0) + nb
+
+
+def _to_trace_arg(o):
+    """Converts a span argument into something that can be dumped to json"""
+    if o is None or isinstance(o, (bool, int, float, str)):
+        return o
+    nodeid = getattr(o, 'nodeid', None)
+    if isinstance(nodeid, str):
+        # a pytest node
+        return nodeid
+    elif callable(o):
+        try:
+            return qname(getattr(o, 'func', o))
+        except Exception:  # noqa
+            pass
+    return str(o)
+
+
+class ChromeTracer(object):
+    """
+    A tracer collecting spans as "complete" events of the Chrome trace-event format, that can be loaded in
+    `chrome://tracing` or https://ui.perfetto.dev . See
+    https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+    """
+    __slots__ = 'events', 't0', 'pid'
+
+    def __init__(self):
+        self.events = []  # type: List[Dict]
+        self.t0 = perf_counter()
+        self.pid = os.getpid()
+
+    def add_span(self, name, cat, start, duration, args):
+        event = dict(name=name, cat=cat, ph="X", ts=(start - self.t0) * 1e6, dur=duration * 1e6,
+                     pid=self.pid, tid=threading.current_thread().ident)
+        if args:
+            event['args'] = {k: _to_trace_arg(v) for k, v in args.items()}
+        self.events.append(event)
+
+    def to_dict(self):
+        # type: (...) -> Dict[str, Any]
+        """Returns the trace as a dictionary in the 'json object' flavour of the trace-event format."""
+        metadata = dict(name="process_name", ph="M", pid=self.pid, tid=0, args=dict(name="pytest-cases collection"))
+        return dict(traceEvents=[metadata] + self.events, displayTimeUnit="ms")
+
+    def write(self, path):
+        """Writes the trace to json file `path`"""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+
+def _get_target_key(target):
+    """Returns a (module name, qualified name) key for a target function, or for the function of a pytest node"""
+    if isinstance(getattr(target, 'nodeid', None), str):
+        # a pytest node: use the underlying function
+        target = getattr(target, 'obj', target)
+    target = getattr(target, 'func', target)  # functools.partial
+    name = getattr(target, '__qualname__', None) or getattr(target, '__name__', None) or str(target)
+    return getattr(target, '__module__', None), name
+
+
+class ProfileEntry(object):
+    """The collection costs and counters of a single target function, aggregated by `CollectionProfiler`"""
+    __slots__ = 'target_key', 'times', 'counters'
+
+    def __init__(self, target_key):
+        self.target_key = target_key
+        self.times = dict()     # type: Dict[str, float]
+        self.counters = dict()  # type: Dict[str, int]
+
+    @property
+    def total_time(self):
+        # type: (...) -> float
+        """Time spent decorating this function, and collecting it as a test function"""
+        return sum(self.times.get(c, 0.) for c in CollectionProfiler.TOTAL_SPANS)
+
+    def __repr__(self):
+        return "ProfileEntry(%s.%s, times=%r, counters=%r)" % (self.target_key + (self.times, self.counters))
+
+
+class CollectionProfiler(object):
+    """
+    A tracer aggregating the spans per target function (the `target` span argument), so as to rank the test functions
+    (or fixtures) by collection cost. Numeric span arguments in `COUNTERS` are summed.
+    """
+    __slots__ = 'entries',
+
+    SPANS = ('get_all_cases', 'get_parametrize_args', '_parametrize_plus', 'create_super_closure',
+             'create_call_list_from_pending_parametrizations')
+    """The spans reported as columns"""
+
+    FUNCTION_CAT = 'function'
+    """Category of the span recording the collection of a test function by pytest, whatever its name"""
+
+    TOTAL_SPANS = ('get_all_cases', 'get_parametrize_args', '_parametrize_plus', FUNCTION_CAT)
+    """The spans summed to compute the total cost. Test function collection contains the closure and calls spans"""
+
+    COUNTERS = ('generated_fixtures', 'union_splits', 'nb_callspecs')
+
+    def __init__(self):
+        self.entries = dict()  # type: Dict[Any, ProfileEntry]
+
+    def add_span(self, name, cat, start, duration, args):
+        try:
+            target = args['target']
+        except KeyError:
+            return
+
+        key = _get_target_key(target)
+        try:
+            entry = self.entries[key]
+        except KeyError:
+            self.entries[key] = entry = ProfileEntry(key)
+
+        if cat == self.FUNCTION_CAT:
+            name = cat
+        entry.times[name] = entry.times.get(name, 0.) + duration
+        for c in self.COUNTERS:
+            v = args.get(c)
+            if v:
+                entry.counters[c] = entry.counters.get(c, 0) + v
+
+    def get_top_entries(self, top=None):
+        # type: (...) -> List[ProfileEntry]
+        """Returns the `top` most expensive entries (all if `top` is None), sorted by decreasing total time"""
+        entries = sorted(self.entries.values(), key=lambda e: e.total_time, reverse=True)
+        return entries if top is None else entries[:top]
+
+    def format_report(self, top=None):
+        # type: (...) -> List[str]
+        """Returns the lines of a text report with the `top` most expensive entries"""
+        headers = ("total ms", "cases ms", "args ms", "paramz ms", "closure ms", "calls ms", "fixtures", "splits",
+                   "callspecs", "function")
+        lines = ["%9s %9s %9s %9s %10s %9s %8s %6s %9s  %s" % headers]
+        for e in self.get_top_entries(top):
+            times = tuple(e.times.get(s, 0.) * 1000 for s in self.SPANS)
+            counters = tuple(e.counters.get(c, 0) for c in self.COUNTERS)
+            module_name, qualname = e.target_key
+            lines.append("%9.2f %9.2f %9.2f %9.2f %10.2f %9.2f %8d %6d %9d  %s::%s"
+                         % ((e.total_time * 1000,) + times + counters + (module_name, qualname)))
+        return lines
+
+
+class MemoryEntry(object):
+    """The memory allocated by a generating API, or for a test module, aggregated by `MemoryProfiler`"""
+    __slots__ = 'nb_bytes', 'nb_spans', 'objects'
+
+    def __init__(self):
+        self.nb_bytes = 0
+        self.nb_spans = 0
+        self.objects = dict()  # type: Dict[str, int]
+
+    def add(self, nb_bytes, objects):
+        """Adds the memory and the (kind, number) objects of a span"""
+        self.nb_bytes += nb_bytes
+        self.nb_spans += 1
+        for kind, nb in objects:
+            self.objects[kind] = self.objects.get(kind, 0) + nb
+
+    def merge(self, other):
+        """Adds all the spans of `other`"""
+        self.nb_bytes += other.nb_bytes
+        self.nb_spans += other.nb_spans
+        for kind, nb in other.objects.items():
+            self.objects[kind] = self.objects.get(kind, 0) + nb
+
+
+class MemoryProfiler(object):
+    """
+    A tracer attributing the memory traced by `tracemalloc` during collection to the spans, excluding their nested
+    spans. The memory is aggregated per span name (the generating API) and per module of the target (the test module)
+    or 'module' argument of the innermost span having one, together with the number of objects of each kind created in
+    these spans (see `trace_new`).
+
+    `tracemalloc` should be tracing while this profiler is active: spans do not record memory otherwise.
+    """
+    __slots__ = 'apis', '_modules', 'start_memory', 'end_memory', '_children_bytes'
+
+    FUNCTION_SPAN = 'pytest_pycollect_makeitem'
+    """The name used for the spans recording the collection of a test function by pytest, whatever its name"""
+
+    OBJECTS = (('fixture', 'fixtures'), ('LazyValue', 'lazy values'), ('ParamAlternative', 'param alts'),
+               ('CombinedFixtureParamValue', 'combined'), ('nb_callspecs', 'callspecs'))
+    """The kinds of objects counted in the report, and the corresponding column headers"""
+
+    def __init__(self):
+        self.apis = dict()      # type: Dict[str, MemoryEntry]
+        # per module name, or per span arguments containing the module name since it can be set at the end of the span
+        self._modules = dict()  # type: Dict[Any, Tuple[Optional[Dict[str, Any]], MemoryEntry]]
+        self.start_memory = tracemalloc.get_traced_memory()[0]
+        self.end_memory = None
+        # the total memory of the closed spans that are children of the open span at each depth
+        self._children_bytes = dict()  # type: Dict[int, int]
+
+    def stop(self):
+        """Records the traced memory at the end of the profiled period"""
+        self.end_memory = tracemalloc.get_traced_memory()[0]
+
+    def add_span(self, name, cat, start, duration, args):
+        nb_bytes = args.get(MEMORY_ARG)
+        if nb_bytes is None:
+            return
+
+        # remove the memory of the nested spans, and add this one to its parent
+        depth = len(_OPEN_SPANS)
+        self_bytes = nb_bytes - self._children_bytes.pop(depth + 1, 0)
+        self._children_bytes[depth] = self._children_bytes.get(depth, 0) + nb_bytes
+
+        objects = [(kind, args[kind]) for kind, _ in self.OBJECTS if args.get(kind)]
+        if cat == CollectionProfiler.FUNCTION_CAT:
+            name = self.FUNCTION_SPAN
+        try:
+            api_entry = self.apis[name]
+        except KeyError:
+            self.apis[name] = api_entry = MemoryEntry()
+        api_entry.add(self_bytes, objects)
+
+        # the module of the innermost target or module: the one of this span or of an enclosing span
+        key, module_args = None, None
+        for span_args in chain((args,), (span.args for span in reversed(_OPEN_SPANS))):
+            if 'target' in span_args:
+                key = _get_target_key(span_args['target'])[0]
+                break
+            elif 'module' in span_args:
+                key, module_args = id(span_args), span_args
+                break
+        try:
+            module_entry = self._modules[key][1]
+        except KeyError:
+            module_entry = MemoryEntry()
+            self._modules[key] = module_args, module_entry
+        module_entry.add(self_bytes, objects)
+
+    @property
+    def modules(self):
+        # type: (...) -> Dict[str, MemoryEntry]
+        """The memory entries per module name"""
+        res = dict()
+        for key, (module_args, entry) in self._modules.items():
+            module_name = module_args['module'] if module_args is not None else key
+            try:
+                res[module_name].merge(entry)
+            except KeyError:
+                res[module_name] = total = MemoryEntry()
+                total.merge(entry)
+        return res
+
+    def format_report(self, top=None):
+        # type: (...) -> List[str]
+        """Returns the lines of a text report, with the `top` entries allocating the most memory in each table"""
+        end_memory = self.end_memory if self.end_memory is not None else tracemalloc.get_traced_memory()[0]
+        lines = ["traced memory: %.1f KiB allocated during collection, %.1f KiB in pytest-cases spans"
+                 % ((end_memory - self.start_memory) / 1024., sum(e.nb_bytes for e in self.apis.values()) / 1024.)]
+        headers = tuple(h for _, h in self.OBJECTS)
+        for title, entries in (("generating API", self.apis), ("test module", self.modules)):
+            lines.append("")
+            lines.append(("%10s %6s" + " %11s" * len(headers) + "  %s") % (("KiB", "spans") + headers + (title,)))
+            sorted_entries = sorted(entries.items(), key=lambda i: i[1].nb_bytes, reverse=True)
+            for key, e in (sorted_entries if top is None else sorted_entries[:top]):
+                lines.append(("%10.1f %6d" + " %11d" * len(headers) + "  %s")
+                             % ((e.nb_bytes / 1024., e.nb_spans) + tuple(e.objects.get(k, 0) for k, _ in self.OBJECTS)
+                                + ("<no module>" if key is None else key,)))
+        return lines
@@ -4,7 +4,12 @@
 # License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
 import re
 
-from .case_funcs import get_case_id, get_case_tags
+try:  # python 3.5+
+    from typing import Callable, Union, Optional, Any, Iterable, List, Dict, FrozenSet, Tuple  # noqa
+except ImportError:
+    pass
+
+from .case_funcs import _CaseInfo, get_case_record, matches_tag_query
 
 
 class CaseFilter(object):
@@ -14,34 +19,373 @@ class CaseFilter(object):
     `CaseFilter` implements logical operations "and" (`&`) "or" (`|`) and "not" (`~`). You can use it to define a
     composable filter from any callable receiving a single `case` argument and returning a boolean indicating if the
     `case` is selected.
+
+    Combined filters are compiled into a filter plan (see `FilterPlan`), so that the filters on case tags and ids can
+    be evaluated on the indexes of a `CasesTable`, and the other callables only on the remaining cases.
     """
 
-    def __init__(self, filter_function):
+    def __init__(self,
+                 filter_function,  # type: Callable[[Callable], Any]
+                 plan=None         # type: FilterPlan
+                 ):
         self.filter_function = filter_function
+        self.plan = plan if plan is not None else CallablePlan(filter_function)
 
     def __call__(self, case):
         return self.filter_function(case)
 
     def __and__(self, other):
-        return CaseFilter(
-            lambda case: self(case) and other(case)
-        )
+        return CaseFilter.from_plan(AndPlan((self.plan, as_filter_plan(other))))
 
     def __rand__(self, other):
-        return self & other
+        return CaseFilter.from_plan(AndPlan((as_filter_plan(other), self.plan)))
 
     def __or__(self, other):
-        return CaseFilter(
-            lambda case: self(case) or other(case)
-        )
+        return CaseFilter.from_plan(OrPlan((self.plan, as_filter_plan(other))))
 
     def __ror__(self, other):
-        return self | other
+        return CaseFilter.from_plan(OrPlan((as_filter_plan(other), self.plan)))
 
     def __invert__(self):
-        return CaseFilter(
-            lambda case: not self(case)
-        )
+        return CaseFilter.from_plan(NotPlan(self.plan))
+
+    @classmethod
+    def from_plan(cls, plan):
+        # type: (FilterPlan) -> CaseFilter
+        """Creates a `CaseFilter` evaluating `plan`"""
+        return cls(plan, plan=plan)
+
+
+def as_filter_plan(filter):  # noqa
+    # type: (...) -> FilterPlan
+    """Returns the `FilterPlan` of `filter`: a `CaseFilter`, a `FilterPlan` or any callable"""
+    if isinstance(filter, CaseFilter):
+        return filter.plan
+    elif isinstance(filter, FilterPlan):
+        return filter
+    else:
+        return CallablePlan(filter)
+
+
+def compile_filter_plan(has_tag=None,  # type: Union[str, Iterable[str]]
+                        glob=None,     # type: str
+                        filter=None    # type: Union[Callable[[Callable], bool], Iterable[Callable[[Callable], bool]]]  # noqa
+                        ):
+    # type: (...) -> Optional[FilterPlan]
+    """
+    Returns the `FilterPlan` selecting the cases having all tags in `has_tag`, with an id matching the `glob` pattern,
+    and selected by all `filter` callables. Returns None if there is no such query.
+    """
+    plans = []
+    if has_tag is not None:
+        plans.append(HasTagsPlan(has_tag if isinstance(has_tag, (tuple, list, set)) else (has_tag,)))
+    if glob is not None:
+        plans.append(IdPlan(IdPlan.GLOB, glob))
+    if filter is not None:
+        if not isinstance(filter, (tuple, set, list)):
+            filter = (filter,)
+        plans += [as_filter_plan(f) for f in filter]
+
+    if not plans:
+        return None
+    elif len(plans) == 1:
+        return plans[0]
+    else:
+        return AndPlan(plans)
+
+
+class CasesTable(object):
+    """
+    A list of case functions with lazily computed indexes on their ids and tags, to evaluate `FilterPlan`s. The
+    positions of the cases selected by each indexed predicate are cached, so that the same predicate is evaluated once
+    per table.
+    """
+    __slots__ = ('cases', '_ids', '_tags_index', '_positions')
+
+    def __init__(self,
+                 cases  # type: List[Callable]
+                 ):
+        self.cases = cases
+        self._ids = None  # type: Optional[List[str]]
+        self._tags_index = None  # type: Optional[Union[bool, Dict[Any, FrozenSet[int]]]]
+        self._positions = dict()  # type: Dict[Any, FrozenSet[int]]
+
+    @property
+    def ids(self):
+        # type: (...) -> List[str]
+        """The ids of the cases (as returned by `get_case_id`)"""
+        if self._ids is None:
+            self._ids = [get_case_record(c).get_id() for c in self.cases]
+        return self._ids
+
+    def get_tags_index(self):
+        # type: (...) -> Optional[Dict[Any, FrozenSet[int]]]
+        """Returns a dictionary {tag: positions of the cases having this tag}, or None if a tag is not hashable"""
+        if self._tags_index is None:
+            tags_index = dict()
+            for i, case_fun in enumerate(self.cases):
+                ci = _CaseInfo.get_from(case_fun)
+                if ci is None:
+                    continue
+                if ci.tags_set is None:
+                    # unhashable tag: the index can not be built
+                    tags_index = False
+                    break
+                for t in ci.tags_set:
+                    tags_index.setdefault(t, set()).add(i)
+            if tags_index is not False:
+                tags_index = {t: frozenset(positions) for t, positions in tags_index.items()}
+            self._tags_index = tags_index
+        return None if self._tags_index is False else self._tags_index
+
+    def get_positions(self,
+                      key,     # type: Any
+                      compute  # type: Callable[[], FrozenSet[int]]
+                      ):
+        # type: (...) -> FrozenSet[int]
+        """Returns the positions cached for `key`, computing them with `compute()` the first time"""
+        try:
+            return self._positions[key]
+        except KeyError:
+            positions = self._positions[key] = compute()
+            return positions
+
+    def with_cases(self,
+                   cases  # type: List[Callable]
+                   ):
+        # type: (...) -> CasesTable
+        """
+        Returns a table of `cases`, sharing the indexes of this table. `cases` should have the same ids and tags than
+        the cases of this table, in the same order.
+        """
+        table = CasesTable(cases)
+        table._ids = self.ids
+        self.get_tags_index()
+        table._tags_index = self._tags_index
+        table._positions = self._positions
+        return table
+
+    def select(self,
+               plan  # type: Optional[FilterPlan]
+               ):
+        # type: (...) -> List[Callable]
+        """Returns the list of cases selected by `plan`, in order. It should not be modified."""
+        if plan is None:
+            return self.cases
+
+        # an error raised by a filter callable leads to a no-match, as in `matches_tag_query`
+        failed = set()
+        positions = plan.select(self, frozenset(range(len(self.cases))), failed)
+        if failed:
+            positions = positions.difference(failed)
+        if len(positions) == len(self.cases):
+            return self.cases
+        return [self.cases[i] for i in sorted(positions)]
+
+
+class FilterPlan(object):
+    """
+    A node in a compiled case filter. Plans are callables receiving a case, and can also select all the matching
+    positions in a `CasesTable` at once. Indexed plans (`is_indexed`) only rely on the table indexes.
+    """
+    __slots__ = ()
+
+    is_indexed = False
+
+    def __call__(self, case):
+        raise NotImplementedError()
+
+    def select(self,
+               table,       # type: CasesTable
+               candidates,  # type: FrozenSet[int]
+               failed       # type: set
+               ):
+        # type: (...) -> FrozenSet[int]
+        """
+        Returns the subset of `candidates` positions in `table` that are selected by this plan. Positions of cases for
+        which a filter callable raised an error are added to `failed`.
+        """
+        raise NotImplementedError()
+
+
+class HasTagsPlan(FilterPlan):
+    """Selects the cases having all the `tags`, using the tags index of the table"""
+    __slots__ = ('tags',)
+
+    is_indexed = True
+
+    def __init__(self, tags):
+        self.tags = tuple(tags)
+
+    def __repr__(self):
+        return "HasTags%r" % (self.tags,)
+
+    def __call__(self, case):
+        return matches_tag_query(case, has_tag=self.tags)
+
+    def select(self, table, candidates, failed):
+        tags_index = table.get_tags_index()
+        if tags_index is not None:
+            try:
+                for t in self.tags:
+                    candidates = candidates.intersection(tags_index.get(t, ()))
+                    if not candidates:
+                        break
+            except TypeError:
+                pass  # unhashable tag in the query
+            else:
+                return candidates
+
+        return frozenset(i for i in candidates if self(table.cases[i]))
+
+
+class IdPlan(FilterPlan):
+    """Selects the cases with an id having a prefix, a suffix, or matching a regex or a glob pattern"""
+    __slots__ = ('kind', 'pattern', '_matcher')
+
+    PREFIX = 'prefix'
+    SUFFIX = 'suffix'
+    REGEX = 'regex'
+    GLOB = 'glob'
+
+    is_indexed = True
+
+    def __init__(self,
+                 kind,    # type: str
+                 pattern  # type: str
+                 ):
+        self.kind = kind
+        self.pattern = pattern
+        if kind == IdPlan.PREFIX:
+            self._matcher = lambda case_id: case_id.startswith(pattern)
+        elif kind == IdPlan.SUFFIX:
+            self._matcher = lambda case_id: case_id.endswith(pattern)
+        elif kind == IdPlan.REGEX:
+            self._matcher = re.compile(pattern).match
+        elif kind == IdPlan.GLOB:
+            # escape all special regex characters, then find the (escaped) stars and turn them into the regex star .*
+            # and add "end" special regex char
+            self._matcher = re.compile(re.escape(pattern).replace("\\*", ".*") + "$").match
+        else:
+            raise ValueError("Unknown case id predicate kind: %r" % kind)
+
+    def __repr__(self):
+        return "Id(%s=%r)" % (self.kind, self.pattern)
+
+    def __call__(self, case):
+        case_id = get_case_record(case).get_id()
+        assert case_id is not None
+        return self._matcher(case_id)
+
+    def select(self, table, candidates, failed):
+        def _compute():
+            return frozenset(i for i, case_id in enumerate(table.ids) if self._matcher(case_id))
+
+        return candidates.intersection(table.get_positions((IdPlan, self.kind, self.pattern), _compute))
+
+
+class CallablePlan(FilterPlan):
+    """Selects the cases for which an arbitrary callable returns a truth value. It is evaluated case by case."""
+    __slots__ = ('filter_function',)
+
+    def __init__(self, filter_function):
+        self.filter_function = filter_function
+
+    def __repr__(self):
+        return "Callable(%r)" % (self.filter_function,)
+
+    def __call__(self, case):
+        return self.filter_function(case)
+
+    def select(self, table, candidates, failed):
+        selected = set()
+        for i in sorted(candidates):
+            try:
+                if self.filter_function(table.cases[i]):
+                    selected.add(i)
+            except:  # noqa
+                # any error leads to a no-match
+                failed.add(i)
+        return frozenset(selected)
+
+
+class _CompositePlan(FilterPlan):
+    """Base class of `AndPlan` and `OrPlan`. Nested plans of the same type are flattened."""
+    __slots__ = ('plans', 'is_indexed', '_ordered')
+
+    def __init__(self,
+                 plans  # type: Iterable[FilterPlan]
+                 ):
+        flat_plans = []
+        for p in plans:
+            if type(p) is type(self):
+                flat_plans += p.plans
+            else:
+                flat_plans.append(p)
+        self.plans = tuple(flat_plans)
+        self.is_indexed = all(p.is_indexed for p in self.plans)
+        # indexed plans are evaluated first on the tables, so that callables are evaluated on less cases
+        self._ordered = tuple(sorted(self.plans, key=lambda p: not p.is_indexed))
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__[:-4], ", ".join(repr(p) for p in self.plans))
+
+
+class AndPlan(_CompositePlan):
+    """Selects the cases selected by all the plans"""
+    __slots__ = ()
+
+    def __call__(self, case):
+        for p in self.plans:
+            if not p(case):
+                return False
+        return True
+
+    def select(self, table, candidates, failed):
+        for p in self._ordered:
+            if not candidates:
+                break
+            candidates = p.select(table, candidates, failed)
+        return candidates
+
+
+class OrPlan(_CompositePlan):
+    """Selects the cases selected by at least one of the plans"""
+    __slots__ = ()
+
+    def __call__(self, case):
+        for p in self.plans:
+            if p(case):
+                return True
+        return False
+
+    def select(self, table, candidates, failed):
+        selected = frozenset()
+        for p in self._ordered:
+            if not candidates:
+                break
+            p_selected = p.select(table, candidates, failed)
+            selected = selected.union(p_selected)
+            candidates = candidates.difference(p_selected)
+        return selected
+
+
+class NotPlan(FilterPlan):
+    """Selects the cases not selected by a plan"""
+    __slots__ = ('plan', 'is_indexed')
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.is_indexed = plan.is_indexed
+
+    def __repr__(self):
+        return "Not(%r)" % (self.plan,)
+
+    def __call__(self, case):
+        return not self.plan(case)
+
+    def select(self, table, candidates, failed):
+        return candidates.difference(self.plan.select(table, candidates, failed))
 
 
 def has_tags(*tag_names  # type: str
@@ -53,12 +397,7 @@ def has_tags(*tag_names  # type: str
     :return:
     """
 
-    def _filter(case):
-        return len(
-            set(tag_names) - set(get_case_tags(case))
-        ) == 0
-
-    return CaseFilter(_filter)
+    return CaseFilter.from_plan(HasTagsPlan(tag_names))
 
 
 def has_tag(tag_name  # type: str
@@ -70,10 +409,7 @@ def has_tag(tag_name  # type: str
     :return:
     """
 
-    def _filter(case):
-        return tag_name in get_case_tags(case)
-
-    return CaseFilter(_filter)
+    return CaseFilter.from_plan(HasTagsPlan((tag_name,)))
 
 
 def id_has_prefix(prefix  # type: str
@@ -85,10 +421,7 @@ def id_has_prefix(prefix  # type: str
     possibly overridden with `@case(id=)`
     """
 
-    def _filter(case):
-        return get_case_id(case).startswith(prefix)
-
-    return CaseFilter(_filter)
+    return CaseFilter.from_plan(IdPlan(IdPlan.PREFIX, prefix))
 
 
 def id_has_suffix(suffix  # type: str
@@ -100,10 +433,7 @@ def id_has_suffix(suffix  # type: str
     possibly overridden with `@case(id=)`
     """
 
-    def _filter(case):
-        return get_case_id(case).endswith(suffix)
-
-    return CaseFilter(_filter)
+    return CaseFilter.from_plan(IdPlan(IdPlan.SUFFIX, suffix))
 
 
 def id_match_regex(regex  # type: str
@@ -115,7 +445,4 @@ def id_match_regex(regex  # type: str
     possibly overridden with `@case(id=)`
     """
 
-    def _filter(case):
-        return re.match(regex, get_case_id(case))
-
-    return CaseFilter(_filter)
+    return CaseFilter.from_plan(IdPlan(IdPlan.REGEX, regex))
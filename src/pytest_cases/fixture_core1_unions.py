@@ -39,6 +39,7 @@ except ImportError:
 from .common_mini_six import string_types
 from .common_pytest import get_fixture_name, is_marked_parameter_value, get_marked_parameter_values, pytest_fixture, \
     extract_parameterset_info, get_param_argnames_as_list, get_fixture_scope, resolve_ids
+from .common_tracing import trace_span
 from .fixture__creation import get_caller_module, check_name_available, WARN
 
 
@@ -213,6 +214,21 @@ def is_used_request(request):
     return getattr(request, 'param', None) is not NOT_USED
 
 
+NOT_USED_AWARE = '_pytestcases_not_used_aware'
+"""Attribute set on the fixture functions that return `NOT_USED` without executing anything when not used"""
+
+
+def set_not_used_aware(fixture_func):
+    """Marks `fixture_func` as a fixture function returning `NOT_USED` without executing anything when not used"""
+    setattr(fixture_func, NOT_USED_AWARE, True)
+    return fixture_func
+
+
+def is_not_used_aware(fixture_func):
+    """Returns True if `fixture_func` returns `NOT_USED` without executing anything when not used"""
+    return getattr(fixture_func, NOT_USED_AWARE, False)
+
+
 def ignore_unused(fixture_func):
     """
     A decorator for fixture functions so that they are compliant with fixture unions.
@@ -268,7 +284,7 @@ def ignore_unused(fixture_func):
             else:
                 return NOT_USED
 
-    return wrapped_fixture_func
+    return set_not_used_aware(wrapped_fixture_func)
 
 
 def fixture_union(name,                # type: str
@@ -347,9 +363,10 @@ def fixture_union(name,                # type: str
             alternative = pytest.param(alternative, id=_id, marks=_mark or ())
         fix_alternatives.append(alternative)
 
-    union_fix = _fixture_union(caller_module, name,
-                               fix_alternatives=fix_alternatives, unique_fix_alt_names=f_names_args,
-                               scope=scope, idstyle=idstyle, ids=ids, autouse=autouse, hook=hook, **kwargs)
+    with trace_span("_fixture_union", "fixtures"):
+        union_fix = _fixture_union(caller_module, name,
+                                   fix_alternatives=fix_alternatives, unique_fix_alt_names=f_names_args,
+                                   scope=scope, idstyle=idstyle, ids=ids, autouse=autouse, hook=hook, **kwargs)
 
     # if unpacking is requested, do it here
     if unpack_into is not None:
@@ -361,6 +378,11 @@ def fixture_union(name,                # type: str
     return union_fix
 
 
+_UNION_FIXTURE_NAMES = set()
+"""The names of all union fixtures created so far by `_fixture_union`. Used by the plugin to quickly detect that a
+fixture closure can not contain any union, see `plugin.create_super_closure`."""
+
+
 def _fixture_union(fixtures_dest,
                    name,                  # type: str
                    fix_alternatives,      # type: Sequence[UnionFixtureAlternative]
@@ -422,12 +444,15 @@ def _fixture_union(fixtures_dest,
     # finally create the fixture per se.
     _make_fix = pytest_fixture(scope=scope or "function", params=fix_alternatives, autouse=autouse,
                                ids=ids, hook=hook, **kwargs)
-    new_union_fix = _make_fix(_new_fixture)
+    new_union_fix = _make_fix(set_not_used_aware(_new_fixture))
 
     # Dynamically add fixture to caller's module as explained in https://github.com/pytest-dev/pytest/issues/2424
     check_name_available(fixtures_dest, name, if_name_exists=WARN, caller=caller)
     setattr(fixtures_dest, name, new_union_fix)
 
+    # remember that this name is a union fixture name, so that the plugin knows where to look for unions
+    _UNION_FIXTURE_NAMES.add(name)
+
     return new_union_fix
 
 
@@ -550,6 +575,7 @@ def _unpack_fixture(fixtures_dest,  # type: ModuleType
         def _create_fixture(_value_idx):
             # no need to autouse=True: this fixture does not bring any added value in terms of setup.
             @pytest_fixture(name=argname, scope=scope, autouse=False, hook=hook)
+            @set_not_used_aware
             @with_signature(argname + _sig)
             def _param_fixture(request, **kwargs):
                 # ignore the "not used" marks, like in @ignore_unused
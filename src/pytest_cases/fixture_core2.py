@@ -38,11 +38,12 @@ except ImportError:
     pass
 
 from .common_pytest_lazy_values import get_lazy_args
+from .common_tracing import trace_new
 from .common_pytest import get_pytest_parametrize_marks, make_marked_parameter_value, get_param_argnames_as_list, \
     combine_ids, is_marked_parameter_value, pytest_fixture, resolve_ids, extract_parameterset_info, make_test_ids
 from .common_pytest_marks import PYTEST3_OR_GREATER, PYTEST8_OR_GREATER
 from .fixture__creation import get_caller_module, check_name_available, WARN, CHANGE
-from .fixture_core1_unions import ignore_unused, is_used_request, NOT_USED, _make_unpack_fixture
+from .fixture_core1_unions import ignore_unused, is_used_request, NOT_USED, _make_unpack_fixture, set_not_used_aware
 
 
 def param_fixture(argname,           # type: str
@@ -357,6 +358,7 @@ class CombinedFixtureParamValue(object):
                  argvalues):
         self.param_defs = param_defs
         self.argvalues = argvalues
+        trace_new("CombinedFixtureParamValue")
 
     def iterparams(self):
         return ((pdef.argnames, v) for pdef, v in zip(self.param_defs, self.argvalues))
@@ -573,4 +575,4 @@ def _decorate_fixture_plus(fixture_func,
 
     # transform the created wrapper into a fixture
     _make_fix = pytest_fixture(scope=scope, params=final_values, autouse=autouse, hook=hook, ids=final_ids, **kwargs)
-    return _make_fix(wrapped_fixture_func)
+    return _make_fix(set_not_used_aware(wrapped_fixture_func))
@@ -41,6 +41,7 @@ import sys
 from makefun import with_signature, remove_signature_parameters, add_signature_parameters, wraps
 
 from .common_mini_six import string_types
+from .common_tracing import trace_span, trace_new
 from .common_others import AUTO, robust_isinstance, replace_list_contents
 from .common_pytest_marks import has_pytest_param, get_param_argnames_as_list
 from .common_pytest_lazy_values import is_lazy_value, get_lazy_args
@@ -259,6 +260,7 @@ class ParamAlternative(UnionFixtureAlternative):
         """
         super(ParamAlternative, self).__init__(union_name=union_name, alternative_name=alternative_name,
                                                alternative_index=param_index)
+        trace_new("ParamAlternative")
         self.argnames = argnames
         self.decorated = decorated
 
@@ -715,7 +717,8 @@ def parametrize(argnames=None,   # type: Union[str, Tuple[str], List[str]]
     if needs_inject:
         @inject_host
         def _apply_parametrize_plus(f, host_class_or_module):
-            return _decorate(f, host_class_or_module)
+            with trace_span("_parametrize_plus", "parametrize", target=f):
+                return _decorate(f, host_class_or_module)
         return _apply_parametrize_plus
     else:
         return _decorate
@@ -985,8 +988,9 @@ def _parametrize_plus(argnames=None,   # type: Union[str, Tuple[str], List[str]]
                     #  one for each consecutive group as shown below. This should not lead to different results but perf
                     #  might differ. Maybe add a parameter in the signature so that users can test it ?
                     #  this would make the ids more readable by removing the "P2toP3"-like ids
-                    p_fix_alt = _create_params_alt(fixtures_dest, test_func=test_func, hook=hook,
-                                                   union_name=fixture_union_name, from_i=prev_i + 1, to_i=i)
+                    with trace_span("_create_params_alt", "fixtures"):
+                        p_fix_alt = _create_params_alt(fixtures_dest, test_func=test_func, hook=hook,
+                                                       union_name=fixture_union_name, from_i=prev_i + 1, to_i=i)
                     fixture_alternatives.append(p_fix_alt)
 
                 # B/ Now handle the fixture ref at position <i>
@@ -1006,8 +1010,9 @@ def _parametrize_plus(argnames=None,   # type: Union[str, Tuple[str], List[str]]
             # C/ handle last consecutive group of normal parameters, if any
             i = len(argvalues)  # noqa
             if i > prev_i + 1:
-                p_fix_alt = _create_params_alt(fixtures_dest, test_func=test_func, hook=hook,
-                                               union_name=fixture_union_name, from_i=prev_i + 1, to_i=i)
+                with trace_span("_create_params_alt", "fixtures"):
+                    p_fix_alt = _create_params_alt(fixtures_dest, test_func=test_func, hook=hook,
+                                                   union_name=fixture_union_name, from_i=prev_i + 1, to_i=i)
                 fixture_alternatives.append(p_fix_alt)
 
             # if fixtures_to_union has length 1, simplify ? >> No, we leave such "optimization" to the end user
@@ -1038,9 +1043,10 @@ def _parametrize_plus(argnames=None,   # type: Union[str, Tuple[str], List[str]]
                 _idstyle = idstyle
 
             # note: the function automatically registers it in the module
-            _make_fixture_union(fixtures_dest, name=fixture_union_name, hook=hook, caller=parametrize,
-                                fix_alternatives=fixture_alternatives, unique_fix_alt_names=fix_alt_names,
-                                idstyle=_idstyle, scope=scope)
+            with trace_span("_fixture_union", "fixtures"):
+                _make_fixture_union(fixtures_dest, name=fixture_union_name, hook=hook, caller=parametrize,
+                                    fix_alternatives=fixture_alternatives, unique_fix_alt_names=fix_alt_names,
+                                    idstyle=_idstyle, scope=scope)
 
             # --create the new test function's signature that we want to expose to pytest
             # it is the same than existing, except that we want to replace all parameters with the new fixture
@@ -3,6 +3,8 @@
 #
 # License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
 from collections import OrderedDict, namedtuple
+import os
+import tracemalloc
 from copy import copy
 from functools import partial
 from warnings import warn
@@ -20,26 +22,31 @@ except ImportError:
     from funcsigs import signature  # noqa
 
 try:  # python 3.3+ type hints
-    from typing import List, Tuple, Union, Iterable, MutableMapping, Mapping, Optional  # noqa
+    from typing import List, Set, Tuple, Union, Iterable, MutableMapping, Mapping, Optional, Dict, Any, Sequence, Callable  # noqa
     from _pytest.python import CallSpec2
     from _pytest.config import Config
 except ImportError:
     pass
 
 from .common_mini_six import string_types
-from .common_pytest_lazy_values import get_lazy_args
+from .common_tracing import trace_span, is_tracing, start_tracing, stop_tracing, ChromeTracer, CollectionProfiler, \
+    MemoryProfiler
+from .common_pytest_lazy_values import get_lazy_args, _LazyValue, _LazyTupleItem, LazyTuple
 from .common_pytest_marks import PYTEST35_OR_GREATER, PYTEST46_OR_GREATER, PYTEST37_OR_GREATER, PYTEST7_OR_GREATER, \
-    PYTEST8_OR_GREATER, PYTEST9_OR_GREATER
+    PYTEST8_OR_GREATER, PYTEST9_OR_GREATER, is_statically_skipped
 from .common_pytest import get_pytest_nodeid, get_pytest_function_scopeval, is_function_node, get_param_names, \
-    get_param_argnames_as_list, has_function_scope, set_callspec_arg_scope_to_function, in_callspec_explicit_args
+    get_param_argnames_as_list, has_function_scope, set_callspec_arg_scope_to_function, in_callspec_explicit_args, \
+    get_callspec_arg_scope_name, set_callspec_arg_scope_to_fixture, is_marked_parameter_value, \
+    get_marked_parameter_values, get_marked_parameter_marks, get_marked_parameter_id
 
-from .fixture_core1_unions import NOT_USED, USED, is_fixture_union_params, UnionFixtureAlternative
+from .fixture_core1_unions import NOT_USED, is_fixture_union_params, UnionFixtureAlternative, \
+    _UNION_FIXTURE_NAMES, is_not_used_aware
 
 # if PYTEST54_OR_GREATER:
 #     # we will need to clean the empty ids explicitly in the plugin :'(
 from .fixture_parametrize_plus import remove_empty_ids
 
-from .case_parametrizer_new import get_current_cases
+from .case_parametrizer_new import get_current_cases, CASES_MODULES_INDEX, AUTO_CASES_MODULES_INDEX
 
 
 _DEBUG = False
@@ -62,9 +69,43 @@ _DEBUG = False
 #         ...
 
 
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_pycollect_makeitem(collector, name, obj):
+    """ When tracing is enabled (`--cases-trace`), records a span for the collection of each test function """
+    if is_tracing() and collector.istestfunction(obj, name):
+        with trace_span(name, "function", target=obj, node="%s::%s" % (collector.nodeid, name)) as span:
+            outcome = yield
+            try:
+                res = outcome.get_result()
+            except BaseException:  # noqa
+                res = None
+            span.set(nb_callspecs=len(res) if isinstance(res, list) else int(res is not None))
+    else:
+        yield
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """ When tracing is enabled, records a span for the collection of each test module, including its import """
+    if is_tracing() and isinstance(collector, pytest.Module):
+        with trace_span("collect_module", "module", module=None) as span:
+            yield
+            try:
+                span.set(module=collector.obj.__name__)
+            except BaseException:  # noqa
+                pass
+    else:
+        yield
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_setup(item):
-    """ Resolve all `lazy_value` in the dictionary of function args """
+    """ Fill the "NOT_USED" parameters, then resolve all `lazy_value` in the dictionary of function args """
+
+    # resolve the sparse "NOT_USED" parameters before the fixtures are setup
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None:
+        fill_not_used_params(callspec)
 
     yield  # first let all other hooks run, they will do the setup etc.
 
@@ -79,34 +120,435 @@ def pytest_collection(session):
     """ HACK: override the fixture manager's `getfixtureclosure` method to replace it with ours """
 
     # Note for reference: another way to access the fm is `metafunc.config.pluginmanager.get_plugin('funcmanage')`
-    session._fixturemanager.getfixtureclosure = partial(getfixtureclosure, session._fixturemanager)  # noqa
+    verify = session.config.getoption(_VERIFY_CLOSURE_OPTION_NAME, default=False)
+    session._fixturemanager.getfixtureclosure = partial(getfixtureclosure, session._fixturemanager,  # noqa
+                                                        verify=verify)
 
 
-class FixtureDefsCache(object):
+class SessionFixtureDefsCache(object):
     """
-    A 'cache' for fixture definitions obtained from the FixtureManager `fm`, for test node `nodeid`
+    A session-wide 'cache' for fixture definitions obtained from the FixtureManager `fm`.
+
+    Entries are keyed by fixture name and visibility scope, so that sibling test nodes share them. Each entry remembers
+    the number of definitions registered in `fm` for this fixture name when it was created: since registering a new
+    fixture (e.g. when a conftest or a module is parsed) always adds a definition, this is enough to detect outdated
+    entries. Use `get_session_fixture_defs_cache` to get the instance associated with a fixture manager.
     """
-    __slots__ = 'fm', 'node', 'cached_fix_defs'
+    __slots__ = 'fm', 'cached_fix_defs', 'hits', 'misses', 'invalidations'
 
-    def __init__(self, fm, node):
+    def __init__(self, fm):
         self.fm = fm
-        self.node = node
         self.cached_fix_defs = dict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
 
-    def get_fixture_defs(self, fixname):
+    def get_fixture_defs(self, fixname, node, visibility_key):
+        """
+        Return the fixture definitions for `fixname` as seen from `node`.
+
+        :param fixname: the fixture name
+        :param node: the pytest node requiring the fixture
+        :param visibility_key: a key identifying all nodes that see the same fixture definitions as `node`
+        :return:
+        """
+        nb_defs = len(self.fm._arg2fixturedefs.get(fixname, ()))  # noqa
+        key = (fixname, visibility_key)
         try:
             # try to retrieve it from cache
-            fixdefs = self.cached_fix_defs[fixname]
+            cached_nb_defs, fixdefs = self.cached_fix_defs[key]
         except KeyError:
-            # otherwise get it and store for next time
-            if hasattr(pytest, "version_tuple") and pytest.version_tuple >= (8, 1):
-                fixdefs = self.fm.getfixturedefs(fixname, self.node)
+            self.misses += 1
+        else:
+            if cached_nb_defs == nb_defs:
+                self.hits += 1
+                return fixdefs
             else:
-                fixdefs = self.fm.getfixturedefs(fixname, self.node.nodeid)
-            self.cached_fix_defs[fixname] = fixdefs
+                # new definitions were registered since this entry was created
+                self.invalidations += 1
+
+        # otherwise get it and store for next time
+        if hasattr(pytest, "version_tuple") and pytest.version_tuple >= (8, 1):
+            fixdefs = self.fm.getfixturedefs(fixname, node)
+        else:
+            fixdefs = self.fm.getfixturedefs(fixname, node.nodeid)
+        self.cached_fix_defs[key] = nb_defs, fixdefs
 
         return fixdefs
 
+    def get_stats(self):
+        """Return a dictionary with the number of hits, misses and invalidations of this cache"""
+        return dict(hits=self.hits, misses=self.misses, invalidations=self.invalidations)
+
+
+def get_session_fixture_defs_cache(fm):
+    # type: (...) -> SessionFixtureDefsCache
+    """Return the `SessionFixtureDefsCache` associated with fixture manager `fm`, creating it if needed."""
+    try:
+        return fm._pytestcases_fixture_defs_cache
+    except AttributeError:
+        fm._pytestcases_fixture_defs_cache = cache = SessionFixtureDefsCache(fm)
+        return cache
+
+
+class ClosureMemo(object):
+    """
+    A session-wide memo of the fixture closures created in `create_super_closure`, keyed by collector, initial
+    fixture names and `ignore_args`. Test functions in the same module or class very often share such a signature.
+
+    Each entry remembers the number of definitions registered in the FixtureManager `fm` for all fixture names in the
+    closure, in order to detect outdated entries. Use `get_closure_memo` to get the instance associated with a fixture
+    manager.
+    """
+    __slots__ = 'fm', 'closures', 'hits', 'misses', 'invalidations'
+
+    def __init__(self, fm):
+        self.fm = fm
+        self.closures = dict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return the (closure, all_fixture_defs) tuple stored for `key`, or None"""
+        try:
+            dependencies, closure, all_fixture_defs = self.closures[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        arg2fixturedefs = self.fm._arg2fixturedefs  # noqa
+        for fixname, nb_defs in dependencies:
+            if len(arg2fixturedefs.get(fixname, ())) != nb_defs:
+                # new definitions were registered since this entry was created
+                self.invalidations += 1
+                del self.closures[key]
+                return None
+
+        self.hits += 1
+        return closure, all_fixture_defs
+
+    def put(self, key, closure, all_fixture_defs):
+        """Store `closure` and `all_fixture_defs` for `key`. They should not be modified afterwards."""
+        arg2fixturedefs = self.fm._arg2fixturedefs  # noqa
+        dependencies = tuple((fixname, len(arg2fixturedefs.get(fixname, ()))) for fixname in closure)
+        self.closures[key] = dependencies, closure, all_fixture_defs
+
+    def get_stats(self):
+        """Return a dictionary with the number of hits, misses and invalidations of this memo"""
+        return dict(hits=self.hits, misses=self.misses, invalidations=self.invalidations)
+
+
+def get_closure_memo(fm):
+    # type: (...) -> ClosureMemo
+    """Return the `ClosureMemo` associated with fixture manager `fm`, creating it if needed."""
+    try:
+        return fm._pytestcases_closure_memo
+    except AttributeError:
+        fm._pytestcases_closure_memo = memo = ClosureMemo(fm)
+        return memo
+
+
+# the builtin `id`: note that `id` is redefined in this module, see below
+_object_id = id
+
+_CALL_TEMPLATES_MAX_CALLS = 2000
+"""Lists of calls larger than this are not stored in the `CallTemplatesCache`"""
+
+_CALL_TEMPLATES_MAX_TOTAL_CALLS = 20000
+"""Maximum total number of calls stored in the `CallTemplatesCache`"""
+
+_CALL_TEMPLATES_MAX_SEEN = 10000
+"""Maximum number of keys remembered by the `CallTemplatesCache` before they are seen a second time"""
+
+_IMMUTABLE_SCALAR_TYPES = (bool, int, float, complex, bytes, type(None)) + tuple(string_types)
+
+
+def _get_value_key(v):
+    """
+    Returns a hashable key for an argvalue or an id `v` of a parametrization order. Two parametrizations with
+    the same keys create equivalent calls, even when they are different objects (e.g. created by two identical
+    decorators):
+
+     - immutable scalars are compared by type and value,
+     - lazy values (e.g. the cases of `@parametrize_with_cases`) are compared by value getter (the case function), id
+       and marks,
+     - `pytest.param`, marks and union alternatives are compared by contents,
+     - all other objects are compared by identity.
+    """
+    if isinstance(v, _IMMUTABLE_SCALAR_TYPES):
+        return type(v), v
+    elif isinstance(v, _LazyValue):
+        return type(v), _object_id(v.valuegetter), v._id, tuple(_get_mark_key(m) for m in v._marks)  # noqa
+    elif isinstance(v, _LazyTupleItem):
+        return type(v), _get_value_key(v.host), v.item
+    elif isinstance(v, LazyTuple):
+        return type(v), _get_value_key(v._lazyvalue), v.theoretical_size  # noqa
+    elif isinstance(v, UnionFixtureAlternative):
+        return type(v), v.union_name, v.alternative_index, v.alternative_name
+    elif is_marked_parameter_value(v):
+        return ('param', tuple(_get_value_key(_v) for _v in get_marked_parameter_values(v, nbargs=None)),
+                tuple(_get_mark_key(m) for m in get_marked_parameter_marks(v)), get_marked_parameter_id(v))
+    elif isinstance(v, tuple):
+        return (tuple,) + tuple(_get_value_key(_v) for _v in v)
+    elif hasattr(v, '__self__') and hasattr(v, '__func__'):
+        # a bound method, for example a union ids generator: a new object is created on each attribute access
+        return 'method', _object_id(v.__func__), _object_id(v.__self__)
+    else:
+        return 'id', _object_id(v)
+
+
+def _get_mark_key(m):
+    """Returns a hashable key for mark or mark decorator `m`, based on its name and arguments"""
+    m = getattr(m, 'mark', m)
+    try:
+        name, args, kwargs = m.name, m.args, m.kwargs
+    except AttributeError:
+        return 'id', _object_id(m)
+    else:
+        return ('mark', name, tuple(_get_value_key(a) for a in args),
+                tuple(sorted((k, _get_value_key(v)) for k, v in kwargs.items())))
+
+
+def _get_values_key(values):
+    """Returns a hashable key for the argvalues or ids `values`, see `_get_value_key`"""
+    if isinstance(values, (list, tuple)):
+        return tuple(_get_value_key(v) for v in values)
+    else:
+        # an iterable (that should not be consumed), a callable, or None
+        return _get_value_key(values)
+
+
+def _get_paramz_key(p  # type: Union[UnionParamz, NormalParamz]
+                    ):
+    """
+    Returns a hashable key for parametrization order `p`, based on the contents of its argvalues, ids and kwargs (see
+    `_get_value_key`). `_param_mark` (the `@pytest.mark.parametrize` mark on pytest 8) is ignored: it is different for
+    each test function.
+    """
+    kwargs = tuple(sorted((k, _get_value_key(v)) for k, v in p.kwargs.items() if k != '_param_mark'))
+    if isinstance(p, UnionParamz):
+        return ('union', p.union_fixture_name, _get_values_key(p.alternative_names), _get_values_key(p.ids), p.scope,
+                kwargs)
+    else:
+        argnames = p.argnames if isinstance(p.argnames, string_types) else tuple(p.argnames)
+        indirect = p.indirect if isinstance(p.indirect, bool) else tuple(p.indirect)
+        return 'normal', argnames, _get_values_key(p.argvalues), indirect, _get_values_key(p.ids), p.scope, kwargs
+
+
+def _get_tree_key(node,      # type: FixtureClosureNode
+                  memo=None  # type: Dict[int, Tuple]
+                  ):
+    """
+    Returns a hashable key describing the shape of the closure tree at `node`: the fixture names and definitions at
+    each node, and the unions. Shared subtrees (see `split_and_build`) are only visited once thanks to `memo`.
+    """
+    if memo is None:
+        memo = dict()
+    try:
+        return memo[_object_id(node)]
+    except KeyError:
+        fixture_defs = tuple((name, tuple(_object_id(d) for d in defs) if defs is not None else None)
+                             for name, defs in node.fixture_defs.items())
+        key = (fixture_defs, node.split_fixture_name, tuple(node.split_fixture_alternatives),
+               tuple(_get_tree_key(c, memo) for c in node.children))
+        memo[_object_id(node)] = key
+        return key
+
+
+class CallTemplatesCache(object):
+    """
+    A session-wide cache of the calls created by `CallsReactor`, keyed by closure tree shape and parametrization
+    orders (see `get_key`). Test functions having the same fixture closure and parametrized with equivalent orders
+    (typically parametrized fixtures and fixture unions defined in the module, identical `@parametrize_with_cases`)
+    get the same calls: the cached ones are cloned instead of being created again (ids, indices, "NOT_USED"
+    parametrization, etc.).
+
+    The calls are only stored when their key is seen for the second time, so that the calls of test functions with a
+    unique parametrization are not copied for nothing. The total number of stored calls is bounded by
+    `_CALL_TEMPLATES_MAX_TOTAL_CALLS`.
+
+    Keys are partly based on objects identities: each entry keeps a reference to the objects, so that identities can
+    not be reused. Use `get_call_templates_cache` to get the instance associated with a fixture manager.
+    """
+    __slots__ = 'templates', 'seen', 'nb_calls', 'hits', 'misses'
+
+    def __init__(self):
+        self.templates = dict()
+        self.seen = set()
+        self.nb_calls = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(tree,    # type: FixtureClosureNode
+                pending  # type: List[Union[UnionParamz, NormalParamz]]
+                ):
+        """Return the key to use in `get` and `put` for closure tree `tree` and parametrization orders `pending`"""
+        return (_get_tree_key(tree),) + tuple(_get_paramz_key(p) for p in pending)
+
+    def get(self, key):
+        # type: (...) -> Optional[List[CallSpec2]]
+        """Return the list of template calls stored for `key`, or None. Use `clone_callspec` on them."""
+        try:
+            _, _, templates = self.templates[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        else:
+            self.hits += 1
+            return templates
+
+    def put(self,
+            key,
+            tree,     # type: FixtureClosureNode
+            pending,  # type: List[Union[UnionParamz, NormalParamz]]
+            calls     # type: List[CallSpec2]
+            ):
+        # type: (...) -> bool
+        """
+        Store copies of `calls` for `key` if it was already seen once and if they fit in the cache. `tree` and
+        `pending` are the objects used to create `key`. Return True if the calls were stored.
+        """
+        if key not in self.seen:
+            if len(self.seen) < _CALL_TEMPLATES_MAX_SEEN:
+                self.seen.add(key)
+            return False
+
+        nb_calls = len(calls)
+        if nb_calls > _CALL_TEMPLATES_MAX_CALLS or self.nb_calls + nb_calls > _CALL_TEMPLATES_MAX_TOTAL_CALLS:
+            return False
+
+        self.seen.discard(key)
+        self.templates[key] = tree, tuple(pending), [clone_callspec(c) for c in calls]
+        self.nb_calls += nb_calls
+        return True
+
+    def get_stats(self):
+        """Return a dictionary with the number of hits and misses of this cache, and the number of stored calls"""
+        return dict(hits=self.hits, misses=self.misses, calls=self.nb_calls)
+
+
+def get_call_templates_cache(fm):
+    # type: (...) -> CallTemplatesCache
+    """Return the `CallTemplatesCache` associated with fixture manager `fm`, creating it if needed."""
+    try:
+        return fm._pytestcases_call_templates_cache
+    except AttributeError:
+        fm._pytestcases_call_templates_cache = cache = CallTemplatesCache()
+        return cache
+
+
+class FixtureDefsCache(object):
+    """
+    A view on the session `SessionFixtureDefsCache` of the FixtureManager `fm`, for test node `node`
+    """
+    __slots__ = 'fm', 'node', 'session_cache', 'visibility_key'
+
+    def __init__(self, fm, node):
+        self.fm = fm
+        self.node = node
+        self.session_cache = get_session_fixture_defs_cache(fm)
+
+        # Fixtures are registered on collectors (modules, classes) and conftest locations, not on functions: so all test
+        # functions in the same collector see the same definitions.
+        if is_function_node(node) and node.parent is not None:
+            self.visibility_key = node.parent.nodeid
+        else:
+            self.visibility_key = node.nodeid
+
+    def get_fixture_defs(self, fixname):
+        return self.session_cache.get_fixture_defs(fixname, self.node, self.visibility_key)
+
+
+def get_fixture_dependencies(fixname, fixturedefs):
+    """Return the list of fixture names that fixture `fixname` (with definitions `fixturedefs`) depends on."""
+    if PYTEST9_OR_GREATER:
+        # accounting for overrides
+        dependencies = []
+        for _fixture_or_overridden in reversed(fixturedefs):
+            dependencies = list(_fixture_or_overridden.argnames) + dependencies
+            # If there's an override and doesn't depend on the overridden fixture,
+            # ignore remaining definitions
+            if fixname not in _fixture_or_overridden.argnames:
+                break
+        return dependencies
+    else:
+        return list(fixturedefs[-1].argnames)
+
+
+def sort_fixture_defs_by_scope(items  # type: Iterable[Tuple[str, Optional[Tuple[FixtureDefinition]]]]  # noqa
+                               ):
+    # type: (...) -> List[Tuple[str, Optional[Tuple[FixtureDefinition]]]]  # noqa
+    """
+    Sort (fixture name, fixture defs or None) pairs by scope as in pytest fixture closure creator.
+    The sort is stable, and pairs without definition are considered function-scoped.
+    """
+    if PYTEST7_OR_GREATER:
+        # Scope is an enum, values are in reversed order, and the field is _scope
+        f_scope = get_pytest_function_scopeval()
+
+        def sort_by_scope(kv_pair):
+            fixture_name, fixture_defs = kv_pair
+            return fixture_defs[-1]._scope if fixture_defs is not None else f_scope
+        return sorted(items, key=sort_by_scope, reverse=True)
+
+    elif PYTEST35_OR_GREATER:
+        # scopes is a list, values are indices in the list, and the field is scopenum
+        f_scope = get_pytest_function_scopeval()
+        def sort_by_scope(kv_pair):  # noqa
+            fixture_name, fixture_defs = kv_pair
+            return fixture_defs[-1].scopenum if fixture_defs is not None else f_scope
+        return sorted(items, key=sort_by_scope)
+
+    else:
+        return list(items)
+
+
+def build_flat_closure(fixture_defs_mgr,       # type: FixtureDefsCache
+                       initial_fixture_names,  # type: Iterable[str]
+                       ignore_args=()
+                       ):
+    # type: (...) -> Optional[OrderedDict]
+    """
+    Builds the closure of `initial_fixture_names` the same way `FixtureClosureNode.build_closure` does, but without
+    creating any tree. This is the fast path for closures that do not contain any fixture union.
+
+    :return: an ordered dictionary {name: defs or None} (same as a non-split `FixtureClosureNode.fixture_defs`), or
+        None if a fixture union was found: in that case a tree is needed.
+    """
+    fixture_defs = OrderedDict()
+
+    # a stack where the next fixture name to handle is the last one
+    pending_fixture_names = list(reversed(tuple(initial_fixture_names)))
+    while len(pending_fixture_names) > 0:
+        fixname = pending_fixture_names.pop()
+
+        # if the fixture is already known, do not care
+        if fixname in fixture_defs:
+            continue
+
+        # not really a fixture but a test function parameter
+        if fixname in ignore_args:
+            fixture_defs[fixname] = None
+            continue
+
+        fixturedefs = fixture_defs_mgr.get_fixture_defs(fixname)
+        if not fixturedefs:
+            # fixture without definition: add it. This can happen with e.g. "requests", etc.
+            fixture_defs[fixname] = None
+            continue
+
+        if fixname in _UNION_FIXTURE_NAMES and is_fixture_union_params(fixturedefs[-1].params):
+            # a union: we need a tree
+            return None
+
+        # normal fixture. Its dependencies are prepended, consistently with `FixtureClosureNode._build_closure`
+        fixture_defs[fixname] = fixturedefs
+        pending_fixture_names += reversed(get_fixture_dependencies(fixname, fixturedefs))
+
+    return fixture_defs
+
 
 class FixtureClosureNode(object):
     """
@@ -123,7 +565,8 @@ class FixtureClosureNode(object):
 
     """
     __slots__ = 'parent', 'fixture_defs_mgr', \
-                'fixture_defs', 'split_fixture_name', 'split_fixture_alternatives', 'children'
+                'fixture_defs', 'split_fixture_name', 'split_fixture_alternatives', 'children', \
+                '_required_above', '_required_below'
 
     def __init__(self,
                  fixture_defs_mgr=None,   # type: FixtureDefsCache
@@ -146,8 +589,34 @@ class FixtureClosureNode(object):
         # we do not use a dict any more as several children can use the same union value (doubled unions)
         self.children = []  # type: List[FixtureClosureNode]
 
+        # lazily computed requirement sets, see `get_required_above` and `get_required_below`
+        self._required_above = None  # type: frozenset
+        self._required_below = None  # type: frozenset
+
     # ------ tree ------------------
 
+    def copy(self, parent_node=None, _copies=None):
+        """
+        Return a copy of the subtree at this node, attached to `parent_node`.
+        Subtrees shared in this subtree (see `split_and_build`) are shared in the copy too.
+        """
+        if _copies is None:
+            _copies = dict()
+        else:
+            try:
+                return _copies[self]
+            except KeyError:
+                pass
+
+        new_node = FixtureClosureNode(fixture_defs_mgr=self.fixture_defs_mgr, parent_node=parent_node)
+        _copies[self] = new_node
+        if self.fixture_defs is not None:
+            new_node.fixture_defs = OrderedDict(self.fixture_defs)
+        new_node.split_fixture_name = self.split_fixture_name
+        new_node.split_fixture_alternatives = list(self.split_fixture_alternatives)
+        new_node.children = [c.copy(parent_node=new_node, _copies=_copies) for c in self.children]
+        return new_node
+
     def get_leaves(self):
         if self.has_split():
             return [n for c in self.children for n in c.get_leaves()]
@@ -193,22 +662,7 @@ class FixtureClosureNode(object):
 
         # sort by scope as in pytest fixture closure creator (pytest did not do it in early versions, align with this)
         if try_to_sort:
-            if PYTEST7_OR_GREATER:
-                # Scope is an enum, values are in reversed order, and the field is _scope
-                f_scope = get_pytest_function_scopeval()
-
-                def sort_by_scope(kv_pair):
-                    fixture_name, fixture_defs = kv_pair
-                    return fixture_defs[-1]._scope if fixture_defs is not None else f_scope
-                items = sorted(list(items), key=sort_by_scope, reverse=True)
-
-            elif PYTEST35_OR_GREATER:
-                # scopes is a list, values are indices in the list, and the field is scopenum
-                f_scope = get_pytest_function_scopeval()
-                def sort_by_scope(kv_pair):  # noqa
-                    fixture_name, fixture_defs = kv_pair
-                    return fixture_defs[-1].scopenum if fixture_defs is not None else f_scope
-                items = sorted(list(items), key=sort_by_scope)
+            items = sort_fixture_defs_by_scope(items)
 
         return OrderedDict(items)
 
@@ -251,7 +705,8 @@ class FixtureClosureNode(object):
             to "direct parametrization"
         :return:
         """
-        self._build_closure(self.fixture_defs_mgr, initial_fixture_names, ignore_args=ignore_args)
+        self.invalidate_required_sets()
+        self._build_closure(self.fixture_defs_mgr, initial_fixture_names, ignore_args=ignore_args, subtrees=dict())
 
     def is_closure_built(self):
         return self.fixture_defs is not None
@@ -268,13 +723,15 @@ class FixtureClosureNode(object):
     def _build_closure(self,
                        fixture_defs_mgr,       # type: FixtureDefsCache
                        initial_fixture_names,  # type: Iterable[str]
-                       ignore_args
+                       ignore_args,
+                       subtrees=None           # type: MutableMapping[Tuple, FixtureClosureNode]
                        ):
         """
 
         :param fixture_defs_mgr:
         :param initial_fixture_names:
         :param ignore_args: arguments to keep in the names but not to put in the fixture defs
+        :param subtrees: the subtrees already built during this closure construction, see `split_and_build`
         :return: nothing (the input arg2fixturedefs is modified)
         """
 
@@ -325,7 +782,7 @@ class FixtureClosureNode(object):
 
                     # propagate WITH the pending
                     self.split_and_build(fixture_defs_mgr, fixname, fixturedefs, alternative_f_names,
-                                         pending_fixture_names, ignore_args=ignore_args)
+                                         pending_fixture_names, ignore_args=ignore_args, subtrees=subtrees)
 
                     # empty the pending because all of them have been propagated on all children with their dependencies
                     pending_fixture_names = []
@@ -336,16 +793,7 @@ class FixtureClosureNode(object):
                     self.add_required_fixture(fixname, fixturedefs)
 
                     # add all dependencies, accounting for overrides
-                    if PYTEST9_OR_GREATER:
-                        dependencies = []
-                        for _fixture_or_overridden in reversed(fixturedefs):
-                            dependencies = list(_fixture_or_overridden.argnames) + dependencies
-                            # If there's an override and doesn't depend on the overridden fixture,
-                            # ignore remaining definitions
-                            if fixname not in _fixture_or_overridden.argnames:
-                                break
-                    else:
-                        dependencies = _fixdef.argnames
+                    dependencies = get_fixture_dependencies(fixname, fixturedefs)
 
                     # - append: was pytest default
                     # pending_fixture_names += dependencies
@@ -396,6 +844,10 @@ class FixtureClosureNode(object):
 
     def remove_fixtures(self, fixture_names_to_remove):
         """Remove some fixture names from all nodes in this subtree. These fixtures should not be split fixtures"""
+        self.invalidate_required_sets()
+        self._remove_fixtures(fixture_names_to_remove)
+
+    def _remove_fixtures(self, fixture_names_to_remove):
         _to_remove_in_children = []
         for f in fixture_names_to_remove:
             if self.split_fixture_name == f:
@@ -409,7 +861,7 @@ class FixtureClosureNode(object):
         # propagate to children if any
         if len(_to_remove_in_children) > 0:
             for c in self.children:
-                c.remove_fixtures(_to_remove_in_children)
+                c._remove_fixtures(_to_remove_in_children)
 
     def add_required_fixture(self, new_fixture_name, new_fixture_defs):
         """Add some required fixture names to all leaves under this node"""
@@ -430,9 +882,18 @@ class FixtureClosureNode(object):
                         split_fixture_defs,         # type: Tuple[FixtureDefinition]  # noqa
                         alternative_fixture_names,  # type: List[str]
                         pending_fixtures_list,      #
-                        ignore_args
+                        ignore_args,
+                        subtrees=None               # type: MutableMapping[Tuple, FixtureClosureNode]
                         ):
-        """ Declares that this node contains a union with alternatives (child nodes=subtrees) """
+        """
+        Declares that this node contains a union with alternatives (child nodes=subtrees)
+
+        A child subtree only depends on the fixtures to propagate in it and on the fixtures already known by this node
+        and its parents. So identical subtrees are built once and shared, using `subtrees` as a memo. Note that a
+        shared subtree has a single parent, but all of its parents know the same fixtures.
+        """
+        if subtrees is None:
+            subtrees = dict()
 
         if self.has_split():
             raise ValueError("This should not happen anymore")
@@ -447,8 +908,23 @@ class FixtureClosureNode(object):
             self.split_fixture_name = split_fixture_name
             self.split_fixture_alternatives = alternative_fixture_names
 
+            # the fixtures known by all child nodes
+            known_fixtures = frozenset(self.gather_all_required(include_children=False))
+
             # create the child nodes
             for f in alternative_fixture_names:
+                # (a) first propagate all child's dependencies, (b) then the ones required by parent
+                # we need to do both at the same time in order to propagate the "pending for child" on all subbranches
+                pending_for_child = [f] + pending_fixtures_list
+
+                subtree_key = (tuple(pending_for_child), known_fixtures)
+                try:
+                    # an identical subtree was already built: share it
+                    self.children.append(subtrees[subtree_key])
+                    continue
+                except KeyError:
+                    pass
+
                 # create the child node
                 new_c = FixtureClosureNode(parent_node=self)
                 self.children.append(new_c)
@@ -456,11 +932,9 @@ class FixtureClosureNode(object):
                 # set the discarded fixture names
                 # new_c.split_fixture_discarded_names = [g for g in alternative_fixture_names if g != f]
 
-                # perform the propagation:
-                # (a) first propagate all child's dependencies, (b) then the ones required by parent
-                # we need to do both at the same time in order to propagate the "pending for child" on all subbranches
-                pending_for_child = [f] + pending_fixtures_list
-                new_c._build_closure(fixture_defs_mgr, pending_for_child, ignore_args=ignore_args)
+                # perform the propagation
+                new_c._build_closure(fixture_defs_mgr, pending_for_child, ignore_args=ignore_args, subtrees=subtrees)
+                subtrees[subtree_key] = new_c
 
     def has_split(self):
         return self.split_fixture_name is not None
@@ -475,11 +949,12 @@ class FixtureClosureNode(object):
         initial_list = self.gather_all_required(include_parents=False)
 
         for c in self.get_leaves():
+            c_required = c.get_required_above()
             j = 0
             for _ in range(len(initial_list)):
                 # get next element in the list (but the list may reduce in size during the loop)
                 fixture_name = initial_list[j]
-                if fixture_name not in c.gather_all_required():
+                if fixture_name not in c_required:
                     # Remove element from the list. Therefore, do not increment j
                     del initial_list[j]
                     results_list.append(fixture_name)
@@ -495,7 +970,8 @@ class FixtureClosureNode(object):
         and all of its parents (if include_parents=True) and all of its children (if include_children=True)
 
         See also `self.gen_all_fixture_defs`, that could be generalized to tackle this use case too
-        (micro-optimization, not really urgent)
+        (micro-optimization, not really urgent). To check if a fixture is required, rather use `self.requires` or the
+        sets returned by `self.get_required_above` and `self.get_required_below`.
         """
         # first the fixtures required by this node
         required = list(self.fixture_defs.keys())
@@ -511,12 +987,58 @@ class FixtureClosureNode(object):
 
         return required
 
+    def get_required_above(self):
+        # type: (...) -> frozenset
+        """Return the set of all fixtures required by this node and its parents. It is computed once."""
+        if self._required_above is None:
+            if self.parent is None:
+                self._required_above = frozenset(self.fixture_defs)
+            else:
+                self._required_above = self.parent.get_required_above().union(self.fixture_defs)
+        return self._required_above
+
+    def get_required_below(self):
+        # type: (...) -> frozenset
+        """Return the set of all fixtures required by this node and its children. It is computed once."""
+        if self._required_below is None:
+            required = set(self.fixture_defs)
+            for child in self.children:
+                required.update(child.get_required_below())
+            self._required_below = frozenset(required)
+        return self._required_below
+
+    def invalidate_required_sets(self):
+        """Forget the requirement sets computed on all nodes in the tree containing this node, before a modification"""
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        root._invalidate_required_sets()
+
+    def _invalidate_required_sets(self):
+        self._required_above = self._required_below = None
+        for child in self.children:
+            child._invalidate_required_sets()
+
     def requires(self, fixturename):
         """ Return True if the fixture with this name is required by the subtree at this node """
-        return fixturename in self.gather_all_required()
+        return fixturename in self.get_required_above() or fixturename in self.get_required_below()
 
     # ------ tools to see the tree as a list of alternatives (used in SuperClosure)
 
+    def count_alternatives(self):
+        """Return the number of alternatives (leaves) in this subtree, without enumerating them"""
+        if self.has_split():
+            return sum(c.count_alternatives() for c in self.children)
+        else:
+            return 1
+
+    def count_splits(self):
+        """Return the number of union splits in this subtree. Shared subtrees are counted once per path to them"""
+        if self.has_split():
+            return 1 + sum(c.count_splits() for c in self.children)
+        else:
+            return 0
+
     def get_alternatives(self):
         """
         Returns the tree  "flattened" as a list of alternatives (one per leaf).
@@ -526,33 +1048,42 @@ class FixtureClosureNode(object):
            alternative
          - a list of fixture names effectively used in this alternative
 
+        See `gen_alternatives` to enumerate them lazily, and `count_alternatives` to only count them.
+
         :return: a list of alternatives
         """
-        alternatives = self._get_alternatives()
-        for i, a in enumerate(alternatives):
-            # replace the first entry in the tuple with a reversed order one
-            alternatives[i] = (OrderedDict(reversed(list(a[0].items()))), a[1])
-        return alternatives
-
-    def _get_alternatives(self):
-        if self.has_split():
-            alternatives_list = []
-            for c_idx, (c_split_alternative, c_node) in enumerate(zip(self.split_fixture_alternatives, self.children)):
-                # for all alternatives in this subtree
-                for f_dct, n_lst in c_node._get_alternatives():
-                    # - filter
-                    _f_dct = f_dct.copy()
-                    _f_dct[self.split_fixture_name] = (c_idx, c_split_alternative)
+        return list(self.gen_alternatives())
 
-                    # - unique fixtures used
-                    _n_lst = list(self.fixture_defs) + [_i for _i in n_lst if _i not in self.fixture_defs]
+    def gen_alternatives(self):
+        """
+        Generates the same alternatives as `get_alternatives`, lazily (one per leaf, in the same order).
+        """
+        return self._gen_alternatives((), [], set())
 
-                    alternatives_list.append((_f_dct, _n_lst))
+    def _gen_alternatives(self,
+                          filters,     # type: Tuple[Tuple[str, Tuple[int, str]], ...]
+                          names,       # type: List[str]
+                          names_set    # type: Set[str]
+                          ):
+        """
+        :param filters: the union filters of all parent nodes, from the root
+        :param names: the unique fixture names used by all parent nodes, from the root
+        :param names_set: the same names, as a set
+        """
+        if self.has_split():
+            # the fixture names used at this node come after the ones used in parents
+            new_names = [f for f in self.fixture_defs if f not in names_set]
+            if new_names:
+                names = names + new_names
+                names_set = names_set.union(new_names)
 
-            return alternatives_list
+            for c_idx, (c_split_alternative, c_node) in enumerate(zip(self.split_fixture_alternatives, self.children)):
+                c_filters = filters + ((self.split_fixture_name, (c_idx, c_split_alternative)),)
+                for alternative in c_node._gen_alternatives(c_filters, names, names_set):
+                    yield alternative
         else:
-            # return a single partition containing no filter and all fixture names
-            return [(OrderedDict(), self.get_all_fixture_names())]
+            # a single partition containing all filters and all fixture names (the ones at this node sorted by scope)
+            yield OrderedDict(filters), names + [f for f in self.get_all_fixture_names() if f not in names_set]
 
 
 class SuperClosure(MutableSequence):
@@ -568,7 +1099,7 @@ class SuperClosure(MutableSequence):
     and only keep the partitions, but parametrization order was not as intuitive for the end user as all unions
     appeared as parametrized first (since they induced the partitions).
     """
-    __slots__ = 'tree', 'all_fixture_defs'
+    __slots__ = 'tree', 'all_fixture_defs', '_names', '_positions', '_shared_tree'
 
     def __init__(self,
                  root_node  # type: FixtureClosureNode
@@ -578,10 +1109,33 @@ class SuperClosure(MutableSequence):
 
         # save the fixture closure tree root
         self.tree = root_node
+        self._shared_tree = False
         # retrieve/sort fixture defs for quicker access
         self._update_fixture_defs()
 
+    def __copy__(self):
+        """
+        Return a copy of this super closure. The tree is shared between both until one of them is modified: it is then
+        copied first (copy-on-write), see `_own_tree`.
+        """
+        new_closure = object.__new__(self.__class__)
+        new_closure.tree = self.tree
+        new_closure.all_fixture_defs = self.all_fixture_defs
+        new_closure._names = self._names
+        new_closure._positions = self._positions
+        new_closure._shared_tree = self._shared_tree = True
+        return new_closure
+
+    def _own_tree(self):
+        """Make sure that the tree is not shared with another super closure, before modifying it."""
+        if self._shared_tree:
+            self.tree = self.tree.copy()
+            self._shared_tree = False
+
     def _update_fixture_defs(self):
+        # the tree may have been modified
+        self.tree.invalidate_required_sets()
+
         # get a list of all fixture defs, for quicker access (and sorted)
         # sort by scope as in pytest fixture closure creator, if scope information is available
         all_fixture_defs = self.tree.get_all_fixture_defs(drop_fake_fixtures=False, try_to_sort=True)
@@ -597,22 +1151,23 @@ class SuperClosure(MutableSequence):
 
         self.all_fixture_defs = all_fixture_defs
 
+        # the list facade: ordered fixture names and their positions. These are never modified, only replaced here.
+        self._names = list(all_fixture_defs)
+        self._positions = {name: i for i, name in enumerate(self._names)}
+
     # --- visualization tools ----
 
     @property
     def nb_alternative_closures(self):
         """ Return the number of alternative closures induced by fixture unions """
-        filters, partitions = self.tree.get_alternatives()
-        return len(partitions)
+        return self.tree.count_alternatives()
 
     def __repr__(self):
         """ Return a synthetic view, and a detailed tree view, of this closure """
-        alternatives = self.tree.get_alternatives()
-        nb_alternative_closures = len(alternatives)
-        return "SuperClosure with %s alternative closures:\n" % nb_alternative_closures \
+        return "SuperClosure with %s alternative closures:\n" % self.nb_alternative_closures \
                + "\n".join(" - %s (filters: %s)" % (p, ", ".join("%s=%s[%s]=%s" % (k, k, v[0], v[1])
                                                                  for k, v in f.items()))
-                           for f, p in alternatives) \
+                           for f, p in self.tree.gen_alternatives()) \
                + "\nThe 'super closure list' is %s\n\nThe fixture tree is :\n%s\n" % (list(self), self.tree)
 
     def get_all_fixture_defs(self, drop_fake_fixtures=True):
@@ -632,15 +1187,33 @@ class SuperClosure(MutableSequence):
     # ---- list (MutableSequence) facade: behaves like a list of fixture names ------
 
     def __len__(self):
-        return len(self.all_fixture_defs)
+        return len(self._names)
 
     def __getitem__(self, i):
-        # return the key (fixture name) associated with the i-th pair
-        # try:
-        #     return next(islice(self.all_fixture_defs.keys(), i, i+1))
-        # except StopIteration:
-        #     raise IndexError(i)
-        return list(self.all_fixture_defs.keys())[i]
+        # return the key (fixture name) associated with the i-th pair (a list if i is a slice)
+        return self._names[i]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __contains__(self, fixture_name):
+        try:
+            return fixture_name in self._positions
+        except TypeError:
+            # unhashable
+            return False
+
+    def index(self, fixture_name, start=0, stop=None):
+        if start == 0 and stop is None:
+            try:
+                return self._positions[fixture_name]
+            except (KeyError, TypeError):
+                pass
+        # rely on the list behaviour for the error message and start/stop handling
+        return self._names.index(fixture_name, start, len(self._names) if stop is None else stop)
+
+    def count(self, fixture_name):
+        return 1 if fixture_name in self else 0
 
     def __setitem__(self, i, o):
         # try:
@@ -650,7 +1223,7 @@ class SuperClosure(MutableSequence):
         #     full_replace = False
 
         # Get the existing value(s) that we wish to replace
-        ref = list(self)[i]
+        ref = self._names[i]
 
         if o == ref:
             # no change at all: of course we accept.
@@ -705,10 +1278,10 @@ class SuperClosure(MutableSequence):
         :param fixture_name:
         :return:
         """
+        self._own_tree()
         if index == 0:
             # build the closure associated with this new fixture name
-            fixture_defs_mgr = FixtureDefsCache(self.tree.fixture_defs_mgr.fm, self.tree.fixture_defs_mgr.node)
-            closure_tree = FixtureClosureNode(fixture_defs_mgr=fixture_defs_mgr)
+            closure_tree = FixtureClosureNode(fixture_defs_mgr=self.tree.fixture_defs_mgr)
             closure_tree.build_closure((fixture_name,))
             if closure_tree.has_split():
                 raise NotImplementedError("When fixture unions are present, inserting a fixture in the closure at "
@@ -737,6 +1310,7 @@ class SuperClosure(MutableSequence):
     def append_all(self, fixture_names):
         """Append various fixture names to the closure"""
         # appending is natively supported in our tree growing method
+        self._own_tree()
         self.tree.build_closure(tuple(fixture_names))
 
         # Finally update self.fixture_defs so that the "list" view reflects the changes in self.tree
@@ -751,6 +1325,7 @@ class SuperClosure(MutableSequence):
         :return:
         """
         # remove in the tree
+        self._own_tree()
         self.tree.remove_fixtures((value,))
 
         # update fixture defs
@@ -759,18 +1334,43 @@ class SuperClosure(MutableSequence):
     def remove_all(self, values):
         """Multiple `remove` operations at once."""
         # remove in the tree
+        self._own_tree()
         self.tree.remove_fixtures(tuple(values))
 
         # update fixture defs
         self._update_fixture_defs()
 
 
-def _getfixtureclosure(fm, fixturenames, parentnode, ignore_args=()):
+def _getfixtureclosure(fm, fixturenames, parentnode, ignore_args=(), verify=False):
     """
     Replaces pytest's getfixtureclosure method to handle unions.
+
+    If `verify` is True (`--cases-verify-closure` option), the closure computed by pytest is also computed and
+    compared with ours. This doubles the closure computation cost, so this is only meant for debugging.
     """
 
-    # (1) first retrieve the normal pytest output for comparison
+    # (1) let's compute the closure by ourselves to support fixture unions
+    with trace_span("create_super_closure", "closure", target=parentnode) as span:
+        _init_fixnames, super_closure, arg2fixturedefs = create_super_closure(fm, parentnode, fixturenames,
+                                                                              ignore_args)
+        if is_tracing() and isinstance(super_closure, SuperClosure):
+            span.set(union_splits=super_closure.tree.count_splits())
+
+    # (2) optionally compare with the normal pytest output
+    if verify:
+        _verify_closure(fm, fixturenames, parentnode, ignore_args, super_closure, arg2fixturedefs)
+
+    if PYTEST37_OR_GREATER and not PYTEST8_OR_GREATER:
+        return _init_fixnames, super_closure, arg2fixturedefs
+    else:
+        return super_closure, arg2fixturedefs
+
+
+def _verify_closure(fm, fixturenames, parentnode, ignore_args, super_closure, arg2fixturedefs):
+    """
+    Retrieves the normal pytest closure for `fixturenames` and checks that it contains the same fixtures than our
+    `super_closure`, and the same definitions than `arg2fixturedefs`.
+    """
     kwargs = dict()
     if PYTEST46_OR_GREATER:
         # new argument "ignore_args" in 4.6+
@@ -787,24 +1387,22 @@ def _getfixtureclosure(fm, fixturenames, parentnode, ignore_args=()):
         # two outputs
         ref_fixturenames, ref_arg2fixturedefs = fm.__class__.getfixtureclosure(fm, fixturenames, parentnode)
 
-    # (2) now let's do it by ourselves to support fixture unions
-    _init_fixnames, super_closure, arg2fixturedefs = create_super_closure(fm, parentnode, fixturenames, ignore_args)
-
-    # Compare with the previous behaviour TODO remove when in 'production' ?
     # NOTE different order happens all the time because of our "prepend" strategy in the closure building
     # which makes much more sense/intuition than pytest default
-    assert set(super_closure) == set(ref_fixturenames)
-    assert dict(arg2fixturedefs) == ref_arg2fixturedefs
-
-    if PYTEST37_OR_GREATER and not PYTEST8_OR_GREATER:
-        return _init_fixnames, super_closure, arg2fixturedefs
-    else:
-        return super_closure, arg2fixturedefs
+    if set(super_closure) != set(ref_fixturenames):
+        raise ValueError("[pytest-cases] Fixture closure mismatch for %s: pytest-cases found %s while pytest found %s."
+                         " Please report this issue to the `pytest-cases` project."
+                         "" % (parentnode.nodeid, list(super_closure), list(ref_fixturenames)))
+    if dict(arg2fixturedefs) != ref_arg2fixturedefs:
+        raise ValueError("[pytest-cases] Fixture definitions mismatch for %s: pytest-cases found %s while pytest found"
+                         " %s. Please report this issue to the `pytest-cases` project."
+                         "" % (parentnode.nodeid, dict(arg2fixturedefs), ref_arg2fixturedefs))
 
 
 if PYTEST8_OR_GREATER:
-    def getfixtureclosure(fm, parentnode, initialnames, ignore_args):
-        return _getfixtureclosure(fm, fixturenames=initialnames, parentnode=parentnode, ignore_args=ignore_args)
+    def getfixtureclosure(fm, parentnode, initialnames, ignore_args, verify=False):
+        return _getfixtureclosure(fm, fixturenames=initialnames, parentnode=parentnode, ignore_args=ignore_args,
+                                  verify=verify)
 else:
     getfixtureclosure = _getfixtureclosure
 
@@ -862,8 +1460,47 @@ def create_super_closure(fm,
     #  the first node contains second, and the second contains first
     # or TODO check the test for get_callspecs, it is maybe simpler
 
-    # Finally create the closure
+    # Finally create the closure, or reuse the one created for a previous test function with the same signature
     fixture_defs_mgr = FixtureDefsCache(fm, parentnode)
+    closure_memo = get_closure_memo(fm)
+    memo_key = (fixture_defs_mgr.visibility_key, tuple(_init_fixnames), frozenset(ignore_args))
+    memoized = closure_memo.get(memo_key)
+    if memoized is None:
+        closure, all_fixture_defs = build_super_closure(fixture_defs_mgr, _init_fixnames, ignore_args)
+        closure_memo.put(memo_key, closure, all_fixture_defs)
+    else:
+        closure, all_fixture_defs = memoized
+
+    # hand out private copies: pytest and other plugins may modify them. Super closures share their tree until then.
+    if isinstance(closure, SuperClosure):
+        super_closure = copy(closure)
+    else:
+        super_closure = list(closure)
+
+    if _DEBUG:
+        print("Closure for %s completed%s:" % (parentid, " (memoized)" if memoized is not None else ""))
+        print(super_closure)
+
+    return _init_fixnames, super_closure, dict(all_fixture_defs)
+
+
+def build_super_closure(fixture_defs_mgr,  # type: FixtureDefsCache
+                        _init_fixnames,    # type: List[str]
+                        ignore_args
+                        ):
+    # type: (...) -> Tuple[Union[List, SuperClosure], Mapping]
+    """
+    Creates the closure of `_init_fixnames`. If it contains a union this is a `SuperClosure`, otherwise a list.
+    The second output is the dictionary of all fixture definitions used, without the test function parameters.
+    """
+    # Fast path: most closures do not contain any union, no need for a tree then
+    flat_fixture_defs = build_flat_closure(fixture_defs_mgr, _init_fixnames, ignore_args=ignore_args)
+    if flat_fixture_defs is not None:
+        sorted_items = sort_fixture_defs_by_scope(flat_fixture_defs.items())
+        closure = [k for k, _ in sorted_items]
+        all_fixture_defs = {k: v for k, v in sorted_items if v is not None}
+        return closure, all_fixture_defs
+
     closure_tree = FixtureClosureNode(fixture_defs_mgr=fixture_defs_mgr)
     closure_tree.build_closure(_init_fixnames, ignore_args=ignore_args)
     super_closure = SuperClosure(closure_tree)
@@ -874,11 +1511,9 @@ def create_super_closure(fm,
         super_closure = list(super_closure)
 
     if _DEBUG:
-        print("Closure for %s completed:" % parentid)
         print(closure_tree)
-        print(super_closure)
 
-    return _init_fixnames, super_closure, all_fixture_defs
+    return super_closure, all_fixture_defs
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -979,7 +1614,6 @@ class CallsReactor(object):
 
      - finally, the list is built from the tree using `self._tree.to_call_list()`. This will also be the case in
      subsequent usages of this object.
-
     """
     __slots__ = 'metafunc', '_pending', '_call_list'
 
@@ -1016,24 +1650,17 @@ class CallsReactor(object):
         """
         if self._call_list is None:
             # create the definitive tree.
-            self.create_call_list_from_pending_parametrizations()
+            with trace_span("create_call_list_from_pending_parametrizations", "calls",
+                            target=self.metafunc.function, node=get_pytest_nodeid(self.metafunc)) as span:
+                self.create_call_list_from_pending_parametrizations()
+                span.set(nb_calls=len(self._call_list))
 
         return self._call_list
 
     # --- tree creation (executed once the first time this object is used as a list)
 
-    def create_call_list_from_pending_parametrizations(self):
-        """
-        Takes all parametrization operations that are pending in `self._pending`,
-        and creates a parametrization tree out of them.
-
-        self._pending is set to None afterwards
-        :return:
-        """
-        # self is on the _calls field, we'll temporarily remove it and finally set it back at the end of this call
-        assert self.metafunc._calls is self
-
-        # ------ parametrize the calls --------
+    def _get_pending_dct(self):
+        """Returns a dictionary of pending parametrizations, indexed by their first argname"""
         # create a dictionary of pending fixturenames/argnames to parametrize.
         pending_dct = OrderedDict()
         for p in self._pending:
@@ -1049,27 +1676,54 @@ class CallsReactor(object):
             print("---------------------------------\n")
             print("Applying all of them in the closure tree nodes:")
 
+        return pending_dct
+
+    def create_call_list_from_pending_parametrizations(self):
+        """
+        Takes all parametrization operations that are pending in `self._pending`,
+        and creates a parametrization tree out of them.
+
+        self._pending is set to None afterwards
+        :return:
+        """
+        # self is on the _calls field, we'll temporarily remove it and finally set it back at the end of this call
+        assert self.metafunc._calls is self
+
+        # ------ parametrize the calls --------
+        pending_dct = self._get_pending_dct()
+
         # grab the "super fixtures closure" created previously (see getfixtureclosure above)
         super_closure = self.metafunc.fixturenames
         assert isinstance(super_closure, SuperClosure)
 
-        # Apply parametrization for calls
-        calls = get_calls_for_tree(self.metafunc, super_closure.tree, pending_dct)
-        # Alternative: use the partitions for parametrization. The issue is that this leads to a less intuitive order
-        # calls = []
-        # for i in range(super_closure.nb_alternative_closures):
-        #     calls += get_calls_for_partition(self.metafunc, super_closure, i, pending.copy())
-
-        if _DEBUG:
-            print("\n".join(["%s[%s]: funcargs=%s, params=%s" % (get_pytest_nodeid(self.metafunc),
-                                                                 c.id, c.params if PYTEST8_OR_GREATER else c.funcargs,
-                                                                 c.params)
-                             for c in calls]) + "\n")
-
-        # clean EMPTY_ID set by @parametrize when there is at least a MultiParamsAlternative
-        # if PYTEST54_OR_GREATER:
-        for callspec in calls:
-            remove_empty_ids(callspec)
+        # Reuse the calls created for another test function with the same tree and parametrization orders
+        templates_cache = self._get_templates_cache()
+        templates_key = templates_cache.get_key(super_closure.tree, self._pending)
+        templates = templates_cache.get(templates_key)
+        if templates is not None:
+            replay_parametrize_side_effects(self.metafunc, self._pending)
+            calls = [clone_callspec(c) for c in templates]
+        else:
+            # Apply parametrization for calls
+            calls = get_calls_for_tree(self.metafunc, super_closure.tree, pending_dct)
+            # Alternative: use the partitions for parametrization. The issue is that this leads to a less intuitive
+            # order
+            # calls = []
+            # for i in range(super_closure.nb_alternative_closures):
+            #     calls += get_calls_for_partition(self.metafunc, super_closure, i, pending.copy())
+
+            if _DEBUG:
+                print("\n".join(["%s[%s]: funcargs=%s, params=%s" % (get_pytest_nodeid(self.metafunc), c.id,
+                                                                     c.params if PYTEST8_OR_GREATER else c.funcargs,
+                                                                     c.params)
+                                 for c in calls]) + "\n")
+
+            # clean EMPTY_ID set by @parametrize when there is at least a MultiParamsAlternative
+            # if PYTEST54_OR_GREATER:
+            for callspec in calls:
+                remove_empty_ids(callspec)
+
+            templates_cache.put(templates_key, super_closure.tree, self._pending, calls)
 
         # save the list and put back self as the _calls facade
         self._call_list = calls
@@ -1077,6 +1731,51 @@ class CallsReactor(object):
         # forget about all parametrizations now - this won't happen again
         self._pending = None
 
+    def _get_templates_cache(self):
+        # type: (...) -> CallTemplatesCache
+        """Returns the `CallTemplatesCache` of the session"""
+        fm = self.metafunc.config.pluginmanager.get_plugin('funcmanage')
+        return get_call_templates_cache(fm)
+
+
+def clone_callspec(callspec  # type: CallSpec2
+                   ):
+    # type: (...) -> CallSpec2
+    """
+    Returns a copy of `callspec` that can be modified independently: its dictionaries and lists are copied.
+    """
+    # note: this also copies the sparse "NOT_USED" parametrization attribute, see `fill_not_used_params`
+    new_callspec = copy(callspec)
+    for attr in _CALLSPEC_DCT_ATTRS:
+        dct = getattr(callspec, attr, None)
+        if dct is not None:
+            # object.__setattr__: CallSpec2 is a frozen dataclass in recent pytest
+            object.__setattr__(new_callspec, attr, dct.copy())
+    for attr in ('_idlist', 'marks'):
+        lst = getattr(callspec, attr, None)
+        if lst is not None:
+            object.__setattr__(new_callspec, attr, list(lst))
+    return new_callspec
+
+
+def replay_parametrize_side_effects(metafunc,
+                                    pending  # type: List[Union[UnionParamz, NormalParamz]]
+                                    ):
+    """
+    Reproduces the effects of the parametrization orders `pending` on `metafunc`, when the calls are not created but
+    retrieved from the `CallTemplatesCache`. Direct parametrizations are applied on a single empty call, so that pytest
+    registers the test function arguments as parameters (pytest 8+). For fixtures, only their "directness" needs to be
+    registered (pytest 8.1+).
+    """
+    for p in pending:
+        if not is_indirect_parametrization(p):
+            _parametrize_calls(metafunc, [], p.argnames, p.argvalues, indirect=p.indirect, ids=p.ids,
+                               scope=p.scope, **p.kwargs)
+        elif hasattr(metafunc, '_params_directness'):
+            argnames = p.union_fixture_name if isinstance(p, UnionParamz) else p.argnames
+            for argname in get_param_argnames_as_list(argnames):
+                metafunc._params_directness[argname] = "indirect"  # noqa
+
 
 def get_calls_for_tree(metafunc,
                        fix_closure_tree,  # type: FixtureClosureNode
@@ -1092,10 +1791,138 @@ def get_calls_for_tree(metafunc,
     pending_dct = pending_dct.copy()
     calls, nodes_used_by_calls = _process_node(metafunc, fix_closure_tree, pending_dct, [])
     # for each call in calls, the node in nodes_used_by_calls is the corresponding tree leaf.
-    _cleanup_calls_list(metafunc, fix_closure_tree, calls, nodes_used_by_calls, pending_dct)
+    with trace_span("_cleanup_calls_list", "calls", nb_calls=len(calls)):
+        _cleanup_calls_list(metafunc, fix_closure_tree, calls, nodes_used_by_calls, pending_dct)
     return calls
 
 
+_NOT_USED_FILL_ATTR = '_pytestcases_not_used_fill'
+
+
+class NotUsedFill(object):
+    """
+    The sparse representation of the "NOT_USED" parameters for the calls of a test function. It is shared by all calls
+    and attached to each of them, together with the call's leaf in the fixture closure tree.
+
+     - `templates` is a list of tuples (fixture_name, template) where template is a callspec holding the "NOT_USED"
+       parametrization to use for that (parametrized) function-scoped fixture, in the calls where it is not
+       parametrized. The "NOT_USED" parametrization of fixtures with a broader scope is not sparse, since pytest uses
+       it to reorder the items.
+     - `func_scoped` is the list of function-scoped fixtures that are not required by all leaves. They should be
+       explicitly deactivated in the calls where they are not required by the leaf.
+     - `other_scoped` is the list of non-parametrized `pytest-cases` fixtures with a broader scope that are not
+       required by all leaves. They are deactivated in all items when no item actually needs them, see
+       `deactivate_unused_fixtures`.
+    """
+    __slots__ = 'templates', 'func_scoped', 'other_scoped'
+
+    def __init__(self,
+                 templates,        # type: List[Tuple[str, CallSpec2]]
+                 func_scoped,      # type: List[str]
+                 other_scoped=()   # type: Sequence[str]
+                 ):
+        self.templates = templates
+        self.func_scoped = func_scoped
+        self.other_scoped = other_scoped
+
+
+def is_indirect_parametrization(p  # type: Union[UnionParamz, NormalParamz]
+                                ):
+    # type: (...) -> bool
+    """Return True if `p` only parametrizes fixtures (it does not directly parametrize test function arguments)"""
+    return isinstance(p, UnionParamz) or p.indirect is True
+
+
+def _get_not_used_template(metafunc,
+                           p_to_apply  # type: Union[UnionParamz, NormalParamz]
+                           ):
+    # type: (...) -> CallSpec2
+    """Returns a callspec containing the "NOT_USED" parametrization for `p_to_apply`, with no id."""
+    if isinstance(p_to_apply, UnionParamz):
+        c_with_dummy = _parametrize_calls(metafunc, [], p_to_apply.union_fixture_name, [NOT_USED],
+                                          indirect=True, discard_id=True, scope=p_to_apply.scope,
+                                          **p_to_apply.kwargs)
+    else:
+        _nb_argnames = len(get_param_argnames_as_list(p_to_apply.argnames))
+        if _nb_argnames > 1:
+            _vals = [(NOT_USED,) * _nb_argnames]
+        else:
+            _vals = [NOT_USED]
+        c_with_dummy = _parametrize_calls(metafunc, [], p_to_apply.argnames, _vals,
+                                          indirect=p_to_apply.indirect, discard_id=True,
+                                          scope=p_to_apply.scope, **p_to_apply.kwargs)
+    assert len(c_with_dummy) == 1
+    return c_with_dummy[0]
+
+
+# the dictionaries of a callspec, depending on pytest version
+_CALLSPEC_DCT_ATTRS = ('funcargs', 'params', 'indices', '_arg2scope', '_arg2scopenum')
+
+
+def _merge_callspec_template(template,  # type: CallSpec2
+                             callspec   # type: CallSpec2
+                             ):
+    """Adds all the parameters in `template` to `callspec`, as if it had been parametrized with them"""
+    for attr in _CALLSPEC_DCT_ATTRS:
+        template_dct = getattr(template, attr, None)
+        if template_dct:
+            dct = getattr(callspec, attr)
+            for k, v in template_dct.items():
+                dct.setdefault(k, v)
+
+
+def _has_broader_scope(template  # type: CallSpec2
+                       ):
+    # type: (...) -> bool
+    """Return True if a parameter in `template` has a broader scope than "function" (e.g. "module")"""
+    return any(get_callspec_arg_scope_name(template, argname) != "function" for argname in template.params)
+
+
+def fill_not_used_params(callspec  # type: CallSpec2
+                         ):
+    """
+    Applies the sparse "NOT_USED" parametrization attached to `callspec` by `_cleanup_calls_list`, if any.
+    This is done once, when the corresponding test is setup (see `pytest_runtest_setup`).
+    """
+    fill_and_leaf = getattr(callspec, _NOT_USED_FILL_ATTR, None)
+    if fill_and_leaf is None:
+        return
+    fill, leaf = fill_and_leaf
+    object.__setattr__(callspec, _NOT_USED_FILL_ATTR, None)
+
+    # A/ parametrized fixtures not used in this call
+    for fixture, template in fill.templates:
+        if not in_callspec_explicit_args(callspec, fixture):
+            _merge_callspec_template(template, callspec)
+
+    # B/ function-scoped non-parametrized fixtures not required in this call.
+    #
+    # For this we use a dirty hack: we add a parameter with they name in the callspec, it seems to be propagated
+    # in the `request`. TODO is there a better way?
+    for fixture_name in fill.func_scoped:
+        if not in_callspec_explicit_args(callspec, fixture_name) and not leaf.requires(fixture_name):
+            # explicitly add it as discarded by creating a parameter value for it.
+            callspec.params[fixture_name] = NOT_USED
+            callspec.indices[fixture_name] = 1
+            set_callspec_arg_scope_to_function(callspec, fixture_name)
+
+
+def get_scoped_params(callspec  # type: CallSpec2
+                      ):
+    # type: (...) -> Dict[str, Tuple[Any, str]]
+    """
+    Returns a dictionary {argname: (param, scope name)} of all the parameters in `callspec` that are not
+    function-scoped. Note that their "NOT_USED" parametrization is always applied during collection, only the
+    function-scoped one is sparse (see `_cleanup_calls_list`).
+    """
+    res = dict()
+    for argname, param in callspec.params.items():
+        scope_name = get_callspec_arg_scope_name(callspec, argname)
+        if scope_name != "function":
+            res[argname] = param, scope_name
+    return res
+
+
 def _cleanup_calls_list(metafunc,
                         fix_closure_tree,   # type: FixtureClosureNode
                         calls,              # type: List[CallSpec2]
@@ -1106,6 +1933,12 @@ def _cleanup_calls_list(metafunc,
     Cleans the calls list so that all calls contain a value for all parameters. This is basically
     about adding "NOT_USED" parametrization everywhere relevant.
 
+    This is done in a sparse way: the "NOT_USED" parametrization of fixtures is only computed once per parametrization
+    (see `_get_not_used_template`), and a `NotUsedFill` is attached to the calls that need it. It is only applied on
+    each call when the corresponding test is setup, see `fill_not_used_params`. Only direct parametrization (test
+    function arguments) and the parametrization of fixtures with a broader scope than "function" are applied here,
+    since pytest needs them during collection: the latter are used by its default items reordering.
+
     :param calls:
     :param nodes:
     :param pending:
@@ -1118,7 +1951,7 @@ def _cleanup_calls_list(metafunc,
 
     # create ref lists of fixtures per scope
     _not_always_used_func_scoped = []
-    # _not_always_used_other_scoped = []
+    _not_always_used_other_scoped = []
     for fixture_name in fix_closure_tree.get_not_always_used():
         try:
             fixdef = metafunc._arg2fixturedefs[fixture_name]  # noqa
@@ -1127,75 +1960,35 @@ def _cleanup_calls_list(metafunc,
         else:
             if has_function_scope(fixdef[-1]):
                 _not_always_used_func_scoped.append(fixture_name)
-            # else:
-            #     _not_always_used_other_scoped.append(fixture_name)
+            elif fixdef[-1].params is None and is_not_used_aware(fixdef[-1].func):
+                # parametrized fixtures are handled by the "NOT_USED" templates. Plain pytest fixtures would be
+                # executed even with a NOT_USED parameter: they can not be deactivated.
+                _not_always_used_other_scoped.append(fixture_name)
 
-    for i in range(nb_calls):
-        c, n = calls[i], nodes[i]
+    fill = NotUsedFill([], _not_always_used_func_scoped, _not_always_used_other_scoped)
 
-        # A/ set to "not used" all parametrized fixtures that were not used in some branches
-        for fixture, p_to_apply in pending_dct.items():
+    # A/ set to "not used" all parametrized fixtures that were not used in some branches
+    for fixture, p_to_apply in pending_dct.items():
+        template = None
+        for c in calls:
             if not in_callspec_explicit_args(c, fixture):
-                # parametrize with a single "not used" value and discard the id
-                if isinstance(p_to_apply, UnionParamz):
-                    c_with_dummy = _parametrize_calls(metafunc, [c], p_to_apply.union_fixture_name, [NOT_USED],
-                                                      indirect=True, discard_id=True, scope=p_to_apply.scope,
-                                                      **p_to_apply.kwargs)
-                else:
-                    _nb_argnames = len(get_param_argnames_as_list(p_to_apply.argnames))
-                    if _nb_argnames > 1:
-                        _vals = [(NOT_USED,) * _nb_argnames]
-                    else:
-                        _vals = [NOT_USED]
-                    c_with_dummy = _parametrize_calls(metafunc, [c], p_to_apply.argnames, _vals,
-                                                      indirect=p_to_apply.indirect, discard_id=True,
-                                                      scope=p_to_apply.scope, **p_to_apply.kwargs)
-                assert len(c_with_dummy) == 1
-                calls[i] = c_with_dummy[0]
-                c = calls[i]
-
-        # B/ function-scoped non-parametrized fixtures also need to be explicitly deactivated in the callspecs
-        # where they are not required, otherwise they will be setup/teardown.
-        #
-        # For this we use a dirty hack: we add a parameter with they name in the callspec, it seems to be propagated
-        # in the `request`. TODO is there a better way?
-        for fixture_name in _not_always_used_func_scoped:
-            if not in_callspec_explicit_args(c, fixture_name):
-                if not n.requires(fixture_name):
-                    # explicitly add it as discarded by creating a parameter value for it.
-                    c.params[fixture_name] = NOT_USED
-                    c.indices[fixture_name] = 1
-                    set_callspec_arg_scope_to_function(c, fixture_name)
-                else:
-                    # explicitly add it as active
-                    c.params[fixture_name] = USED
-                    c.indices[fixture_name] = 0
-                    set_callspec_arg_scope_to_function(c, fixture_name)
-
-    # finally, if there are some session or module-scoped fixtures that
-    # are used in *none* of the calls, they could be deactivated too
-    # (see https://github.com/smarie/python-pytest-cases/issues/137)
-    #
-    # for fixture_name in _not_always_used_other_scoped:
-    #     _scopenum = metafunc._arg2fixturedefs[fixture_name][-1].scopenum
-    #
-    #     # check if there is at least one call that actually uses the fixture and is not skipped...
-    #     # this seems a bit "too much" !! > WON'T FIX
-    #     used = False
-    #     for i in range(nb_calls):
-    #         c, n = calls[i], nodes[i]
-    #         if fixture_name in c.params or fixture_name in c.funcargs or n.requires(fixture_name):
-    #             if not is_skipped_or_failed(c):  # HOW can we implement this based on call (and not item) ???
-    #                 used = True
-    #                 break
-    #
-    #     if not used:
-    #         # explicitly add it as discarded everywhere by creating a parameter value for it.
-    #         for i in range(nb_calls):
-    #             c = calls[i]
-    #             c.params[fixture_name] = NOT_USED
-    #             c.indices[fixture_name] = 0
-    #             c._arg2scopenum[fixture_name] = _scopenum  # noqa
+                if template is None:
+                    # parametrize with a single "not used" value and discard the id, only once
+                    template = _get_not_used_template(metafunc, p_to_apply)
+                    if is_indirect_parametrization(p_to_apply) and not _has_broader_scope(template):
+                        # function-scoped fixtures: this will be done at setup time
+                        fill.templates.append((fixture, template))
+                        break
+                # test function arguments and higher-scoped fixtures: pytest needs them during collection
+                _merge_callspec_template(template, c)
+
+    # B/ function-scoped non-parametrized fixtures also need to be explicitly deactivated in the callspecs
+    # where they are not required, otherwise they will be setup/teardown. This will also be done at setup time.
+    # Fixtures with a broader scope are deactivated once all items are known, see `deactivate_unused_fixtures`.
+    if fill.templates or fill.func_scoped or fill.other_scoped:
+        for c, n in zip(calls, nodes):
+            # object.__setattr__: CallSpec2 is a frozen dataclass in recent pytest
+            object.__setattr__(c, _NOT_USED_FILL_ATTR, (fill, n))
 
 
 # def get_calls_for_partition(metafunc, super_closure, p_idx, pending):
@@ -1410,28 +2203,47 @@ def _process_node(metafunc,
                                            p_to_apply.alternative_names, indirect=True,
                                            ids=p_to_apply.ids, scope=p_to_apply.scope, **p_to_apply.kwargs)
 
-                # now move to the children
-                nodes_children = [None] * len(calls)
-                for i in range(len(calls)):
-                    active_alternative = calls[i].params[p_to_apply.union_fixture_name]
-                    child_indices = [_i for _i, x in enumerate(current_node.split_fixture_alternatives)
-                                     if x == active_alternative.alternative_name]
+                # now move to the children. Group the calls by active alternative, so that each child subtree
+                # is processed once for all of its calls (and not once per call)
+                first_child_indices = dict()
+                for _i, x in enumerate(current_node.split_fixture_alternatives):
                     # only use the first matching child, since the subtrees are identical.
-                    child_node = current_node.children[child_indices[0]]
+                    first_child_indices.setdefault(x, _i)
+
+                calls_per_child = OrderedDict()
+                for i, c in enumerate(calls):
+                    active_alternative = c.params[p_to_apply.union_fixture_name]
+                    child_idx = first_child_indices[active_alternative.alternative_name]
+                    calls_per_child.setdefault(child_idx, []).append(i)
+
+                # place the children parameter in the first position if it is in the list
+                # not needed anymore - already automatic
+                # try:
+                #     child_pending.move_to_end(child_alternative, last=False)
+                # except KeyError:
+                #     # not in the list: the child alternative is a non-parametrized fixture
+                #     pass
+
+                calls_children = [None] * len(calls)
+                nodes_children = [None] * len(calls)
+                for child_idx, call_indices in calls_per_child.items():
+                    child_node = current_node.children[child_idx]
                     child_pending = pending.copy()
-
-                    # place the children parameter in the first position if it is in the list
-                    # not needed anymore - already automatic
-                    # try:
-                    #     child_pending.move_to_end(child_alternative, last=False)
-                    # except KeyError:
-                    #     # not in the list: the child alternative is a non-parametrized fixture
-                    #     pass
-
-                    calls[i], nodes_children[i] = _process_node(metafunc, child_node, child_pending, [calls[i]])
-
-                # finally flatten the list if needed
-                calls = flatten_list(calls)
+                    group_calls, group_nodes = _process_node(metafunc, child_node, child_pending,
+                                                             [calls[i] for i in call_indices])
+
+                    # each call of the group was expanded into the same number of consecutive calls: dispatch them
+                    # back at the position of their origin call, so as to preserve the order.
+                    nb_per_call, remainder = divmod(len(group_calls), len(call_indices))
+                    if remainder != 0:
+                        raise ValueError("This should not happen! Calls of a union alternative were not expanded "
+                                         "uniformly")
+                    for j, i in enumerate(call_indices):
+                        calls_children[i] = group_calls[j * nb_per_call:(j + 1) * nb_per_call]
+                        nodes_children[i] = group_nodes[j * nb_per_call:(j + 1) * nb_per_call]
+
+                # finally flatten the list
+                calls = flatten_list(calls_children)
                 nodes_children = flatten_list(nodes_children)
                 return calls, nodes_children
 
@@ -1479,13 +2291,22 @@ def sort_according_to_ref_list(fixturenames, param_names):
 
 
 _OPTION_NAME = 'with_reorder'
+_VERIFY_CLOSURE_OPTION_NAME = 'cases_verify_closure'
+_TRACE_OPTION_NAME = 'cases_trace'
+_PROFILE_OPTION_NAME = 'cases_profile'
+_PROFILE_TOP_OPTION_NAME = 'cases_profile_top'
+_MEMORY_REPORT_OPTION_NAME = 'cases_memory_report'
 _SKIP = 'skip'
 _NORMAL = 'normal'
+_UNION = 'union'
 _OPTIONS = {
     _NORMAL: """(default) the usual reordering done by pytest to optimize setup/teardown of session- / module-
 / class- fixtures, as well as all the modifications made by other plugins (e.g. pytest-reorder)""",
     _SKIP: """skips *all* reordering, even the one done by pytest itself or installed plugins
-(e.g. pytest-reorder)"""
+(e.g. pytest-reorder)""",
+    _UNION: """skips all reordering like 'skip', and then reorders the items to optimize setup/teardown of
+session- / module- / class- fixtures, taking into account the active alternative of fixture unions (and therefore
+the fixtures that are not used)"""
 }
 
 
@@ -1498,6 +2319,34 @@ def pytest_addoption(parser):
         '--%s' % _OPTION_NAME.replace('_', '-'), type=str, default='normal', help=help_str
     )
 
+    group = parser.getgroup('pytest-cases collection', 'pytest-cases collection options', after='general')
+    group.addoption(
+        '--%s' % _VERIFY_CLOSURE_OPTION_NAME.replace('_', '-'), action='store_true', default=False,
+        help="Compare each fixture closure computed by pytest-cases with the one computed by pytest, and raise an "
+             "error if they differ. This doubles the cost of fixture closure computation, use for debugging only."
+    )
+    group.addoption(
+        '--%s' % _TRACE_OPTION_NAME.replace('_', '-'), type=str, default=None, metavar='PATH',
+        help="Record a trace of the collection phase (cases discovery, fixture closures, calls generation...) and "
+             "write it to json file PATH in the Chrome trace-event format, to be opened with chrome://tracing or "
+             "https://ui.perfetto.dev ."
+    )
+    group.addoption(
+        '--%s' % _PROFILE_OPTION_NAME.replace('_', '-'), action='store_true', default=False,
+        help="Print a report at the end of collection, ranking the test functions by the time spent by pytest-cases "
+             "to parametrize and collect them."
+    )
+    group.addoption(
+        '--%s' % _PROFILE_TOP_OPTION_NAME.replace('_', '-'), type=int, default=20, metavar='N',
+        help="Number of test functions to display in the --cases-profile report. Default: 20, 0 to display all."
+    )
+    group.addoption(
+        '--%s' % _MEMORY_REPORT_OPTION_NAME.replace('_', '-'), action='store_true', default=False,
+        help="Trace the memory allocations during collection with tracemalloc, and print a report at the end of "
+             "collection attributing the allocated memory and objects to each pytest-cases generating API and to "
+             "each test module. The number of entries is set by --cases-profile-top. This slows down collection."
+    )
+
 
 # will be loaded when the pytest_configure hook below is called
 PYTEST_CONFIG = None  # type: Optional[Config]
@@ -1512,12 +2361,132 @@ def pytest_load_initial_conftests(early_config):
 # @hookspec(historic=True)
 def pytest_configure(config):
     # validate the config
-    allowed_values = ('normal', 'skip')
+    allowed_values = tuple(_OPTIONS)
     reordering_choice = config.getoption(_OPTION_NAME)
     if reordering_choice not in allowed_values:
         raise ValueError("[pytest-cases] Wrong --%s option: %s. Allowed values: %s"
                          "" % (_OPTION_NAME, reordering_choice, allowed_values))
 
+    # the cases modules may have changed since the previous session in this process
+    CASES_MODULES_INDEX.clear()
+    AUTO_CASES_MODULES_INDEX.reset(str(getattr(config, 'rootpath', None) or config.rootdir),
+                                   config.getini("norecursedirs"))
+
+    # start tracing if required
+    trace_path = config.getoption(_TRACE_OPTION_NAME, default=None)
+    if trace_path:
+        tracer = ChromeTracer()
+        config._pytestcases_trace = tracer, os.path.abspath(trace_path)
+        start_tracing(tracer)
+
+    # start profiling if required
+    if config.getoption(_PROFILE_OPTION_NAME, default=False):
+        profiler = CollectionProfiler()
+        config._pytestcases_profiler = profiler
+        start_tracing(profiler)
+
+    # start memory profiling if required
+    if config.getoption(_MEMORY_REPORT_OPTION_NAME, default=False):
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start()
+        memory_profiler = MemoryProfiler()
+        config._pytestcases_memory_profiler = memory_profiler, started_tracemalloc
+        start_tracing(memory_profiler)
+
+
+def pytest_unconfigure(config):
+    # stop tracing and write the trace file if required
+    trace = getattr(config, '_pytestcases_trace', None)
+    if trace is not None:
+        tracer, trace_path = trace
+        stop_tracing(tracer)
+        del config._pytestcases_trace
+        tracer.write(trace_path)
+
+    profiler = getattr(config, '_pytestcases_profiler', None)
+    if profiler is not None:
+        stop_tracing(profiler)
+        del config._pytestcases_profiler
+
+    memory_profiler = getattr(config, '_pytestcases_memory_profiler', None)
+    if memory_profiler is not None:
+        _stop_memory_profiler(*memory_profiler)
+        del config._pytestcases_memory_profiler
+
+
+def _stop_memory_profiler(memory_profiler,     # type: MemoryProfiler
+                          started_tracemalloc  # type: bool
+                          ):
+    """Stops `memory_profiler`, and `tracemalloc` if it was started for it. Nothing happens if it was already done"""
+    if memory_profiler.end_memory is None:
+        stop_tracing(memory_profiler)
+        memory_profiler.stop()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+
+def pytest_collection_finish(session):
+    # print the collection profile and memory report if required
+    profiler = getattr(session.config, '_pytestcases_profiler', None)
+    if profiler is not None:
+        # collection is over, no need to profile anymore
+        stop_tracing(profiler)
+        _report_collection_profile(session, profiler)
+
+    memory_profiler = getattr(session.config, '_pytestcases_memory_profiler', None)
+    if memory_profiler is not None:
+        _stop_memory_profiler(*memory_profiler)
+        _report_collection_memory(session, memory_profiler[0])
+
+
+def _report_collection_memory(session,
+                              memory_profiler  # type: MemoryProfiler
+                              ):
+    """Prints the `--cases-memory-report` report"""
+    tr = session.config.pluginmanager.get_plugin('terminalreporter')
+    if tr is None:
+        return
+
+    top = session.config.getoption(_PROFILE_TOP_OPTION_NAME) or None
+    tr.write_sep("=", "pytest-cases collection memory report")
+    for line in memory_profiler.format_report(top):
+        tr.write_line(line)
+
+
+def _report_collection_profile(session,
+                               profiler  # type: CollectionProfiler
+                               ):
+    """Prints the `--cases-profile` report"""
+    tr = session.config.pluginmanager.get_plugin('terminalreporter')
+    if tr is None:
+        return
+
+    top = session.config.getoption(_PROFILE_TOP_OPTION_NAME) or None
+    nb_entries = len(profiler.entries)
+    tr.write_sep("=", "pytest-cases collection profile (top %s of %s)"
+                 % (min(top or nb_entries, nb_entries), nb_entries))
+    for line in profiler.format_report(top):
+        tr.write_line(line)
+
+    # caches statistics
+    fm = session._fixturemanager  # noqa
+    for cache_name, cache in (("fixture definitions cache", getattr(fm, '_pytestcases_fixture_defs_cache', None)),
+                              ("fixture closures memo", getattr(fm, '_pytestcases_closure_memo', None)),
+                              ("calls templates cache", getattr(fm, '_pytestcases_call_templates_cache', None)),
+                              ("cases modules index", CASES_MODULES_INDEX),
+                              ("AUTO cases modules index", AUTO_CASES_MODULES_INDEX)):
+        if cache is not None:
+            tr.write_line("%s: %s" % (cache_name, ", ".join("%s=%s" % i for i in cache.get_stats().items())))
+
+    # fixtures setups avoided
+    deactivated = getattr(session.config, '_pytestcases_deactivated_fixtures', None)
+    if deactivated is not None:
+        tr.write_line("unused fixtures deactivated: %s" % len(deactivated))
+        for (fixture_name, scope_name, node_id), nb_items in deactivated.items():
+            tr.write_line("  %s (%s-scoped, in %s): %s items"
+                          % (fixture_name, scope_name, node_id or "<session>", nb_items))
+
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_collection_modifyitems(session, config, items):  # noqa
@@ -1525,7 +2494,8 @@ def pytest_collection_modifyitems(session, config, items):  # noqa
     An alternative to the `reorder_items` function in fixtures.py
     (https://github.com/pytest-dev/pytest/blob/master/src/_pytest/fixtures.py#L209)
 
-    We basically set back the previous order once the pytest ordering routine has completed.
+    We basically set back the previous order once the pytest ordering routine has completed, and possibly reorder the
+    items according to the selected strategy (see `register_reordering_strategy`).
 
     TODO we should set back an optimal ordering, but current PR https://github.com/pytest-dev/pytest/pull/3551
      will probably not be relevant to handle our "union" fixtures > need to integrate the NOT_USED markers in the method
@@ -1536,24 +2506,253 @@ def pytest_collection_modifyitems(session, config, items):  # noqa
     :return:
     """
     ordering_choice = config.getoption(_OPTION_NAME)
+    strategy = _REORDERING_STRATEGIES.get(ordering_choice)
 
-    if ordering_choice == _SKIP:
-        # remember initial order
-        initial_order = copy(items)
-        yield
-        # put back the initial order but keep the filter
-        to_return = [None] * len(items)
-        i = 0
-        for item in initial_order:
-            if item in items:
-                to_return[i] = item
-                i += 1
-        assert i == len(items)
-        items[:] = to_return
+    # remember initial order if a strategy needs it
+    initial_order = InitialItemsOrder(items) if strategy is not None else None
+    yield
 
-    else:
-        # do nothing
-        yield
+    # now that the items are filtered (-k, -m...), deactivate the fixtures that none of them needs
+    with trace_span("deactivate_unused_fixtures", "items", nb_items=len(items)):
+        config._pytestcases_deactivated_fixtures = deactivate_unused_fixtures(items)
+
+    if strategy is not None:
+        items[:] = strategy(items, initial_order)
+
+
+class InitialItemsOrder(object):
+    """
+    The order of the items before `pytest_collection_modifyitems` was called. This is provided to the reordering
+    strategies (see `register_reordering_strategy`), so that they can restore it or use it without rescanning the list
+    of items: items are indexed by identity, so that this is linear even with tens of thousands of items.
+    """
+    __slots__ = ('items', '_positions')
+
+    def __init__(self,
+                 items  # type: List[pytest.Item]
+                 ):
+        self.items = list(items)
+        self._positions = None  # type: Optional[Dict[int, int]]
+
+    def position(self,
+                 item  # type: pytest.Item
+                 ):
+        # type: (...) -> int
+        """Returns the position of `item` in the initial order"""
+        if self._positions is None:
+            self._positions = {_object_id(item): i for i, item in enumerate(self.items)}
+        return self._positions[_object_id(item)]
+
+    def restore(self,
+                items  # type: List[pytest.Item]
+                ):
+        # type: (...) -> List[pytest.Item]
+        """
+        Returns a new list containing `items` in the initial order. Items that are not in `items` anymore (filtered by
+        -k, -m, or deselected by other plugins) are not included.
+        """
+        kept = set(map(_object_id, items))
+        to_return = [item for item in self.items if _object_id(item) in kept]
+        assert len(to_return) == len(items)
+        return to_return
+
+
+def skip_reordering(items,         # type: List[pytest.Item]
+                    initial_order  # type: InitialItemsOrder
+                    ):
+    # type: (...) -> List[pytest.Item]
+    """The `--with-reorder skip` strategy: put back the initial order but keep the filter"""
+    return initial_order.restore(items)
+
+
+def union_reordering(items,         # type: List[pytest.Item]
+                     initial_order  # type: InitialItemsOrder
+                     ):
+    # type: (...) -> List[pytest.Item]
+    """The `--with-reorder union` strategy: put back the initial order, then see `reorder_items_union_aware`"""
+    return reorder_items_union_aware(initial_order.restore(items))
+
+
+# the reordering strategies, applied once all other `pytest_collection_modifyitems` hooks have been called
+_REORDERING_STRATEGIES = {
+    _SKIP: skip_reordering,
+    _UNION: union_reordering,
+}
+
+
+def register_reordering_strategy(name,         # type: str
+                                 strategy,     # type: Callable[..., List[pytest.Item]]
+                                 description   # type: str
+                                 ):
+    """
+    Registers a new `--with-reorder <name>` alternative. This should be done when the conftest or plugin is imported,
+    so that the option is valid when pytest is configured. Registering a name again replaces the strategy.
+
+    `strategy(items, initial_order)` is called after all other `pytest_collection_modifyitems` hooks have been
+    called, with the filtered list of items in their current order, and an `InitialItemsOrder` holding the order
+    before these hooks. It should return the reordered list of items.
+
+    :param name: the name of the option value
+    :param strategy: the reordering function
+    :param description: a description of the strategy, for the help of `--with-reorder`
+    """
+    if name in (_NORMAL, _SKIP, _UNION):
+        raise ValueError("The %r reordering strategy can not be replaced" % name)
+    _OPTIONS[name] = description
+    _REORDERING_STRATEGIES[name] = strategy
+
+
+# the scopes of the fixtures that are setup once for several items, from broadest to narrowest, and the corresponding
+# node types (the session has no parent node)
+_REORDER_SCOPES = (("session", None), ("package", getattr(pytest, "Package", None)), ("module", pytest.Module),
+                   ("class", pytest.Class))
+
+
+def reorder_items_union_aware(items  # type: List[pytest.Item]
+                              ):
+    # type: (...) -> List[pytest.Item]
+    """
+    Returns a new list containing `items`, reordered so that the items sharing the same parameters for their
+    session-, package-, module- and class-scoped fixtures are contiguous. This minimizes the setup/teardown of these
+    fixtures. This is the `--with-reorder union` mode.
+
+    Contrary to pytest's `reorder_items`, the parameters are the effective ones (see `get_scoped_params`): a fixture
+    that is not used because another alternative of a union is active has the `NOT_USED` parameter. This is a
+    different parameter, since pytest would teardown the fixture to set it up with `NOT_USED`.
+
+    This is a stable sort on a composite key, with one part per scope from broadest to narrowest. For a given scope,
+    the items are grouped by scope node (package, module...) and combination of parameters of that scope, at the
+    position of the first item of the group. Items that do not have any parameter of that scope are not moved with
+    respect to the other items: only the consecutive ones are grouped together, so that they can be reordered
+    according to the narrower scopes.
+    """
+    first_index = dict()
+    # for each scope, the scope node and key of the current run of consecutive items without parameters of that scope
+    current_runs = dict()
+    keys = []
+    for i, item in enumerate(items):
+        callspec = getattr(item, "callspec", None)
+        scoped_params = get_scoped_params(callspec) if callspec is not None else dict()
+
+        item_key = []
+        for scope_name, node_type in _REORDER_SCOPES:
+            node = item.getparent(node_type) if node_type is not None else None
+            params = tuple(sorted(
+                (argname, NOT_USED if param is NOT_USED else callspec.indices.get(argname))
+                for argname, (param, _scope_name) in scoped_params.items() if _scope_name == scope_name
+            ))
+            if params:
+                # the index of the first item with the same parameters in the same scope node
+                item_key.append(first_index.setdefault((scope_name, node, params), i))
+                current_runs.pop(scope_name, None)
+            else:
+                # the index of the first item of the run of consecutive items without parameters, in the same node
+                run_node, run_key = current_runs.get(scope_name, (None, None))
+                if run_key is None or run_node is not node:
+                    run_key = i
+                    current_runs[scope_name] = node, run_key
+                item_key.append(run_key)
+        item_key.append(i)
+        keys.append(tuple(item_key))
+
+    return [item for _, item in sorted(zip(keys, items), key=lambda k_i: k_i[0])]
+
+
+_SCOPE_NODE_TYPES = dict(_REORDER_SCOPES)
+
+
+def _get_scope_node(item,       # type: pytest.Item
+                    scope_name  # type: str
+                    ):
+    """
+    Returns the node of `item` in which a fixture of scope `scope_name` is setup once, or None for the session. A
+    class-scoped fixture used outside of a class is setup once per module.
+    """
+    node_type = _SCOPE_NODE_TYPES.get(scope_name)
+    node = item.getparent(node_type) if node_type is not None else None
+    if node is None and scope_name == "class":
+        node = item.getparent(pytest.Module)
+    return node
+
+
+def deactivate_unused_fixtures(items  # type: List[pytest.Item]
+                               ):
+    # type: (...) -> Dict[Tuple[str, str, str], int]
+    """
+    Deactivates the non-parametrized fixtures with a scope broader than "function", that are used by no item in the
+    node where they would be setup (the session, a package, a module or a class). This happens for example when a
+    session-scoped fixture is only required by an alternative of a union, and all the corresponding items are
+    deselected or skipped. The fixture is explicitly marked as `NOT_USED` in the callspec of all these items, with its
+    own scope, so that it is setup once with `NOT_USED` (and not actually executed) instead of for real.
+
+    Only fixtures created with `pytest-cases` (`@fixture`, unions, ...) are deactivated, since they return `NOT_USED`
+    without executing the fixture function. Plain `@pytest.fixture` fixtures are always setup.
+
+    The decision is made per scope node and not per test function: this way all items of the node share the same
+    fixture cache key and the fixture is never torn down and setup again in between.
+
+    An item needs a fixture if it is not statically skipped (see `is_statically_skipped`), and the fixture is required
+    by the leaf of the item in its fixture closure tree. Items that were not generated from a union-aware fixture
+    closure tree are considered as needing all the fixtures of their closure.
+
+    :return: a dictionary {(fixture name, scope name, scope node id): number of items} for the deactivated fixtures.
+    """
+    # the fixtures that may be unused: in some closure tree, they are not required by all leaves
+    candidate_names = set()
+    for item in items:
+        fill_and_leaf = getattr(getattr(item, "callspec", None), _NOT_USED_FILL_ATTR, None)
+        if fill_and_leaf is not None:
+            candidate_names.update(fill_and_leaf[0].other_scoped)
+
+    report = OrderedDict()
+    if not candidate_names:
+        return report
+
+    needed = set()
+    unneeded = OrderedDict()
+    for item in items:
+        names = candidate_names.intersection(getattr(item, "fixturenames", ()))
+        if not names:
+            continue
+
+        callspec = getattr(item, "callspec", None)
+        fill_and_leaf = getattr(callspec, _NOT_USED_FILL_ATTR, None)
+        skipped = is_statically_skipped(item)
+        for fixture_name in names:
+            try:
+                fixdef = item._fixtureinfo.name2fixturedefs[fixture_name][-1]  # noqa
+            except (AttributeError, KeyError):
+                continue  # let pytest say "not found" later
+
+            key = fixture_name, _get_scope_node(item, fixdef.scope)
+            if skipped:
+                uses = False
+            elif fill_and_leaf is None or fixture_name not in fill_and_leaf[0].other_scoped:
+                # not generated by a tree where this fixture is optional: consider it used
+                uses = True
+            elif callspec.params.get(fixture_name, NOT_USED) is not NOT_USED:
+                uses = True
+            else:
+                uses = fill_and_leaf[1].requires(fixture_name)
+
+            if uses:
+                needed.add(key)
+            else:
+                unneeded.setdefault(key, []).append((item, fixdef))
+
+    for (fixture_name, node), items_and_fixdefs in unneeded.items():
+        if (fixture_name, node) in needed:
+            continue
+        for item, fixdef in items_and_fixdefs:
+            callspec = getattr(item, "callspec", None)
+            if callspec is not None:
+                callspec.params[fixture_name] = NOT_USED
+                callspec.indices[fixture_name] = 0
+                set_callspec_arg_scope_to_fixture(callspec, fixture_name, fixdef)
+        scope_name = items_and_fixdefs[0][1].scope
+        report[(fixture_name, scope_name, node.nodeid if node is not None else "")] = len(items_and_fixdefs)
+
+    return report
 
 
 @pytest.fixture
@@ -0,0 +1,58 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+CONFTEST = """
+import sys
+
+REQUESTED = []
+
+class RecordingFinder(object):
+    def find_spec(self, fullname, path, target=None):
+        REQUESTED.append(fullname)
+        return None
+
+sys.meta_path.insert(0, RecordingFinder())
+"""
+
+TEST_FILE = """
+from pytest_cases import parametrize_with_cases
+
+@parametrize_with_cases("x")
+def test_foo(x):
+    assert x == %r
+"""
+
+CASE_FILE = """
+def case_one():
+    return %r
+"""
+
+CHECK_FILE = """
+from conftest import REQUESTED
+
+def test_no_failed_import():
+    # only the existing cases modules were imported
+    assert [n for n in REQUESTED if "cases" in n] == ["test_a_cases", "cases_b", "test_c_cases"]
+"""
+
+
+def test_auto_cases_modules_index(pytester):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(test_a=TEST_FILE % 1, test_a_cases=CASE_FILE % 1,
+                        test_b=TEST_FILE % 2, cases_b=CASE_FILE % 2,
+                        test_check=CHECK_FILE)
+    # a directory that is not scanned: the imports are tried
+    pytester.mkdir("build")
+    pytester.makepyfile(**{"build/test_c": TEST_FILE % 3, "build/test_c_cases": CASE_FILE % 3})
+    result = pytester.runpytest("-p", "no:cacheprovider", "--cases-profile",
+                                "test_a.py", "test_b.py", "build/test_c.py", "test_check.py")
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines(["AUTO cases modules index: hits=2, misses=1"])
+
+
+def test_auto_cases_modules_index_missing(pytester):
+    pytester.makepyfile(test_d=TEST_FILE % 4)
+    result = pytester.runpytest("-p", "no:cacheprovider")
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*unable to import AUTO cases module 'test_d_cases' nor 'cases_d'*"])
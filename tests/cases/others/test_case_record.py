@@ -0,0 +1,54 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+import pytest
+
+from pytest_cases import case, set_case_id
+from pytest_cases.case_funcs import get_case_record
+from pytest_cases.case_parametrizer_new import extract_cases_from_class
+from pytest_cases.common_others import funcopy
+
+
+def test_case_record():
+    @case(tags="a", marks=pytest.mark.foo)
+    def case_hello():
+        return 1
+
+    record = get_case_record(case_hello)
+    assert get_case_record(case_hello) is record
+    assert record.get_id() == "hello"
+    assert record.get_id("case_h") == "ello"
+    assert record.tags == ("a",)
+    assert [m.name for m in record.marks] == ["foo"]
+    assert record.first_line == case_hello.__code__.co_firstlineno
+    assert not record.in_class and record.true_case_func is case_hello
+    assert not record.is_parametrized and not record.requires_fixtures
+
+    # a copy does not reuse the record
+    assert get_case_record(funcopy(case_hello)) is not record
+
+    # changing the case information or the marks invalidates the record
+    set_case_id("hi", case_hello)
+    record2 = get_case_record(case_hello)
+    assert record2 is not record and record2.get_id() == "hi"
+
+    pytest.mark.usefixtures("foo")(case_hello)
+    record3 = get_case_record(case_hello)
+    assert record3 is not record2
+    assert record3.requires_fixtures and record3.fixturenames_not_in_sig == ("foo",)
+
+
+class CasesFoo:
+    @pytest.mark.parametrize("a", [1, 2])
+    def case_bar(self, a, request):
+        return a
+
+
+def test_case_record_in_class():
+    case_bar, = extract_cases_from_class(CasesFoo)
+    record = get_case_record(case_bar)
+    assert record.in_class and record.true_case_func is CasesFoo.case_bar
+    assert record.host is CasesFoo
+    assert record.first_line == CasesFoo.case_bar.__code__.co_firstlineno
+    assert record.is_parametrized and record.requires_fixtures and record.fixturenames_not_in_sig == ()
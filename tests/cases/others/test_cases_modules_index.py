@@ -0,0 +1,178 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+import types
+
+from pytest_cases.case_parametrizer_new import CasesModulesIndex
+from pytest_cases.filters import compile_filter_plan
+
+
+def test_cases_modules_index():
+    module = types.ModuleType("my_cases")
+    exec("def case_a():\n    return 1\n\ndef case_b():\n    return 2\n", vars(module))
+    index = CasesModulesIndex()
+
+    cases = index.get_cases(module, "case_")
+    assert [c.__name__ for c in cases] == ["case_a", "case_b"]
+    assert index.get_cases(module, "case_") is cases
+    assert index.get_stats() == dict(hits=1, misses=1)
+
+    # another prefix is another entry
+    assert index.get_cases(module, "data_") == []
+    assert index.get_stats() == dict(hits=1, misses=2)
+
+    # a new case in the module
+    exec("\n" * 10 + "def case_c():\n    return 3\n", vars(module))
+    assert [c.__name__ for c in index.get_cases(module, "case_")] == ["case_a", "case_b", "case_c"]
+    assert index.get_stats() == dict(hits=1, misses=3)
+
+    # a new module object with the same name
+    module2 = types.ModuleType("my_cases")
+    exec("def case_d():\n    return 4\n", vars(module2))
+    assert [c.__name__ for c in index.get_cases(module2, "case_")] == ["case_d"]
+
+    # a module being imported is not cached
+    class Spec(object):
+        _initializing = True
+
+    module2.__spec__ = Spec()
+    index.get_cases(module2, "case_")
+    assert ("my_cases", "case_") not in index.entries
+
+
+TEST_FILE = """
+from pytest_cases import parametrize_with_cases
+
+@parametrize_with_cases("x")
+def test_foo(x):
+    pass
+
+@parametrize_with_cases("x")
+def test_bar(x):
+    pass
+
+@parametrize_with_cases("x", prefix="data_")
+def test_baz(x):
+    pass
+"""
+
+CASES_FILE = """
+def case_a():
+    return 1
+
+class CaseB:
+    def case_b(self):
+        return 2
+
+def data_c():
+    return 3
+"""
+
+
+def test_cases_modules_index_profile(pytester):
+    pytester.makepyfile(test_index=TEST_FILE, test_index_cases=CASES_FILE)
+    result = pytester.runpytest("-v", "--cases-profile")
+    result.assert_outcomes(passed=5)
+    result.stdout.fnmatch_lines(["cases modules index: hits=1, misses=2"])
+
+
+def test_cases_modules_index_tags():
+    module = types.ModuleType("my_tagged_cases")
+    exec("from pytest_cases import case\n\n"
+         "@case(tags=('a', 'b'))\ndef case_ab():\n    return 1\n\n"
+         "@case(tags='a')\ndef case_a():\n    return 2\n\n"
+         "def case_none():\n    return 3\n\n"
+         "@case(tags=('b', 'a'))\ndef case_ba():\n    return 4\n", vars(module))
+    table = CasesModulesIndex().get_entry(module, "case_").table
+
+    def names(has_tag=None):
+        return [c.__name__ for c in table.select(compile_filter_plan(has_tag=has_tag))]
+
+    assert names() == ["case_ab", "case_a", "case_none", "case_ba"]
+    # the order of the module is preserved
+    assert names("a") == ["case_ab", "case_a", "case_ba"]
+    assert names(["b", "a"]) == ["case_ab", "case_ba"]
+    assert names(("a", "c")) == []
+    assert sorted(table.get_tags_index()) == ["a", "b"]
+
+
+def test_cases_modules_index_unhashable_tags():
+    module = types.ModuleType("my_unhashable_cases")
+    exec("from pytest_cases import case\n\n"
+         "@case(tags=(['x'], 'a'))\ndef case_x():\n    return 1\n\n"
+         "@case(tags='a')\ndef case_a():\n    return 2\n", vars(module))
+    table = CasesModulesIndex().get_entry(module, "case_").table
+
+    # the index can not be built: cases are filtered one by one
+    assert table.get_tags_index() is None
+    assert [c.__name__ for c in table.select(compile_filter_plan(has_tag="a"))] == ["case_x", "case_a"]
+    assert [c.__name__ for c in table.select(compile_filter_plan(has_tag=[["x"]]))] == ["case_x"]
+
+
+TAGS_TEST_FILE = """
+from pytest_cases import parametrize_with_cases, case
+
+@case(tags="fast")
+def case_a():
+    return 1
+
+@case(tags=("fast", "big"))
+def case_b():
+    return 2
+
+def case_c():
+    return 3
+
+@parametrize_with_cases("x", cases=".", has_tag="fast")
+def test_fast(x):
+    assert x in (1, 2)
+
+@parametrize_with_cases("x", cases=".", has_tag=["big", "fast"], filter=lambda c: True)
+def test_fast_big(x):
+    assert x == 2
+
+@parametrize_with_cases("x", cases=".", filter=lambda c: c.__name__ != "case_b")
+def test_filter(x):
+    assert x != 2
+"""
+
+
+def test_cases_modules_index_has_tag(pytester):
+    pytester.makepyfile(TAGS_TEST_FILE)
+    result = pytester.runpytest("-v")
+    result.assert_outcomes(passed=5)
+    result.stdout.re_match_lines([r".*::test_fast\[a\] PASSED.*", r".*::test_fast\[b\] PASSED.*",
+                                  r".*::test_fast_big\[b\] PASSED.*"])
+
+
+STATEFUL_TEST_FILE = """
+from pytest_cases import parametrize_with_cases
+
+@parametrize_with_cases("x", filter=%s)
+def test_%s(x):
+    assert x == 1
+"""
+
+STATEFUL_CASES_FILE = """
+class CasesA:
+    state = 0
+
+    def case_one(self):
+        self.state += 1
+        return self.state
+
+    @staticmethod
+    def case_two():
+        return 1
+"""
+
+
+def test_cases_modules_index_class_instances(pytester):
+    """Each @parametrize_with_cases uses its own instances of the case classes, even if the module is indexed"""
+    pytester.makepyfile(test_stateful=(STATEFUL_TEST_FILE % ("None", "a")) + (STATEFUL_TEST_FILE % ("None", "b"))
+                        + (STATEFUL_TEST_FILE % ("lambda c: True", "c")),
+                        test_stateful_cases=STATEFUL_CASES_FILE)
+    result = pytester.runpytest("--cases-profile")
+    result.assert_outcomes(passed=6)
+    result.stdout.fnmatch_lines(["cases modules index: hits=2, misses=1"])
@@ -0,0 +1,95 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+from pytest_cases import case, filters
+from pytest_cases.filters import CasesTable, AndPlan, OrPlan, NotPlan, HasTagsPlan, IdPlan, CallablePlan, \
+    compile_filter_plan
+
+
+@case(tags=("a",), id="tom")
+def case_one():
+    return 1
+
+
+@case(tags=("a", "b"), id="tim")
+def case_two():
+    return 2
+
+
+@case(tags=("b", "c"), id="toni")
+def case_three():
+    return 3
+
+
+@case(tags=("a", "c"))
+def case_dom():
+    return 4
+
+
+def case_bob():
+    return 5
+
+
+CASES = [case_one, case_two, case_three, case_dom, case_bob]
+
+
+def test_filter_plan_compilation():
+    f = (filters.has_tag("a") | ~filters.id_has_prefix("t")) & filters.has_tags("b", "c") & (lambda c: True)
+    assert isinstance(f.plan, AndPlan)
+    # nested "and" are flattened, and callables are evaluated last
+    assert [type(p) for p in f.plan.plans] == [OrPlan, HasTagsPlan, CallablePlan]
+    assert isinstance(f.plan.plans[0].plans[1], NotPlan)
+    assert f.plan.plans[0].is_indexed and not f.plan.is_indexed
+    assert isinstance(filters.id_match_regex("t.*").plan, IdPlan)
+
+    assert compile_filter_plan() is None
+    assert isinstance(compile_filter_plan(has_tag="a"), HasTagsPlan)
+    assert isinstance(compile_filter_plan(has_tag="a", glob="t*"), AndPlan)
+
+
+def test_filter_plan_same_as_per_case():
+    """Selecting on a table gives the same results than calling the filter on each case"""
+    custom = filters.CaseFilter(lambda c: c() % 2 == 1)
+    for f in (filters.has_tag("a"),
+              ~filters.has_tag("b"),
+              filters.has_tag("b") & filters.has_tag("c"),
+              filters.has_tag("b") | filters.id_has_suffix("m"),
+              ~(filters.id_has_prefix("t") | filters.has_tags("a", "c")),
+              filters.id_match_regex("t[io]") & ~custom,
+              custom | filters.has_tag("c"),
+              (lambda c: c() > 2) & filters.has_tag("c"),
+              ):
+        assert CasesTable(CASES).select(f.plan) == [c for c in CASES if f(c)]
+
+
+def test_filter_plan_pushdown():
+    called = []
+
+    def custom(c):
+        called.append(c)
+        return True
+
+    table = CasesTable(CASES)
+    f = filters.CaseFilter(custom) & filters.has_tag("a") & ~filters.id_has_prefix("tim")
+    assert table.select(f.plan) == [case_one, case_dom]
+    # the callable is only evaluated on the cases selected by the indexed predicates
+    assert called == [case_one, case_dom]
+
+    # callables are not evaluated on cases already selected by an "or"
+    del called[:]
+    assert table.select((filters.has_tag("b") | custom).plan) == CASES
+    assert called == [case_one, case_dom, case_bob]
+
+    # id predicates are evaluated once per table
+    assert (IdPlan, "prefix", "tim") in table._positions
+
+
+def test_filter_plan_errors():
+    """An error raised by a callable leads to a no-match, even below a 'not'"""
+    def custom(c):
+        if c is case_two:
+            raise ValueError()
+        return False
+
+    assert CasesTable(CASES).select((~filters.CaseFilter(custom)).plan) == [case_one, case_three, case_dom, case_bob]
@@ -98,3 +98,44 @@ def test_super_closure_edits2():
     super_closure.insert(0, 'titi')
     reflist.insert(0, 'titi')
     assert list(super_closure) == reflist
+
+
+def test_super_closure_list_facade(request, b):
+    super_closure = copy(request._pyfuncitem._fixtureinfo.names_closure)
+    reflist = list(super_closure)
+    for i, f in enumerate(reflist):
+        assert super_closure[i] == f
+        assert super_closure.index(f) == i
+        assert f in super_closure
+        assert super_closure.count(f) == 1
+    assert super_closure[1:-1] == reflist[1:-1]
+    assert 'unknown' not in super_closure
+    with pytest.raises(ValueError):
+        super_closure.index('unknown')
+    with pytest.raises(ValueError):
+        super_closure.index(reflist[0], 1)
+
+    # the facade is updated after a modification
+    super_closure.remove('request')
+    reflist.remove('request')
+    assert list(super_closure) == reflist
+    assert 'request' not in super_closure
+    assert super_closure.index(reflist[-1]) == len(reflist) - 1
+
+
+def test_super_closure_shared_subtrees(request, b):
+    super_closure = request._pyfuncitem._fixtureinfo.names_closure
+    tree = super_closure.tree
+    split_node = tree
+    while not split_node.has_split():
+        split_node = split_node.children[0]
+
+    # both alternatives are the same fixture: the subtree is built once
+    assert len(split_node.children) == 2
+    assert split_node.children[0] is split_node.children[1]
+    assert super_closure.nb_alternative_closures == 2
+
+    # sharing is preserved in copies
+    tree_copy = tree.copy()
+    assert tree_copy.children[0] is tree_copy.children[1]
+    assert tree_copy.children[0] is not split_node.children[0]
@@ -0,0 +1,54 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+from copy import copy
+
+from pytest_cases import fixture, fixture_union
+from pytest_cases.plugin import SuperClosure, get_closure_memo
+
+
+@fixture
+def memo_a():
+    return 1
+
+
+@fixture
+def memo_b():
+    return 2
+
+
+memo_u = fixture_union('memo_u', [memo_a, memo_b])
+
+
+trees = []
+
+
+class TestClosureMemo:
+    def test_foo(self, memo_u, request):
+        trees.append(request._pyfuncitem._fixtureinfo.names_closure.tree)
+
+    def test_bar(self, memo_u, request):
+        trees.append(request._pyfuncitem._fixtureinfo.names_closure.tree)
+
+
+def test_synthesis(request):
+    # both test functions in the class share the same closure tree
+    assert len(trees) == 4
+    assert all(t is trees[0] for t in trees)
+    assert get_closure_memo(request.session._fixturemanager).hits > 0
+
+
+def test_copy_on_write(memo_u, request):
+    super_closure = request._pyfuncitem._fixtureinfo.names_closure
+    assert isinstance(super_closure, SuperClosure)
+    ref = list(super_closure)
+
+    other = copy(super_closure)
+    assert other.tree is super_closure.tree
+
+    # modifying the copy does not modify the original
+    other.remove('request')
+    assert other.tree is not super_closure.tree
+    assert 'request' not in list(other)
+    assert list(super_closure) == ref
@@ -0,0 +1,102 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+CACHED_TEST_FILE = """
+import pytest
+from pytest_cases import param_fixture, fixture_union, fixture, NOT_USED
+
+a = param_fixture("a", [1, 2])
+
+@fixture
+def b():
+    return "b"
+
+u = fixture_union("u", [a, b])
+
+@pytest.mark.parametrize("x", [10, 20])
+def test_foo(x, u, request):
+    assert (u == "b") == (request.node.callspec.params["a"] is NOT_USED)
+
+@pytest.mark.parametrize("x", [10, 20])
+def test_bar(x, u, request):
+    assert (u == "b") == (request.node.callspec.params["a"] is NOT_USED)
+
+@pytest.mark.parametrize("x", [10, 20])
+def test_baz(x, u, request):
+    assert (u == "b") == (request.node.callspec.params["a"] is NOT_USED)
+
+@pytest.mark.parametrize("x", [10, 30])
+def test_other(x, u):
+    pass
+"""
+
+
+def test_calls_templates_cache(pytester):
+    """Test functions with the same closure and equivalent parametrization share the same calls"""
+    pytester.makepyfile(CACHED_TEST_FILE)
+    result = pytester.runpytest("-v", "--cases-profile")
+    result.assert_outcomes(passed=24)
+    # the calls are stored when test_bar has the same parametrization as test_foo, test_baz reuses them.
+    # test_other is parametrized with other values
+    result.stdout.fnmatch_lines(["calls templates cache: hits=1, misses=3, calls=6"])
+    for test_name in ("test_foo", "test_bar", "test_baz"):
+        result.stdout.re_match_lines([r".*::%s\[%s\] PASSED.*" % (test_name, test_id)
+                                      for test_id in ("10-/a-1", "10-/a-2", "10-/b", "20-/a-1", "20-/a-2", "20-/b")])
+    result.stdout.re_match_lines([r".*::test_other\[%s\] PASSED.*" % test_id
+                                  for test_id in ("10-/a-1", "10-/a-2", "10-/b", "30-/a-1", "30-/a-2", "30-/b")])
+
+
+CASES_TEST_FILE = """
+import pytest
+from pytest_cases import param_fixture, fixture_union, fixture, parametrize_with_cases
+
+a = param_fixture("a", [1, 2])
+
+@fixture
+def b():
+    return "b"
+
+u = fixture_union("u", [a, b])
+
+@pytest.mark.foo
+def case_one():
+    return 1
+
+def case_two():
+    return 2
+
+@parametrize_with_cases("v", cases=".")
+def test_foo(v, u, current_cases):
+    assert current_cases["v"].func() == v
+
+@parametrize_with_cases("v", cases=".")
+def test_bar(v, u, current_cases):
+    assert current_cases["v"].func() == v
+
+@parametrize_with_cases("v", cases=".")
+def test_baz(v, u, current_cases):
+    assert current_cases["v"].func() == v
+"""
+
+
+def test_calls_templates_cache_cases(pytester):
+    """Test functions decorated with identical @parametrize_with_cases share the same calls"""
+    pytester.makepyfile(CASES_TEST_FILE)
+    result = pytester.runpytest("-v", "--cases-profile", "-W", "ignore::pytest.PytestUnknownMarkWarning")
+    result.assert_outcomes(passed=18)
+    result.stdout.fnmatch_lines(["calls templates cache: hits=1, misses=2, calls=6"])
+    result.stdout.re_match_lines([r".*::test_baz\[%s\] PASSED.*" % test_id
+                                  for test_id in ("one-/a-1", "one-/a-2", "one-/b", "two-/a-1", "two-/a-2", "two-/b")])
+
+
+def test_calls_templates_cache_size(pytester):
+    """Calls are not stored when the cache is full"""
+    pytester.makeconftest("""
+from pytest_cases import plugin
+plugin._CALL_TEMPLATES_MAX_TOTAL_CALLS = 5
+""")
+    pytester.makepyfile(CACHED_TEST_FILE)
+    result = pytester.runpytest("--cases-profile")
+    result.assert_outcomes(passed=24)
+    result.stdout.fnmatch_lines(["calls templates cache: hits=0, misses=4, calls=0"])
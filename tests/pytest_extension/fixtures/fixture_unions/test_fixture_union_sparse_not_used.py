@@ -0,0 +1,45 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+
+CONFTEST = """
+def pytest_collection_modifyitems(config, items):
+    # remember the callspec parameters as they are after collection
+    config._collected_params = {item.name: dict(item.callspec.params) for item in items}
+"""
+
+TEST_FILE = """
+from pytest_cases import fixture, param_fixture, fixture_union, NOT_USED
+
+a = param_fixture("a", [1, 2])
+
+@fixture
+def b():
+    return "b"
+
+u = fixture_union("u", [a, b])
+
+def test_foo(u, request):
+    collected = request.config._collected_params[request.node.name]
+    params = request.node.callspec.params
+    if u == "b":
+        # 'a' is not used: this is only known at setup time
+        assert "a" not in collected
+        assert params["a"] is NOT_USED
+        # 'b' is used: nothing is stored
+        assert "b" not in params
+    else:
+        assert collected["a"] == u
+        # 'b' is not used
+        assert "b" not in collected
+        assert params["b"] is NOT_USED
+"""
+
+
+def test_sparse_not_used(pytester):
+    """Parameters of unused fixtures are not stored in the callspecs during collection, but filled at setup time"""
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(TEST_FILE)
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=3)
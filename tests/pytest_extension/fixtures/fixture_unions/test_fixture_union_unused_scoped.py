@@ -0,0 +1,68 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+import pytest
+
+TEST_FILE = """
+import pytest
+from pytest_cases import fixture, fixture_union
+
+SETUPS = []
+PLAIN_SETUPS = []
+
+@fixture(scope="session")
+def db():
+    SETUPS.append("db")
+    return "db"
+
+@fixture
+def db_user(db):
+    return "user of " + db
+
+@pytest.fixture(scope="session")
+def plain():
+    PLAIN_SETUPS.append("plain")
+    return "plain"
+
+@fixture
+def b():
+    return "b"
+
+u = fixture_union("u", [db_user, plain, b])
+
+def test_foo(u):
+    pass
+
+@pytest.mark.skip(reason="not now")
+def test_bar(db):
+    pass
+
+def test_synthesis(request):
+    expected = request.config.getoption("--expected-setups")
+    assert SETUPS == ([] if expected == "none" else ["db"])
+    # a plain pytest fixture does not handle NOT_USED: it can not be deactivated
+    assert PLAIN_SETUPS == ["plain"]
+"""
+
+CONFTEST = """
+def pytest_addoption(parser):
+    parser.addoption("--expected-setups", default="db")
+"""
+
+
+@pytest.mark.parametrize("deselect", [False, True], ids="deselect={}".format)
+def test_unused_session_fixture(pytester, deselect):
+    """A session fixture only needed by a deselected union alternative and a skipped test is never setup"""
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(TEST_FILE)
+    if deselect:
+        result = pytester.runpytest("-k", "not db_user and not plain", "--expected-setups=none", "--cases-profile")
+        result.assert_outcomes(passed=2, skipped=1, deselected=2)
+        result.stdout.fnmatch_lines(["unused fixtures deactivated: 1",
+                                     "  db (session-scoped, in <session>): 2 items"])
+        result.stdout.no_fnmatch_line("*plain (session-scoped*")
+    else:
+        result = pytester.runpytest("--cases-profile")
+        result.assert_outcomes(passed=4, skipped=1)
+        result.stdout.fnmatch_lines(["unused fixtures deactivated: 0"])
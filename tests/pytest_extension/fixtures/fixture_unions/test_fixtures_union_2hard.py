@@ -80,3 +80,31 @@ The fixture tree is :
         ref_str = ref_str.replace("['environment',", "['event_loop_policy', 'environment',")
 
     assert str(super_closure) == ref_str
+
+
+def test_super_closure_requirement_sets():
+    global super_closure
+
+    tree = super_closure.tree
+    assert tree.get_not_always_used() == ['b', 'b']
+
+    # the requirement sets are consistent with the lists
+    all_names = set(super_closure)
+    nodes = [tree]
+    while nodes:
+        n = nodes.pop()
+        nodes += n.children
+        for f in all_names:
+            assert n.requires(f) == (f in n.gather_all_required())
+
+
+def test_super_closure_alternatives():
+    global super_closure
+
+    assert super_closure.nb_alternative_closures == 4
+    alternatives = super_closure.tree.gen_alternatives()
+    assert not isinstance(alternatives, list)
+    filters, names = next(alternatives)
+    assert list(filters.items()) == [('c', (0, 'a')), ('d', (0, 'b'))]
+    assert names == [n for n in super_closure if n != 'b'] + ['b']
+    assert len(list(alternatives)) == 3
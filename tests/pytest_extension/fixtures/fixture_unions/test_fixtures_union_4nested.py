@@ -0,0 +1,34 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+from pytest_cases import param_fixture, fixture_union
+
+p = param_fixture('p', [1, 2])
+
+a = param_fixture('a', ['x', 'y'])
+b = param_fixture('b', ['z'])
+u1 = fixture_union('u1', [a, b])
+
+c = param_fixture('c', [3, 4])
+u2 = fixture_union('u2', [u1, c])
+
+
+def test_nested_unions(p, u2):
+    print(p, u2)
+
+
+def test_synthesis(module_results_dct):
+    # each alternative subtree is processed once for all calls, but the order is the same than if it was per call
+    assert list(module_results_dct) == [
+        "test_nested_unions[1-/u1-/a-x]",
+        "test_nested_unions[1-/u1-/a-y]",
+        "test_nested_unions[1-/u1-/b-z]",
+        "test_nested_unions[1-/c-3]",
+        "test_nested_unions[1-/c-4]",
+        "test_nested_unions[2-/u1-/a-x]",
+        "test_nested_unions[2-/u1-/a-y]",
+        "test_nested_unions[2-/u1-/b-z]",
+        "test_nested_unions[2-/c-3]",
+        "test_nested_unions[2-/c-4]",
+    ]
@@ -0,0 +1,37 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+from pytest_cases import fixture, fixture_union
+from pytest_cases.fixture_core1_unions import _UNION_FIXTURE_NAMES
+
+
+@fixture
+def a():
+    return
+
+
+@fixture
+def b():
+    return
+
+
+@fixture
+def c(b):
+    return
+
+
+closure_no_union_u = fixture_union('closure_no_union_u', [a, b])
+
+
+def test_closure_no_union(request, c, a):
+    closure = request._pyfuncitem._fixtureinfo.names_closure
+    assert isinstance(closure, list)
+    # dependencies are prepended, as when there are unions
+    assert closure.index('b') == closure.index('c') + 1
+    assert closure.index('a') == closure.index('b') + 1
+
+
+def test_union_names_registry():
+    assert 'closure_no_union_u' in _UNION_FIXTURE_NAMES
+    assert 'test_closure_no_union' not in _UNION_FIXTURE_NAMES
@@ -0,0 +1,46 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+from pytest_cases.plugin import SessionFixtureDefsCache, get_session_fixture_defs_cache
+
+
+class FakeFixtureManager(object):
+    def __init__(self):
+        self._arg2fixturedefs = dict()
+
+    def getfixturedefs(self, argname, node):
+        defs = self._arg2fixturedefs.get(argname, None)
+        return tuple(defs) if defs else None
+
+
+class FakeNode(object):
+    nodeid = "test_foo.py::test_a"
+
+
+def test_fixture_defs_cache_invalidation():
+    fm = FakeFixtureManager()
+    cache = get_session_fixture_defs_cache(fm)
+    assert isinstance(cache, SessionFixtureDefsCache)
+    assert get_session_fixture_defs_cache(fm) is cache
+
+    node = FakeNode()
+    assert cache.get_fixture_defs('a', node, "test_foo.py") is None
+    assert cache.get_fixture_defs('a', node, "test_foo.py") is None
+    assert cache.get_stats() == dict(hits=1, misses=1, invalidations=0)
+
+    # a new definition is registered: the entry is invalidated
+    fm._arg2fixturedefs['a'] = ['def1']
+    assert cache.get_fixture_defs('a', node, "test_foo.py") == ('def1',)
+    assert cache.get_fixture_defs('a', node, "test_foo.py") == ('def1',)
+    assert cache.get_stats() == dict(hits=2, misses=1, invalidations=1)
+
+    # another visibility scope has its own entry
+    assert cache.get_fixture_defs('a', node, "test_bar.py") == ('def1',)
+    assert cache.get_stats() == dict(hits=2, misses=2, invalidations=1)
+
+
+def test_fixture_defs_cache_shared(request):
+    cache = get_session_fixture_defs_cache(request.session._fixturemanager)
+    # all test functions in this module share the same entries
+    assert cache.hits > 0
@@ -0,0 +1,42 @@
+# META
+# {'passed': 11, 'skipped': 0, 'failed': 0}
+# END META
+from pytest_cases import fixture, fixture_union, parametrize
+
+
+def test_config(request):
+    assert request.session.config.getoption('with_reorder') == 'normal'
+
+
+@fixture(scope="module")
+@parametrize(i=[1, 2])
+def a(i):
+    return i
+
+
+@fixture
+def b():
+    return "b"
+
+
+u = fixture_union("u", [a, b])
+
+
+@parametrize(x=[1, 2, 3])
+def test_foo(u, x):
+    pass
+
+
+def test_synthesis(module_results_dct):
+    # the "NOT_USED" parameter of the module-scoped fixture 'a' is in the callspecs during collection, so that pytest
+    # reorders the '/b' items (where 'a' is NOT_USED) as if it were a third parameter of 'a'.
+    assert list(module_results_dct) == ['test_config',
+                                        'test_foo[/a-i=1-x=1]',
+                                        'test_foo[/a-i=1-x=2]',
+                                        'test_foo[/a-i=1-x=3]',
+                                        'test_foo[/b-x=1]',
+                                        'test_foo[/b-x=2]',
+                                        'test_foo[/b-x=3]',
+                                        'test_foo[/a-i=2-x=1]',
+                                        'test_foo[/a-i=2-x=2]',
+                                        'test_foo[/a-i=2-x=3]']
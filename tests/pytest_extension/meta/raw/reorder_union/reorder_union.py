@@ -0,0 +1,51 @@
+# META
+# {'passed': 12, 'skipped': 0, 'failed': 0}
+# END META
+from pytest_cases import fixture, fixture_union, parametrize
+
+SETUPS = []
+
+
+def test_config(request):
+    assert request.session.config.getoption('with_reorder') == 'union'
+
+
+@fixture(scope="module", params=[1, 2])
+def db(request):
+    SETUPS.append("db-%s" % request.param)
+    yield request.param
+
+
+@fixture(scope="module", params=["a", "b"])
+def cache(request):
+    SETUPS.append("cache-%s" % request.param)
+    yield request.param
+
+
+@fixture
+def light():
+    return "light"
+
+
+u = fixture_union("u", [db, cache, light])
+
+
+@parametrize("x", [1, 2])
+def test_foo(x, u):
+    pass
+
+
+def test_synthesis(module_results_dct):
+    # each module fixture is setup once per parameter: the items using the same parameter are contiguous
+    assert SETUPS == ["db-1", "db-2", "cache-a", "cache-b"]
+    assert list(module_results_dct) == ['test_config',
+                                        'test_foo[1-/db-1]',
+                                        'test_foo[2-/db-1]',
+                                        'test_foo[1-/db-2]',
+                                        'test_foo[2-/db-2]',
+                                        'test_foo[1-/cache-a]',
+                                        'test_foo[2-/cache-a]',
+                                        'test_foo[1-/cache-b]',
+                                        'test_foo[2-/cache-b]',
+                                        'test_foo[1-/light]',
+                                        'test_foo[2-/light]']
@@ -0,0 +1,33 @@
+# META
+# {'passed': 6, 'skipped': 0, 'failed': 0}
+# END META
+import pytest
+
+from pytest_cases import fixture, fixture_union, parametrize, fixture_ref
+
+
+def test_config(request):
+    assert request.session.config.getoption('cases_verify_closure')
+
+
+@fixture
+@parametrize(i=[1, 2])
+def a(i):
+    return i
+
+
+@fixture
+def b():
+    return 0
+
+
+u = fixture_union('u', [a, b])
+
+
+def test_union(u):
+    pass
+
+
+@parametrize(v=[fixture_ref(b), 3])
+def test_plain(v, request):
+    assert request is not None
@@ -0,0 +1,142 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+import json
+import tracemalloc
+
+from pytest_cases.common_tracing import trace_span, is_tracing, start_tracing, stop_tracing, ChromeTracer, \
+    MemoryProfiler, trace_new
+
+
+def test_trace_span_disabled():
+    assert not is_tracing()
+    with trace_span("foo", "bar", a=1) as span:
+        span.set(b=2)
+    # the no-op span is shared
+    assert trace_span("foo", "bar") is span
+
+
+def test_chrome_tracer(tmpdir):
+    tracer = ChromeTracer()
+    start_tracing(tracer)
+    try:
+        with trace_span("outer", "test", target=test_chrome_tracer):
+            with trace_span("inner", "test") as span:
+                span.set(nb=3)
+    finally:
+        stop_tracing(tracer)
+
+    with trace_span("ignored", "test"):
+        pass
+
+    path = str(tmpdir.join("trace.json"))
+    tracer.write(path)
+    with open(path) as f:
+        trace = json.load(f)
+
+    events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in events] == ["inner", "outer"]
+    inner, outer = events
+    assert inner["args"] == {"nb": 3}
+    assert outer["args"] == {"target": "test_chrome_tracer"}
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+TRACED_TEST_FILE = """
+from pytest_cases import parametrize_with_cases, fixture, fixture_union
+
+def case_a():
+    return 1
+
+def case_b(request):
+    return 2
+
+@parametrize_with_cases("x", cases=".")
+def test_foo(x):
+    pass
+
+@fixture
+def f1():
+    return 1
+
+@fixture
+def f2():
+    return 2
+
+u = fixture_union("u", [f1, f2])
+
+def test_bar(u):
+    pass
+"""
+
+
+def test_collection_trace_option(pytester):
+    pytester.makepyfile(TRACED_TEST_FILE)
+    result = pytester.runpytest("--cases-trace=trace.json")
+    result.assert_outcomes(passed=4)
+    assert not is_tracing()
+
+    with open(str(pytester.path / "trace.json")) as f:
+        trace = json.load(f)
+
+    names = {e["name"] for e in trace["traceEvents"] if e["ph"] == "X"}
+    assert {"get_all_cases", "case_to_argvalues", "create_super_closure", "test_foo", "test_bar",
+            "create_call_list_from_pending_parametrizations", "_cleanup_calls_list"} <= names
+
+
+def test_collection_profile_option(pytester):
+    pytester.makepyfile(TRACED_TEST_FILE)
+    result = pytester.runpytest("--collect-only", "--cases-profile", "--cases-profile-top=0")
+    assert not is_tracing()
+
+    # test_foo: one case fixture for case_b, one "param" fixture for case_a and one union fixture
+    result.stdout.re_match_lines([r".*pytest-cases collection profile \(top 2 of 2\).*"])
+    result.stdout.re_match_lines([r" *total ms .* function$"])
+    result.stdout.re_match_lines([r"(\s+\d+\.\d+){6}\s+3\s+1\s+2  test_collection_profile_option::test_foo$"])
+    result.stdout.re_match_lines([r"(\s+\d+\.\d+){6}\s+0\s+1\s+2  test_collection_profile_option::test_bar$"])
+    result.stdout.fnmatch_lines(["fixture definitions cache: hits=*", "fixture closures memo: hits=*"])
+
+
+def test_memory_profiler():
+    tracemalloc.start()
+    profiler = MemoryProfiler()
+    start_tracing(profiler)
+    try:
+        with trace_span("outer", "test", module="my_module"):
+            with trace_span("inner", "test", target=test_memory_profiler):
+                trace_new("LazyValue", 2)
+                data = [object() for _ in range(1000)]
+            outer_data = [object() for _ in range(1000)]
+    finally:
+        stop_tracing(profiler)
+        profiler.stop()
+        tracemalloc.stop()
+
+    inner, outer = profiler.apis["inner"], profiler.apis["outer"]
+    assert inner.objects == {"LazyValue": 2} and outer.objects == {}
+    # the memory of the inner span is not counted in the outer span
+    assert inner.nb_bytes >= 16 * len(data) and outer.nb_bytes >= 16 * len(outer_data)
+    assert outer.nb_bytes < inner.nb_bytes + 16 * len(outer_data)
+
+    # inner is attributed to the module of its target
+    modules = profiler.modules
+    assert set(modules) == {"my_module", __name__}
+    assert modules[__name__].nb_bytes == inner.nb_bytes
+    assert modules["my_module"].nb_bytes == outer.nb_bytes
+
+
+def test_collection_memory_report_option(pytester):
+    pytester.makepyfile(TRACED_TEST_FILE)
+    result = pytester.runpytest("--collect-only", "--cases-memory-report")
+    assert not is_tracing()
+    assert not tracemalloc.is_tracing()
+
+    result.stdout.re_match_lines([r".*pytest-cases collection memory report.*",
+                                  r"traced memory: .* KiB allocated during collection, .* KiB in pytest-cases spans"])
+    # test_foo: 1 lazy value for case_a, 1 case fixture for case_b, and the union created by @parametrize.
+    # test_bar: the union fixture
+    result.stdout.re_match_lines([r" +\S+ +2 +0 +1 +0 +0 +0  case_to_argvalues$"])
+    result.stdout.re_match_lines([r" +\S+ +1 +1 +0 +0 +0 +0  get_or_create_case_fixture$"])
+    result.stdout.re_match_lines([r" +\S+ +2 +2 +0 +0 +0 +0  _fixture_union$"])
+    result.stdout.re_match_lines([r" +\S+ +\d+ +6 +1 +2 +0 +4  test_collection_memory_report_option$"])
@@ -0,0 +1,71 @@
+# Authors: Sylvain MARIE <sylvain.marie@se.com>
+#          + All contributors to <https://github.com/smarie/python-pytest-cases>
+#
+# License: 3-clause BSD, <https://github.com/smarie/python-pytest-cases/blob/master/LICENSE>
+import pytest
+
+from pytest_cases.plugin import InitialItemsOrder
+
+
+class Item(object):
+    """Items with the same nodeid, to make sure that they are indexed by identity"""
+    nodeid = "same"
+
+    def __hash__(self):
+        return hash(self.nodeid)
+
+    def __eq__(self, other):
+        return self.nodeid == other.nodeid
+
+
+def test_initial_items_order():
+    items = [Item() for _ in range(5)]
+    initial_order = InitialItemsOrder(items)
+    assert initial_order.position(items[3]) == 3
+
+    # filtered and reordered
+    current = [items[4], items[0], items[2]]
+    assert initial_order.restore(current) == current
+    assert [initial_order.position(i) for i in initial_order.restore(current)] == [0, 2, 4]
+
+
+CONFTEST = """
+from pytest_cases.plugin import register_reordering_strategy
+
+def reverse_initial_order(items, initial_order):
+    return initial_order.restore(items)[::-1]
+
+register_reordering_strategy("reverse", reverse_initial_order, "the reversed initial order")
+"""
+
+TEST_FILE = """
+import pytest
+
+@pytest.fixture(scope="module", params=[1, 2])
+def a(request):
+    return request.param
+
+def test_foo(a):
+    pass
+
+def test_bar():
+    pass
+
+def test_baz(a):
+    pass
+"""
+
+
+@pytest.mark.parametrize("reorder, expected", [
+    ("normal", ["test_foo[1]", "test_baz[1]", "test_foo[2]", "test_baz[2]"]),
+    ("skip", ["test_foo[1]", "test_foo[2]", "test_baz[1]", "test_baz[2]"]),
+    ("reverse", ["test_baz[2]", "test_baz[1]", "test_foo[2]", "test_foo[1]"]),
+])
+def test_reordering_strategies(pytester, reorder, expected):
+    """The strategies are applied after deselection, and new ones can be registered"""
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(TEST_FILE)
+    result = pytester.runpytest("-v", "-k", "not bar", "--with-reorder=%s" % reorder)
+    result.assert_outcomes(passed=4, deselected=1)
+    result.stdout.re_match_lines([r".*::%s PASSED.*" % item_id.replace("[", r"\[").replace("]", r"\]")
+                                  for item_id in expected])